@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare a full ``Path.backup`` with an incremental one when 1% of the files
+changed.
+
+Usage::
+
+    python benchmark/bench_backup.py [n_file]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pathlib_mate import Path
+
+
+def main(n_file=5000):
+    tmp = tempfile.mkdtemp()
+    try:
+        dir_root = Path(tmp, "project")
+        for i in range(n_file):
+            dir_path = os.path.join(dir_root.abspath, "d%s" % (i % 50))
+            os.makedirs(dir_path, exist_ok=True)
+            with open(os.path.join(dir_path, "f%s.txt" % i), "wb") as f:
+                f.write(("line %s\n" % i).encode("utf-8") * 2000)
+        size_in_mb = sum(p.size for p in dir_root.select_file()) / (1 << 20)
+        dir_backup = Path(tmp, "backup")
+        dir_backup.mkdir()
+
+        st = time.perf_counter()
+        dir_root.backup(dst=Path(dir_backup, "full.zip"), verbose=False)
+        print("{} files, {:.0f} MB".format(n_file, size_in_mb))
+        print("full backup              {:.3f} sec".format(time.perf_counter() - st))
+
+        base = Path(dir_backup, "base.zip")
+        dir_root.backup(dst=base, incremental=True, verbose=False)
+        for i in range(0, n_file, 100):
+            p = Path(dir_root, "d%s" % (i % 50), "f%s.txt" % i)
+            p.write_text("changed")
+        st = time.perf_counter()
+        dir_root.backup(dst=Path(dir_backup, "incr.zip"), base=base, verbose=False)
+        print(
+            "incremental, 1% changed  {:.3f} sec".format(time.perf_counter() - st)
+        )
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
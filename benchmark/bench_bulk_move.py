@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare renaming many files with ``Path.moveto`` in a loop and with
+``Path.bulk_move``.
+
+Usage::
+
+    python benchmark/bench_bulk_move.py [n_file]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pathlib_mate import Path
+
+
+def main(n_file=20000):
+    tmp = tempfile.mkdtemp()
+    try:
+        dir_root = Path(tmp, "data")
+        for i in range(n_file):
+            dir_path = os.path.join(dir_root.abspath, "d%s" % (i % 100))
+            os.makedirs(dir_path, exist_ok=True)
+            with open(os.path.join(dir_path, "f%s.txt" % i), "wb"):
+                pass
+        print("{} files".format(n_file))
+
+        plan = [(p, p.change(new_ext=".log")) for p in dir_root.select_file()]
+        st = time.perf_counter()
+        for src, dst in plan:
+            src.moveto(new_abspath=dst)
+        print("moveto() loop        {:.3f} sec".format(time.perf_counter() - st))
+
+        plan = [(dst, src) for src, dst in plan]
+        st = time.perf_counter()
+        Path.bulk_move(plan)
+        print("bulk_move()          {:.3f} sec".format(time.perf_counter() - st))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure the cost of making child paths during a walk, at several depths.
+Children share their parent's parts, so the cost should not grow with the
+depth.
+
+Usage::
+
+    python benchmark/bench_child_path.py
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+from pathlib_mate import Path
+
+
+def timeit(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - st
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def make_children(parent, n=100000):
+    make_child = parent._make_child_relpath
+    for i in range(n):
+        str(make_child("f%s.txt" % i))
+
+
+def make_tree(root, depth, files_per_dir=200):
+    dir_path = root
+    for _ in range(depth):
+        dir_path = os.path.join(dir_path, "level")
+        os.mkdir(dir_path)
+        for i in range(files_per_dir):
+            with open(os.path.join(dir_path, "f%s.txt" % i), "wb"):
+                pass
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    print("100k children + str() of a directory at depth N")
+    for depth in [1, 20, 50, 100]:
+        parent = Path("/", *["level"] * depth)
+        str(parent)
+        elapsed = timeit(lambda: make_children(parent))
+        print("  depth {:>4}  {:.3f} sec".format(depth, elapsed))
+
+    print("select() over a 50 level tree, 200 files per level, kept in a list")
+    root = tempfile.mkdtemp()
+    try:
+        make_tree(root, 50)
+        p = Path(root)
+        elapsed = timeit(lambda: list(p.select()), repeat=3)
+        peak = peak_memory(lambda: list(p.select()))
+        print("  {:.3f} sec, peak {:.1f} KB".format(elapsed, peak / 1024))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare ``Path.copy_tree_to`` with ``shutil.copytree`` and the vendored
+``fileutils.copy_tree`` on a tree of many small files.
+
+Usage::
+
+    python benchmark/bench_copy.py [n_file] [workers]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pathlib_mate import Path
+from pathlib_mate.vendor.fileutils import copy_tree
+
+
+def main(n_file=20000, workers=8):
+    tmp = tempfile.mkdtemp()
+    try:
+        dir_src = Path(tmp, "src")
+        for i in range(n_file):
+            dir_path = os.path.join(dir_src.abspath, "d%s" % (i % 200))
+            os.makedirs(dir_path, exist_ok=True)
+            with open(os.path.join(dir_path, "f%s.txt" % i), "wb") as f:
+                f.write(("line %s\n" % i).encode("utf-8") * 50)
+        print("{} files".format(n_file))
+
+        def timeit(title, func, dst):
+            st = time.perf_counter()
+            func(dir_src.abspath, os.path.join(tmp, dst))
+            print("{:<32}{:.3f} sec".format(title, time.perf_counter() - st))
+
+        timeit("shutil.copytree", shutil.copytree, "dst1")
+        timeit("fileutils.copy_tree", copy_tree, "dst2")
+        timeit(
+            "copy_tree_to()",
+            lambda src, dst: Path(src).copy_tree_to(dst),
+            "dst3",
+        )
+        timeit(
+            "copy_tree_to(workers=%s)" % workers,
+            lambda src, dst: Path(src).copy_tree_to(dst, workers=workers),
+            "dst4",
+        )
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
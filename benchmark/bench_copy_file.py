@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the copy methods of ``pathlib_mate.copier.copy_file`` with
+``shutil.copyfile`` across file sizes. Methods that the file system of the
+temp directory doesn't support are reported as such.
+
+Usage::
+
+    python benchmark/bench_copy_file.py [temp dir]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pathlib_mate import copier
+
+SIZES = [
+    (4 << 10, 500),
+    (256 << 10, 200),
+    (4 << 20, 50),
+    (64 << 20, 5),
+]
+
+
+def main(dir_tmp=None):
+    tmp = tempfile.mkdtemp(dir=dir_tmp)
+    methods = ["auto"] + copier.get_methods()
+    try:
+        print("{:<10}{:<10}".format("size", "shutil") + "".join(
+            "{:<24}".format(method) for method in methods
+        ))
+        for size, n in SIZES:
+            src = os.path.join(tmp, "src.bin")
+            with open(src, "wb") as f:
+                f.write(os.urandom(size))
+            dst_list = [os.path.join(tmp, "dst%s.bin" % i) for i in range(n)]
+
+            def timeit(copy):
+                st = time.perf_counter()
+                for dst in dst_list:
+                    copy(src, dst)
+                elapsed = time.perf_counter() - st
+                for dst in dst_list:
+                    os.remove(dst)
+                return elapsed
+
+            row = "{:<10}{:<10}".format(
+                "%sKB" % (size >> 10), "%.3f" % timeit(shutil.copyfile)
+            )
+            for method in methods:
+                stats = copier.CopyStats()
+                try:
+                    elapsed = timeit(
+                        lambda s, d: copier.copy_file(
+                            s, d, copy_stat=False, method=method, stats=stats
+                        )
+                    )
+                except OSError:
+                    row += "{:<24}".format("n/a")
+                    continue
+                used = [name for name, count in stats.n_file.items() if count]
+                row += "{:<24}".format("%.3f %s" % (elapsed, "/".join(used)))
+            print(row)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
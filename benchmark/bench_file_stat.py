@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure ``Path.file_stat_for_all`` on a deep and wide tree, time and peak
+memory of the result.
+
+Usage::
+
+    python benchmark/bench_file_stat.py
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+from pathlib_mate import Path
+
+
+def make_tree(root, depth=20, width=3, files_per_dir=20):
+    """
+    ``width`` sub directories at the top, each is a chain of ``depth``
+    directories, every directory has ``files_per_dir`` files.
+    """
+    for i in range(width):
+        dir_path = root
+        for j in range(depth):
+            dir_path = os.path.join(dir_path, "d%s_%s" % (i, j))
+            os.mkdir(dir_path)
+            for k in range(files_per_dir):
+                with open(os.path.join(dir_path, "f%s.txt" % k), "wb") as f:
+                    f.write(b"x" * k)
+
+
+def timeit(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - st
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        make_tree(root, depth=40, width=50)
+        p = Path(root)
+        cases = [("dict", lambda: p.file_stat_for_all())]
+        try:
+            p.file_stat_for_all(compact=True)
+            cases.append(("compact", lambda: p.file_stat_for_all(compact=True)))
+            cases.append(
+                ("stream", lambda: sum(1 for _ in p.file_stat_for_all(stream=True)))
+            )
+        except TypeError:  # older version
+            pass
+        for name, func in cases:
+            elapsed = timeit(func)
+            peak, _ = peak_memory(func)
+            print(
+                "{:<8} {:.3f} sec, peak {:.1f} KB".format(name, elapsed, peak / 1024)
+            )
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
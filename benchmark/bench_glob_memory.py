@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Show that recursive glob walks that can't produce duplicates, like
+``**/*`` and ``**/name``, stream paths with flat memory usage, while
+``**/**/*`` still has to remember every yielded path.
+
+Usage::
+
+    python benchmark/bench_glob_memory.py [n_files]
+
+Peak memory is measured with ``tracemalloc`` while iterating over the
+paths without keeping them.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import tracemalloc
+
+from pathlib_mate import Path
+
+
+def make_tree(root, n_files, files_per_dir=100):
+    for i in range(n_files):
+        dir_path = os.path.join(root, "d%s" % (i // files_per_dir))
+        if i % files_per_dir == 0:
+            os.mkdir(dir_path)
+        with open(os.path.join(dir_path, "f%s.txt" % i), "wb"):
+            pass
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def consume(iterable):
+    n = 0
+    for _ in iterable:
+        n += 1
+    return n
+
+
+def main(n_files=20000):
+    for n in [n_files // 4, n_files]:
+        root = tempfile.mkdtemp()
+        try:
+            make_tree(root, n)
+            p = Path(root)
+            for pattern in ["**/*", "**/f0.txt", "**/**/*"]:
+                peak = peak_memory(lambda: consume(p.glob(pattern)))
+                print("{:>8} files  {:<10} peak {:>8.1f} KB".format(
+                    n, pattern, peak / 1024))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
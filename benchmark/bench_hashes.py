@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the throughput of :func:`pathlib_mate.hashes.get_file_fingerprint`
+with hashing the same bytes already in memory, which is the upper bound.
+
+Usage::
+
+    python benchmark/bench_hashes.py [size_in_mb]
+"""
+
+import os
+import sys
+import time
+import hashlib
+import tempfile
+
+from pathlib_mate import hashes
+
+
+def timeit(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - st
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(size_in_mb=256):
+    size = size_in_mb * (1 << 20)
+    data = os.urandom(1 << 20) * size_in_mb
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(data)
+        abspath = f.name
+
+    try:
+        for hash_meth in [hashlib.md5, hashlib.sha256]:
+            name = hash_meth().name
+            raw = timeit(lambda: hash_meth(data).hexdigest())
+            print("{:<8} in memory (hashlib raw)    {:.2f} GB/s".format(
+                name, size / raw / (1 << 30)))
+            for chunk_size in [1 << 6, 1 << 12, 1 << 16, None]:
+                elapsed = timeit(
+                    lambda: hashes.get_file_fingerprint(
+                        abspath, hash_meth, chunk_size=chunk_size),
+                    repeat=1 if chunk_size == 1 << 6 else 3,
+                )
+                print("{:<8} chunk_size = {:<12} {:.2f} GB/s".format(
+                    name, str(chunk_size), size / elapsed / (1 << 30)))
+            elapsed = timeit(
+                lambda: hashes.get_file_fingerprint(
+                    abspath, hash_meth, use_mmap=True)
+            )
+            print("{:<8} use_mmap = True          {:.2f} GB/s".format(
+                name, size / elapsed / (1 << 30)))
+
+        # md5 + sha256, two separate reads vs one read feeding both
+        hash_meths = [hashlib.md5, hashlib.sha256]
+        elapsed = timeit(
+            lambda: [hashes.get_file_fingerprint(abspath, hash_meth)
+                     for hash_meth in hash_meths]
+        )
+        print("md5+sha256 two passes        {:.3f} sec".format(elapsed))
+        elapsed = timeit(
+            lambda: hashes.get_file_fingerprints(abspath, hash_meths)
+        )
+        print("md5+sha256 one pass          {:.3f} sec".format(elapsed))
+    finally:
+        os.remove(abspath)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
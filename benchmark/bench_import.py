@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure ``import pathlib_mate`` time with ``python -X importtime`` and check
+it against a budget. Every run is a fresh interpreter.
+
+Usage::
+
+    python benchmark/bench_import.py [budget_in_ms]
+
+It exits with status 1 if the median import time is over the budget, or if
+one of the modules that should be loaded lazily is imported.
+"""
+
+import os
+import re
+import sys
+import statistics
+import subprocess
+
+DEFAULT_BUDGET_MS = 40
+
+# only needed by the zip / hash / tool box / atomic write features
+LAZY_MODULES = [
+    "ctypes",
+    "urllib.parse",
+    "fnmatch",
+    "hashlib",
+    "zipfile",
+    "datetime",
+    "shutil",
+    "random",
+    "pathlib",
+    "concurrent.futures",
+    "pathlib_mate.vendor.six",
+    "pathlib_mate.vendor.fileutils",
+    "pathlib_mate.hashes",
+]
+
+dir_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pattern = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def measure():
+    """
+    :return: cumulative import time of ``pathlib_mate`` in microseconds, and
+        the set of imported module names.
+    """
+    # measure with .pyc files, like an installed package
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pathlib_mate"],
+        cwd=dir_project_root,
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    total = None
+    modules = set()
+    for line in res.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            modules.add(match.group(4))
+            if match.group(4) == "pathlib_mate":
+                total = int(match.group(2))
+    return total, modules
+
+
+def main(budget_ms=DEFAULT_BUDGET_MS, repeat=11):
+    measure()  # write the .pyc files
+    results = list()
+    for _ in range(repeat):
+        total, modules = measure()
+        results.append(total)
+    median_ms = statistics.median(results) / 1000
+    print("import pathlib_mate: median {:.1f} ms, best {:.1f} ms".format(
+        median_ms, min(results) / 1000))
+
+    ok = True
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print("eagerly imported: {}".format(", ".join(eager)))
+        ok = False
+    if median_ms > budget_ms:
+        print("over budget: {:.1f} ms > {} ms".format(median_ms, budget_ms))
+        ok = False
+    if ok:
+        print("ok, budget {} ms".format(budget_ms))
+    return ok
+
+
+if __name__ == "__main__":
+    if not main(*[float(arg) for arg in sys.argv[1:]]):
+        sys.exit(1)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the recursive walks of pathlib_mate with plain ``os.walk`` and an
+``os.scandir`` loop, on a wide tree and on a deep tree.
+
+Usage::
+
+    python benchmark/bench_walk.py [n_files]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pathlib_mate import Path
+from pathlib_mate.walker import walk
+
+
+def make_wide_tree(root, n_files, files_per_dir=50):
+    for i in range(n_files):
+        dir_path = os.path.join(
+            root, "d%s" % (i // (files_per_dir * 10)), "s%s" % (i // files_per_dir)
+        )
+        if i % files_per_dir == 0:
+            os.makedirs(dir_path)
+        with open(os.path.join(dir_path, "f%s.txt" % i), "wb"):
+            pass
+
+
+def make_deep_tree(root, depth):
+    dir_list = list()
+    dir_path = root
+    for _ in range(depth):
+        dir_path = os.path.join(dir_path, "d")
+        os.mkdir(dir_path)
+        with open(os.path.join(dir_path, "f.txt"), "wb"):
+            pass
+        dir_list.append(dir_path)
+    return dir_list
+
+
+def remove_deep_tree(root, dir_list):
+    # shutil.rmtree is recursive too on older Pythons
+    for dir_path in reversed(dir_list):
+        os.remove(os.path.join(dir_path, "f.txt"))
+        os.rmdir(dir_path)
+    os.rmdir(root)
+
+
+def timeit(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        n = func()
+        elapsed = time.perf_counter() - st
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, n
+
+
+def os_walk(root):
+    n = 0
+    for _, dirnames, filenames in os.walk(root):
+        n += len(dirnames) + len(filenames)
+    return n
+
+
+def os_scandir(root):
+    n = 0
+    stack = [root]
+    while stack:
+        for entry in os.scandir(stack.pop()):
+            n += 1
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+    return n
+
+
+def os_scandir_size(root):
+    n = total = 0
+    stack = [root]
+    while stack:
+        for entry in os.scandir(stack.pop()):
+            n += 1
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file():
+                total += entry.stat().st_size
+    return n
+
+
+def scan_size(p):
+    n = total = 0
+    for e in p.scan():
+        n += 1
+        if e.is_file:
+            total += e.size
+    return n
+
+
+def count(iterable):
+    n = 0
+    for _ in iterable:
+        n += 1
+    return n
+
+
+def run(root):
+    p = Path(root)
+    cases = [
+        ("os.walk", lambda: os_walk(root)),
+        ("os.scandir loop", lambda: os_scandir(root)),
+        ("Path.glob('**/*')", lambda: count(p.glob("**/*"))),
+        ("Path.select()", lambda: count(p.select())),
+        ("Path.rglob('*.txt')", lambda: count(p.rglob("*.txt"))),
+        ("Path.glob('**')", lambda: count(p.glob("**"))),
+        ("walker.walk", lambda: count(walk(p))),
+        ("Path.scan()", lambda: count(p.scan())),
+        ("os.scandir loop + size", lambda: os_scandir_size(root)),
+        ("Path.scan() + size", lambda: scan_size(p)),
+    ]
+    for name, func in cases:
+        try:
+            elapsed, n = timeit(func)
+        except RecursionError:
+            print("  {:<22} RecursionError".format(name))
+            continue
+        print("  {:<22} {:>8} paths {:>8.3f} sec".format(name, n, elapsed))
+
+
+def main(n_files=50000):
+    root = tempfile.mkdtemp()
+    try:
+        make_wide_tree(root, n_files)
+        print("wide tree, {} files".format(n_files))
+        run(root)
+    finally:
+        shutil.rmtree(root)
+
+    root = tempfile.mkdtemp()
+    # deep enough to break recursive walks, short enough for PATH_MAX
+    dir_list = make_deep_tree(root, 1500)
+    try:
+        print("deep tree, 1500 levels")
+        run(root)
+    finally:
+        remove_deep_tree(root, dir_list)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
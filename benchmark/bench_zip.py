@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare ``Path.make_zip_archive`` in a single thread and with ``workers``,
+and measure its peak memory on a tree of many small files.
+
+Usage::
+
+    python benchmark/bench_zip.py [size_in_mb]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import tracemalloc
+
+from pathlib_mate import Path
+
+
+def make_tree(root, size_in_mb):
+    """
+    Half of the files are text like, half are random bytes, from a few KB to
+    a few MB.
+    """
+    rnd = random.Random(0)
+    words = [b"pathlib", b"mate", b"zip", b"archive", b"benchmark", b"\n"]
+    total = 0
+    i = 0
+    while total < size_in_mb * (1 << 20):
+        size = rnd.choice([4 << 10, 64 << 10, 1 << 20, 4 << 20])
+        if i % 2:
+            data = os.urandom(size)
+        else:
+            data = b" ".join(rnd.choice(words) for _ in range(size // 6))
+        dir_path = os.path.join(root, "d%s" % (i % 10))
+        os.makedirs(dir_path, exist_ok=True)
+        with open(os.path.join(dir_path, "f%s.bin" % i), "wb") as f:
+            f.write(data)
+        total += len(data)
+        i += 1
+
+
+def timeit(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - st
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def many_files_peak_memory(tmp, n_file=20000):
+    root = Path(tmp, "many")
+    for i in range(n_file):
+        dir_path = os.path.join(root.abspath, "d%s" % (i % 100))
+        os.makedirs(dir_path, exist_ok=True)
+        with open(os.path.join(dir_path, "f%s.txt" % i), "wb"):
+            pass
+    dst = Path(tmp, "many.zip")
+    # includes the ZipInfo list zipfile keeps for the central directory
+    tracemalloc.start()
+    try:
+        root.make_zip_archive(dst=dst, overwrite=True, compress=False)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    print("{} empty files, peak memory {:.1f} MB".format(n_file, peak / (1 << 20)))
+
+
+def media_backup(tmp, size_in_mb):
+    """
+    ``.jpg`` files are random bytes, like real compressed images.
+    """
+    root = Path(tmp, "media")
+    os.makedirs(root.abspath)
+    for i in range(size_in_mb):
+        with open(os.path.join(root.abspath, "img%s.jpg" % i), "wb") as f:
+            f.write(os.urandom(1 << 20))
+    dst = Path(tmp, "media.zip")
+    for store_ext in [False, True]:
+        elapsed = timeit(
+            lambda: root.make_zip_archive(
+                dst=dst, overwrite=True, store_ext=store_ext
+            )
+        )
+        print(
+            "{} MB of .jpg, store_ext = {:<5}  {:.3f} sec, archive {:.1f} MB".format(
+                size_in_mb,
+                str(store_ext),
+                elapsed,
+                os.path.getsize(dst.abspath) / (1 << 20),
+            )
+        )
+
+
+def extract(tmp, root):
+    from zipfile import ZipFile
+
+    archive = Path(tmp, "extract.zip")
+    root.make_zip_archive(dst=archive, overwrite=True)
+    dst = Path(tmp, "extracted")
+
+    def extractall():
+        shutil.rmtree(dst.abspath, ignore_errors=True)
+        with ZipFile(archive.abspath) as zf:
+            zf.extractall(dst.abspath)
+
+    elapsed = timeit(extractall)
+    print("ZipFile.extractall               {:.3f} sec".format(elapsed))
+    for workers in [None, 1, 2, 4, 8]:
+
+        def extract_zip_archive():
+            shutil.rmtree(dst.abspath, ignore_errors=True)
+            archive.extract_zip_archive(dst, workers=workers)
+
+        elapsed = timeit(extract_zip_archive)
+        print(
+            "extract_zip_archive workers = {:<4} {:.3f} sec".format(
+                str(workers), elapsed
+            )
+        )
+
+
+def main(size_in_mb=200):
+    tmp = tempfile.mkdtemp()
+    try:
+        root = Path(tmp, "data")
+        make_tree(root.abspath, size_in_mb)
+        dst = Path(tmp, "archive.zip")
+        many_files_peak_memory(tmp)
+        media_backup(tmp, size_in_mb)
+        print("{} CPUs, {} MB".format(os.cpu_count(), size_in_mb))
+        for workers in [None, 1, 2, 4, 8]:
+            for compress in [True, False]:
+                elapsed = timeit(
+                    lambda: root.make_zip_archive(
+                        dst=dst, overwrite=True, compress=compress, workers=workers
+                    )
+                )
+                print(
+                    "workers = {:<4}  compress = {:<5}  {:.3f} sec, {:.0f} MB/s, "
+                    "archive {:.1f} MB".format(
+                        str(workers),
+                        str(compress),
+                        elapsed,
+                        size_in_mb / elapsed,
+                        os.path.getsize(dst.abspath) / (1 << 20),
+                    )
+                )
+        extract(tmp, root)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fast file and directory tree copy.
+
+File content is copied by the kernel when it can, so the data never goes
+through Python. The methods are tried in the order of :data:`METHODS`:
+
+- ``"ficlone"``: the Linux ``FICLONE`` ioctl, the copy shares the data
+  blocks of the source (a reflink) on btrfs, xfs and other copy on write
+  file systems, it takes the same time for any file size.
+- ``"copy_file_range"``: ``os.copy_file_range``, the kernel copies the
+  data, or shares the blocks or copies on the server side when the file
+  system supports it.
+- ``"sendfile"``: ``os.sendfile``.
+- ``"buffer"``: ``readinto()`` and ``write()`` with one large buffer.
+
+A method that doesn't work for two files (not supported by the file
+system, files on different devices, ...) falls back to the next one.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import os
+import sys
+import errno
+import shutil
+import threading
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MB
+
+MIN_CHUNK_SIZE = 1 << 16  # 64 KB
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int), from linux/fs.h
+
+METHODS = ("ficlone", "copy_file_range", "sendfile", "buffer")
+
+# errors meaning "this copy method doesn't work for these two files", the
+# next method is tried
+_FALLBACK_ERRNO = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EBADF,
+    errno.ETXTBSY,
+}
+
+_disabled = set()  # methods the kernel doesn't support at all
+
+# st_dev of the file systems that can't make reflinks, FICLONE is not tried
+# again on them
+_no_reflink_dev = set()
+
+
+class _Fallback(Exception):
+    """
+    The method can't copy these two files, nothing was written.
+    """
+
+    def __init__(self, error):
+        super(_Fallback, self).__init__(error)
+        self.error = error
+
+
+def _check_fallback(name, e, copied):
+    """
+    :type name: str
+    :type e: OSError
+    :type copied: int
+    """
+    if copied == 0 and e.errno in _FALLBACK_ERRNO:
+        if e.errno == errno.ENOSYS:
+            _disabled.add(name)
+        raise _Fallback(e)
+    raise e
+
+
+def _ficlone(fsrc, fdst, size):
+    """
+    :type fsrc: io.FileIO
+    :type fdst: io.FileIO
+    :type size: int
+    """
+    import fcntl
+
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError as e:
+        _check_fallback("ficlone", e, 0)
+
+
+def _copy_file_range(fsrc, fdst, size):
+    """
+    :type fsrc: io.FileIO
+    :type fdst: io.FileIO
+    :type size: int
+    """
+    in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+    copied = 0
+    while True:
+        try:
+            n = os.copy_file_range(in_fd, out_fd, min(size - copied, 1 << 30))
+        except OSError as e:
+            _check_fallback("copy_file_range", e, copied)
+        if n == 0:
+            break
+        copied += n
+
+
+def _sendfile(fsrc, fdst, size):
+    """
+    :type fsrc: io.FileIO
+    :type fdst: io.FileIO
+    :type size: int
+    """
+    in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+    offset = 0
+    while True:
+        try:
+            n = os.sendfile(out_fd, in_fd, offset, min(size - offset, 1 << 30))
+        except OSError as e:
+            _check_fallback("sendfile", e, offset)
+        if n == 0:
+            break
+        offset += n
+
+
+def _copy_buffer(fsrc, fdst, size):
+    """
+    Copy with one buffer, sized for the file: a small file is read in one
+    call, a large one :data:`DEFAULT_CHUNK_SIZE` bytes at a time.
+
+    :type fsrc: io.FileIO
+    :type fdst: io.FileIO
+    :type size: int
+    """
+    # one more byte, so a file that grew since stat is still copied whole
+    chunk_size = min(max(size + 1, MIN_CHUNK_SIZE), DEFAULT_CHUNK_SIZE)
+    view = memoryview(bytearray(chunk_size))
+    while True:
+        n = fsrc.readinto(view)
+        if not n:
+            break
+        written = 0
+        while written < n:
+            written += fdst.write(view[written:n])
+
+
+_methods = [
+    ("ficlone", _ficlone),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+    ("buffer", _copy_buffer),
+]
+_methods = [
+    (name, func)
+    for name, func in _methods
+    if name == "buffer"
+    or (name == "ficlone" and sys.platform.startswith("linux"))
+    or hasattr(os, name)
+]
+
+
+def get_methods():
+    """
+    The copy methods available on this platform, in the order they are
+    tried.
+
+    :rtype: List[str]
+    """
+    return [name for name, _ in _methods]
+
+
+class CopyStats(object):
+    """
+    Count the files and bytes copied by each method, pass one to
+    :func:`copy_file`, :func:`copy_tree` or
+    :meth:`~pathlib_mate.mate_mutate_methods.MutateMethods.copyto` to see
+    which one was used. It can be shared by threads.
+
+    Example::
+
+        >>> stats = CopyStats()
+        >>> Path("src").copy_tree_to("dst", stats=stats)
+        >>> stats.n_file
+        {'ficlone': 0, 'copy_file_range': 1500, 'sendfile': 0, 'buffer': 0}
+    """
+
+    def __init__(self):
+        self.n_file = dict.fromkeys(METHODS, 0)  # type: Dict[str, int]
+        self.size = dict.fromkeys(METHODS, 0)  # type: Dict[str, int]
+        self._lock = threading.Lock()
+
+    def add(self, method, size):
+        """
+        :type method: str
+        :type size: int
+        """
+        with self._lock:
+            self.n_file[method] += 1
+            self.size[method] += size
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            self.__class__.__name__,
+            ", ".join(
+                "%s=%s files/%s bytes" % (name, self.n_file[name], self.size[name])
+                for name in METHODS
+                if self.n_file[name]
+            ),
+        )
+
+
+def _open_dst(dst, overwrite):
+    """
+    Open the destination file for writing, without truncating it.
+
+    :type dst: str
+    :type overwrite: bool
+
+    :rtype: Tuple[bool, io.FileIO]
+    :return: ``(True if the file was created, the file)``
+    """
+    flags = os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    try:
+        fd = os.open(dst, flags | os.O_CREAT | os.O_EXCL, 0o666)
+        created = True
+    except FileExistsError:
+        if not overwrite:
+            raise
+        fd = os.open(dst, flags)
+        created = False
+    return created, open(fd, "wb", buffering=0)
+
+
+def copy_file(src, dst, overwrite=True, copy_stat=True, method="auto", stats=None):
+    """
+    Copy a file's content, and its permission bits and times like
+    ``shutil.copy2``.
+
+    :type src: str
+    :type dst: str
+
+    :type overwrite: bool
+    :param overwrite: if False, raise ``FileExistsError`` if ``dst`` exists.
+
+    :type copy_stat: bool
+    :param copy_stat: copy the permission bits and times as well.
+
+    :type method: str
+    :param method: ``"auto"`` tries the methods available on this platform
+        in order, see :data:`METHODS`. With a method name, only this method
+        is used, and its error is raised if it doesn't work for these files.
+
+    :type stats: Optional[CopyStats]
+    :param stats: record the method used and the size copied.
+
+    :rtype: str
+    :return: the name of the method that copied the content.
+    """
+    if method == "auto":
+        methods = [item for item in _methods if item[0] not in _disabled]
+    else:
+        methods = [item for item in _methods if item[0] == method]
+        if not methods:
+            raise ValueError(
+                "copy method %r is not available, use one of %s!"
+                % (method, ["auto"] + get_methods())
+            )
+
+    error = None
+    with open(src, "rb", buffering=0) as fsrc:
+        st = os.fstat(fsrc.fileno())
+        size = st.st_size
+        # dst is not truncated before a method succeeds, so a forced method
+        # that fails leaves an existing dst untouched
+        created, fdst = _open_dst(dst, overwrite)
+        with fdst:
+            for name, func in methods:
+                if (
+                    name == "ficlone"
+                    and method == "auto"
+                    and st.st_dev in _no_reflink_dev
+                ):
+                    continue
+                try:
+                    func(fsrc, fdst, size)
+                    break
+                except _Fallback as e:
+                    if method != "auto":
+                        error = e.error
+                        break
+                    if name == "ficlone" and e.error.errno != errno.EXDEV:
+                        _no_reflink_dev.add(st.st_dev)
+            if error is None and name != "ficlone":
+                # drop the end of a longer file that was there before, a
+                # reflink replaces the whole content by itself
+                fdst.truncate(fdst.tell())
+    if error is not None:
+        if created:  # don't leave the empty file behind
+            os.remove(dst)
+        raise error
+    if copy_stat:
+        shutil.copystat(src, dst)
+    if stats is not None:
+        stats.add(name, size)
+    return name
+
+
+def _iter_tree(src, dst, filters, prune, symlinks):
+    """
+    Walk the source tree, depth first.
+
+    :rtype: Iterable[Tuple[str, str, str]]
+    :return: ``(kind, src path, dst path)``, kind is ``"dir"``, ``"file"``
+        or ``"link"``. A directory always comes before its content.
+    """
+    from .walker import ScanEntry
+
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        sub_dirs = list()
+        for entry in entries:
+            dst_path = os.path.join(dst_dir, entry.name)
+            if symlinks and entry.is_symlink():
+                yield "link", entry.path, dst_path
+            elif entry.is_dir():
+                if prune is not None and prune(
+                    ScanEntry(entry, True, False).to_path()
+                ):
+                    continue
+                yield "dir", entry.path, dst_path
+                sub_dirs.append((entry.path, dst_path))
+            elif filters is None or filters(ScanEntry(entry, False, True).to_path()):
+                yield "file", entry.path, dst_path
+        sub_dirs.reverse()
+        stack.extend(sub_dirs)
+
+
+def copy_tree(
+    src,
+    dst,
+    workers=None,
+    filters=None,
+    prune=None,
+    overwrite=False,
+    symlinks=False,
+    progress=None,
+    max_pending=None,
+    method="auto",
+    stats=None,
+):
+    """
+    Copy a directory tree, like the vendored
+    :func:`~pathlib_mate.vendor.fileutils.copy_tree`: existing directories
+    are accepted, file permission bits and times are copied, and errors are
+    collected and raised together at the end as a ``shutil.Error``.
+
+    The directories are all created by the calling thread as the walk finds
+    them, the files are copied by a thread pool with :func:`copy_file`.
+
+    :type src: str
+    :param src: the source directory.
+
+    :type dst: str
+    :param dst: the destination directory, it is created if needed.
+
+    :type workers: Optional[int]
+    :param workers: number of copy threads, None means copy in the calling
+        thread.
+
+    :type filters: Optional[Callable]
+    :param filters: a callable that takes a file
+        :class:`~pathlib_mate.pathlib2.Path` and returns True if it should be
+        copied.
+
+    :type prune: Optional[Callable]
+    :param prune: a callable that takes a directory
+        :class:`~pathlib_mate.pathlib2.Path` and returns True if it should be
+        skipped entirely.
+
+    :type overwrite: bool
+    :param overwrite: if False, files that already exist in ``dst`` are not
+        overwritten, and reported in the ``shutil.Error``.
+
+    :type symlinks: bool
+    :param symlinks: if True, copy symlinks as symlinks, otherwise copy
+        what they point to.
+
+    :type progress: Optional[Callable]
+    :param progress: called as ``progress(n_done, n_total, size_done,
+        size_total)`` after each file is copied. The totals take one more
+        walk of the tree, it is only done if ``progress`` is given.
+
+    :type max_pending: Optional[int]
+    :param max_pending: max number of files submitted but not yet copied,
+        default is ``workers * 4``.
+
+    :type method: str
+    :param method: the copy method, see :func:`copy_file`.
+
+    :type stats: Optional[CopyStats]
+    :param stats: record the method used for each file.
+
+    :rtype: int
+    :return: number of copied files.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers has to be greater than 0!")
+    if max_pending is None:
+        max_pending = (workers or 1) * 4
+    if max_pending < 1:
+        raise ValueError("max_pending has to be greater than 0!")
+    src = os.path.abspath(str(src))
+    dst = os.path.abspath(str(dst))
+    if os.path.normcase(dst + os.sep).startswith(os.path.normcase(src + os.sep)):
+        raise ValueError("can't copy '%s' into itself!" % src)
+
+    n_total = size_total = 0
+    if progress is not None:
+        for kind, src_path, _ in _iter_tree(src, dst, filters, prune, symlinks):
+            if kind == "file":
+                n_total += 1
+                size_total += os.stat(src_path).st_size
+    done = [0, 0]
+
+    errors = list()  # type: List[Tuple[str, str, str]]
+    dirs = [(src, dst)]
+
+    def copy(src_path, dst_path):
+        try:
+            copy_file(
+                src_path,
+                dst_path,
+                overwrite=overwrite,
+                method=method,
+                stats=stats,
+            )
+        except OSError as e:
+            return (src_path, dst_path, str(e)), 0
+        if progress is not None:
+            return None, os.stat(dst_path).st_size
+        return None, 0
+
+    def on_done(result):
+        error, size = result
+        if error is not None:
+            errors.append(error)
+            return
+        done[0] += 1
+        if progress is not None:
+            done[1] += size
+            progress(done[0], n_total, done[1], size_total)
+
+    os.makedirs(dst, exist_ok=True)
+    if workers is not None:
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = deque()
+    try:
+        for kind, src_path, dst_path in _iter_tree(src, dst, filters, prune, symlinks):
+            if kind == "dir":
+                try:
+                    os.mkdir(dst_path)
+                except FileExistsError:
+                    pass
+                dirs.append((src_path, dst_path))
+            elif kind == "link":
+                try:
+                    os.symlink(os.readlink(src_path), dst_path)
+                except OSError as e:
+                    errors.append((src_path, dst_path, str(e)))
+            elif workers is None:
+                on_done(copy(src_path, dst_path))
+            else:
+                if len(pending) >= max_pending:
+                    on_done(pending.popleft().result())
+                pending.append(executor.submit(copy, src_path, dst_path))
+        if workers is not None:
+            while pending:
+                on_done(pending.popleft().result())
+    finally:
+        if workers is not None:
+            executor.shutdown()
+
+    # copy directory times last, adding files changes them
+    for src_path, dst_path in reversed(dirs):
+        try:
+            shutil.copystat(src_path, dst_path)
+        except OSError as e:  # pragma: no cover
+            errors.append((src_path, dst_path, str(e)))
+    if errors:
+        raise shutil.Error(errors)
+    return done[0]
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+"""
+A persistent file hash cache, so unchanged files are never hashed twice,
+even across processes.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import os
+import time
+import sqlite3
+import threading
+
+from .hashes import get_file_fingerprints
+
+T_KEY = Tuple[int, int, int, int, str, int]
+"""
+``(st_dev, st_ino, st_size, st_mtime_ns, algorithm, nbytes)``
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hexdigest TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino, algorithm, nbytes)
+)
+"""
+
+
+def get_hash_name(hash_meth):
+    """
+    :type hash_meth: Callable
+
+    :rtype: str
+    :return: algorithm name, for example ``"md5"`` for ``hashlib.md5``.
+    """
+    return hash_meth().name
+
+
+class HashCache(object):
+    """
+    A sqlite backed cache of file hashes, keyed by device, inode, size,
+    ``mtime_ns``, algorithm and ``nbytes``. A file that is modified or
+    replaced gets a new size or mtime, so its old hash is never returned.
+
+    Install it on ``Path`` to make ``md5``, ``sha256``, ``sha512``,
+    ``get_partial_xxx``, ``get_dir_fingerprint`` and ``dir_xxx`` only hash
+    the files that changed since the last call::
+
+        >>> from pathlib_mate import Path
+        >>> from pathlib_mate.hash_cache import HashCache
+        >>> Path.hash_cache = HashCache("/path/to/hash-cache.sqlite")
+
+    The database can be shared by several processes.
+
+    :type db_path: str
+    :param db_path: path of the sqlite database file, ``":memory:"`` for an
+        in memory cache.
+
+    :type max_entries: int
+    :param max_entries: max number of hashes to keep, the least recently
+        used ones are evicted first.
+
+    :type min_age: float
+    :param min_age: files modified less than this many seconds ago are
+        hashed but not cached. A file can be written again within the
+        timestamp resolution of the file system without changing its mtime,
+        it is the same "racy clean" problem ``git`` deals with.
+    """
+
+    def __init__(self, db_path, max_entries=1000000, min_age=2.0):
+        if max_entries < 1:
+            raise ValueError("max_entries has to be greater than 0!")
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self.min_age = min_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS hashes_used ON hashes (used)")
+        self._used = self._conn.execute(
+            "SELECT COALESCE(MAX(used), 0) FROM hashes"
+        ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_keys(self, abspath, hash_meths, nbytes=0):
+        """
+        Stat the file once and return its cache key for each hash method.
+
+        :type abspath: str
+        :type hash_meths: List[Callable]
+        :type nbytes: int
+
+        :rtype: List[T_KEY]
+        """
+        st = os.stat(abspath)
+        return [
+            (
+                st.st_dev,
+                st.st_ino,
+                st.st_size,
+                st.st_mtime_ns,
+                get_hash_name(hash_meth),
+                nbytes,
+            )
+            for hash_meth in hash_meths
+        ]
+
+    def get_key(self, abspath, hash_meth, nbytes=0):
+        """
+        Stat the file and return its cache key.
+
+        :type abspath: str
+        :type hash_meth: Callable
+        :type nbytes: int
+
+        :rtype: T_KEY
+        """
+        return self.get_keys(abspath, [hash_meth], nbytes)[0]
+
+    def get_many(self, keys):
+        """
+        :type keys: Iterable[T_KEY]
+
+        :rtype: Dict[T_KEY, str]
+        :return: hexdigest of the keys that are cached.
+        """
+        found = dict()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                for key in keys:
+                    dev, ino, size, mtime_ns, algorithm, nbytes = key
+                    row = cursor.execute(
+                        "SELECT size, mtime_ns, hexdigest FROM hashes "
+                        "WHERE dev = ? AND ino = ? AND algorithm = ? AND nbytes = ?",
+                        (dev, ino, algorithm, nbytes),
+                    ).fetchone()
+                    if (row is not None) and (row[0] == size and row[1] == mtime_ns):
+                        self._used += 1
+                        cursor.execute(
+                            "UPDATE hashes SET used = ? "
+                            "WHERE dev = ? AND ino = ? AND algorithm = ? AND nbytes = ?",
+                            (self._used, dev, ino, algorithm, nbytes),
+                        )
+                        found[key] = row[2]
+                cursor.execute("COMMIT")
+            except Exception:  # pragma: no cover
+                cursor.execute("ROLLBACK")
+                raise
+        return found
+
+    def set_many(self, items):
+        """
+        Store hashes, and evict the least recently used ones if there are
+        more than :attr:`max_entries`. Keys of files modified less than
+        :attr:`min_age` seconds ago are skipped.
+
+        :type items: Iterable[Tuple[T_KEY, str]]
+        """
+        deadline = time.time_ns() - int(self.min_age * 1e9)
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                for key, hexdigest in items:
+                    dev, ino, size, mtime_ns, algorithm, nbytes = key
+                    if mtime_ns > deadline:
+                        continue
+                    self._used += 1
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            dev,
+                            ino,
+                            algorithm,
+                            nbytes,
+                            size,
+                            mtime_ns,
+                            hexdigest,
+                            self._used,
+                        ),
+                    )
+                n_evict = (
+                    cursor.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+                    - self.max_entries
+                )
+                if n_evict > 0:
+                    cursor.execute(
+                        "DELETE FROM hashes WHERE rowid IN "
+                        "(SELECT rowid FROM hashes ORDER BY used LIMIT ?)",
+                        (n_evict,),
+                    )
+                cursor.execute("COMMIT")
+            except Exception:  # pragma: no cover
+                cursor.execute("ROLLBACK")
+                raise
+
+    def get(self, key):
+        """
+        :type key: T_KEY
+
+        :rtype: Optional[str]
+        """
+        return self.get_many([key]).get(key)
+
+    def set(self, key, hexdigest):
+        """
+        :type key: T_KEY
+        :type hexdigest: str
+        """
+        self.set_many([(key, hexdigest)])
+
+    def get_file_fingerprints(self, abspath, hash_meths, nbytes=0, **kwargs):
+        """
+        Cached version of :func:`pathlib_mate.hashes.get_file_fingerprints`.
+        If any hash is missing, the file is read once and all the missing
+        hashes are computed.
+
+        :type abspath: str
+        :type hash_meths: List[Callable]
+        :type nbytes: int
+        :param kwargs: other arguments for
+            :func:`~pathlib_mate.hashes.get_file_fingerprints`.
+
+        :rtype: List[str]
+        """
+        key_list = self.get_keys(abspath, hash_meths, nbytes)
+        cached = self.get_many(key_list)
+        missing = [
+            (hash_meth, key)
+            for hash_meth, key in zip(hash_meths, key_list)
+            if key not in cached
+        ]
+        if missing:
+            hexdigest_list = get_file_fingerprints(
+                abspath,
+                [hash_meth for hash_meth, _ in missing],
+                nbytes,
+                **kwargs
+            )
+            new_items = [
+                (key, hexdigest)
+                for (_, key), hexdigest in zip(missing, hexdigest_list)
+            ]
+            self.set_many(new_items)
+            cached.update(new_items)
+        return [cached[key] for key in key_list]
+
+    def get_file_fingerprint(self, abspath, hash_meth, nbytes=0, **kwargs):
+        """
+        Cached version of :func:`pathlib_mate.hashes.get_file_fingerprint`.
+
+        :type abspath: str
+        :type hash_meth: Callable
+        :type nbytes: int
+        :param kwargs: other arguments for
+            :func:`~pathlib_mate.hashes.get_file_fingerprint`.
+
+        :rtype: str
+        """
+        return self.get_file_fingerprints(abspath, [hash_meth], nbytes, **kwargs)[0]
+
+    def clear(self):
+        """
+        Remove all cached hashes.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM hashes")
@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import os
+import mmap
+import stat
 import hashlib
+import functools
 
-DEFAULT_CHUNK_SIZE = 1 << 6
+DEFAULT_CHUNK_SIZE = 1 << 20
+"""
+Upper bound of the read buffer size when ``chunk_size`` is not given.
+"""
+
+MIN_CHUNK_SIZE = 1 << 16
 
 
 def get_text_fingerprint(text, hash_meth, encoding="utf-8"):  # pragma: no cover
@@ -15,82 +24,230 @@ def get_text_fingerprint(text, hash_meth, encoding="utf-8"):  # pragma: no cover
     return m.hexdigest()
 
 
-def get_file_fingerprint(abspath, hash_meth, nbytes=0, chunk_size=DEFAULT_CHUNK_SIZE):
+def _new_hash(algorithm, data=b""):
+    """
+    ``hashlib.new`` can't be pickled by name, ``functools.partial`` of this
+    module level function can, so the hash methods can be sent to a process
+    pool.
+    """
+    return hashlib.new(algorithm, data)
+
+
+def get_hash_meths(algorithms):
+    """
+    Convert hash algorithm names to hash constructors.
+
+    :type algorithms: Iterable[str]
+    :param algorithms: any algorithm name accepted by ``hashlib.new``, like
+        ``"md5"``, ``"sha256"``, ``"blake2b"``.
+
+    :rtype: List[Callable]
+    """
+    hash_meths = list()
+    for algorithm in algorithms:
+        hashlib.new(algorithm)  # raise ValueError early for unknown names
+        hash_meths.append(functools.partial(_new_hash, algorithm))
+    return hash_meths
+
+
+def get_chunk_size(file_size, blksize=0):
+    """
+    Pick a read buffer size for a file. Small files are read in one call,
+    large files with :data:`DEFAULT_CHUNK_SIZE` bytes per call. The size is
+    a multiple of the file system's preferred block size ``st_blksize``.
+
+    :type file_size: int
+    :type blksize: int
+
+    :rtype: int
+    """
+    blksize = blksize or MIN_CHUNK_SIZE
+    chunk_size = min(max(file_size, MIN_CHUNK_SIZE), DEFAULT_CHUNK_SIZE)
+    return max(-(-chunk_size // blksize) * blksize, blksize)
+
+
+def _hash_mmap(f, hash_list, nbytes):
+    """
+    Feed the file content to the hash objects through a read only memory map.
+
+    :return: False if the file can't be memory mapped (empty file, pipe,
+        special file, file system without mmap support), the caller should
+        fall back to read the file.
+    """
+    st = os.fstat(f.fileno())
+    if not stat.S_ISREG(st.st_mode):
+        return False
+    length = min(nbytes, st.st_size) if nbytes else st.st_size
+    if not length:
+        return False
+    try:
+        mm = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    try:
+        with memoryview(mm) as view:
+            for m in hash_list:
+                m.update(view)
+    finally:
+        mm.close()
+    return True
+
+
+def get_file_fingerprints(
+    abspath,
+    hash_meths,
+    nbytes=0,
+    chunk_size=None,
+    use_mmap=False,
+):
+    """
+    Return several hash values of a file, the file is read only once and
+    every chunk is fed to all the hash objects.
+
+    :type abspath: str
+    :type hash_meths: List[Callable]
+
+    :param nbytes: see :func:`get_file_fingerprint`
+    :param chunk_size: see :func:`get_file_fingerprint`
+    :param use_mmap: see :func:`get_file_fingerprint`
+
+    :rtype: List[str]
+    :return: hexdigests, in the same order as ``hash_meths``.
+    """
     if nbytes < 0:
-        raise ValueError("chunk_size cannot smaller than 0")
-    if chunk_size < 1:
+        raise ValueError("nbytes cannot smaller than 0")
+    if (chunk_size is not None) and (chunk_size < 1):
         raise ValueError("chunk_size cannot smaller than 1")
-    if (nbytes > 0) and (nbytes < chunk_size):
-        chunk_size = nbytes
 
-    m = hash_meth()
-    with open(abspath, "rb") as f:
+    hash_list = [hash_meth() for hash_meth in hash_meths]
+    with open(abspath, "rb", buffering=0) as f:
+        if use_mmap and _hash_mmap(f, hash_list, nbytes):
+            return [m.hexdigest() for m in hash_list]
+        if chunk_size is None:
+            st = os.fstat(f.fileno())
+            chunk_size = get_chunk_size(st.st_size, getattr(st, "st_blksize", 0))
         if nbytes:  # use first n bytes
-            have_reads = 0
+            chunk_size = min(chunk_size, nbytes)
+        with memoryview(bytearray(chunk_size)) as view:
+            remaining = nbytes
             while True:
-                have_reads += chunk_size
-                if have_reads > nbytes:
-                    n = nbytes - (have_reads - chunk_size)
-                    if n:
-                        data = f.read(n)
-                        m.update(data)
-                    break
+                if nbytes and remaining < chunk_size:
+                    if not remaining:
+                        break
+                    n = f.readinto(view[:remaining])
                 else:
-                    data = f.read(chunk_size)
-                    m.update(data)
-        else:  # use entire content
-            while True:
-                data = f.read(chunk_size)
-                if not data:
+                    n = f.readinto(view)
+                if not n:
                     break
-                m.update(data)
+                with view[:n] as data:
+                    for m in hash_list:
+                        m.update(data)
+                remaining -= n
 
-    return m.hexdigest()
+    return [m.hexdigest() for m in hash_list]
+
+
+def get_file_fingerprint(
+    abspath,
+    hash_meth,
+    nbytes=0,
+    chunk_size=None,
+    use_mmap=False,
+):
+    """
+    Return hash value of a file, or of the first ``nbytes`` bytes of it.
 
+    The file is read with ``readinto()`` into one preallocated buffer, and
+    ``memoryview`` slices of it are passed to ``hash_meth``, no bytes object
+    is created per chunk. With ``use_mmap=True`` the file is memory mapped
+    instead, and the mapping is hashed without any copy in Python.
 
-def md5file(abspath, nbytes=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    :type abspath: str
+    :type hash_meth: Callable
+
+    :type nbytes: int
+    :param nbytes: only hash the first N bytes of the file. if 0, hash the
+        whole file.
+
+    :type chunk_size: Optional[int]
+    :param chunk_size: read buffer size. if None, it is picked from the file
+        size and ``st_blksize``, see :func:`get_chunk_size`.
+
+    :type use_mmap: bool
+    :param use_mmap: hash a memory map of the file (only the first
+        ``nbytes`` bytes are mapped). It falls back to reading the file for
+        empty files, pipes and file systems that don't support mmap. It is
+        usually the fastest way for large files on local disks.
+
+    :rtype: str
+    """
+    return get_file_fingerprints(
+        abspath,
+        [hash_meth],
+        nbytes=nbytes,
+        chunk_size=chunk_size,
+        use_mmap=use_mmap,
+    )[0]
+
+
+def md5file(abspath, nbytes=0, chunk_size=None, use_mmap=False):
     """
     Return md5 hash value of a piece of a file
 
-    Estimate processing time on:
+    The throughput is close to ``hashlib`` hashing in memory data,
+    see ``benchmark/bench_hashes.py``.
 
     :param abspath: the absolute path to the file
     :param nbytes: only has first N bytes of the file. if 0 or None,
       hash all file
-
-    CPU = i7-4600U 2.10GHz - 2.70GHz, RAM = 8.00 GB
-    1 second can process 0.25GB data
-
-    - 0.59G - 2.43 sec
-    - 1.3G - 5.68 sec
-    - 1.9G - 7.72 sec
-    - 2.5G - 10.32 sec
-    - 3.9G - 16.0 sec
+    :param chunk_size: read buffer size, see :func:`get_file_fingerprint`
+    :param use_mmap: hash a memory map of the file, see
+      :func:`get_file_fingerprint`
     """
-    return get_file_fingerprint(abspath, hashlib.md5, nbytes=nbytes, chunk_size=chunk_size)
+    return get_file_fingerprint(
+        abspath,
+        hashlib.md5,
+        nbytes=nbytes,
+        chunk_size=chunk_size,
+        use_mmap=use_mmap,
+    )
 
 
-def sha256file(abspath, nbytes=0, chunk_size=DEFAULT_CHUNK_SIZE):
+def sha256file(abspath, nbytes=0, chunk_size=None, use_mmap=False):
     """
     Return sha256 hash value of a piece of a file
 
-    Estimate processing time on:
-
     :param abspath: the absolute path to the file
     :param nbytes: only has first N bytes of the file. if 0 or None,
       hash all file
+    :param chunk_size: read buffer size, see :func:`get_file_fingerprint`
+    :param use_mmap: hash a memory map of the file, see
+      :func:`get_file_fingerprint`
     """
-    return get_file_fingerprint(abspath, hashlib.sha256, nbytes=nbytes, chunk_size=chunk_size)
+    return get_file_fingerprint(
+        abspath,
+        hashlib.sha256,
+        nbytes=nbytes,
+        chunk_size=chunk_size,
+        use_mmap=use_mmap,
+    )
 
 
-def sha512file(abspath, nbytes=0, chunk_size=DEFAULT_CHUNK_SIZE):
+def sha512file(abspath, nbytes=0, chunk_size=None, use_mmap=False):
     """
     Return sha512 hash value of a piece of a file
 
-    Estimate processing time on:
-
     :param abspath: the absolute path to the file
     :param nbytes: only has first N bytes of the file. if 0 or None,
       hash all file
+    :param chunk_size: read buffer size, see :func:`get_file_fingerprint`
+    :param use_mmap: hash a memory map of the file, see
+      :func:`get_file_fingerprint`
     """
-    return get_file_fingerprint(abspath, hashlib.sha512, nbytes=nbytes, chunk_size=chunk_size)
+    return get_file_fingerprint(
+        abspath,
+        hashlib.sha512,
+        nbytes=nbytes,
+        chunk_size=chunk_size,
+        use_mmap=use_mmap,
+    )
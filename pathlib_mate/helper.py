@@ -1,16 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from .vendor import six
-
 
 def ensure_str(value):
     """
     Ensure value is string.
     """
-    if isinstance(value, six.string_types):
+    if isinstance(value, str):
         return value
     else:
-        return six.text_type(value)
+        return str(value)
 
 
 def ensure_list(path_or_path_list):
@@ -36,6 +34,31 @@ def ensure_list(path_or_path_list):
         return [ensure_str(path_or_path_list), ]
 
 
+def bounded_map(executor, func, iterable, max_pending):
+    """
+    Like ``executor.map(func, iterable)``, results are yielded in input order,
+    but at most ``max_pending`` tasks are submitted and not yet consumed at
+    any time. So it doesn't consume the whole ``iterable`` up front, and the
+    memory used by finished but not consumed results is bounded.
+
+    :type executor: concurrent.futures.Executor
+    :type func: Callable
+    :type iterable: Iterable
+    :type max_pending: int
+
+    :rtype: Iterable
+    """
+    from collections import deque
+
+    pending = deque()
+    for item in iterable:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
 MAGNITUDE_OF_DATA = {
     i: v
     for i, v in enumerate(["B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB"])
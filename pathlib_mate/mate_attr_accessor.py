@@ -4,16 +4,16 @@
 Provides additional attribute accessor.
 """
 
-from typing import TYPE_CHECKING
-from datetime import datetime
-
-from .vendor import six
+from typing import TYPE_CHECKING, Optional
+import os
+import time
 
 from .str_encode import encode_hexstr
 from .helper import repr_data_size
 
 if TYPE_CHECKING:  # pragma: no cover
     from .pathlib2 import Path
+    from .stat_cache import StatCache
 
 
 class AttrAccessor(object):
@@ -21,6 +21,119 @@ class AttrAccessor(object):
     Provides additional attribute accessor.
     """
 
+    stat_cache_ttl = None  # type: Optional[float]
+    """
+    Seconds before the stat result cached on a Path instance expires.
+    None means it never expires, call :meth:`refresh` to get fresh values.
+    """
+
+    stat_cache = None  # type: Optional[StatCache]
+    """
+    Optional process wide :class:`~pathlib_mate.stat_cache.StatCache`
+    shared by all Path instances.
+    """
+
+    def _get_stat(self):
+        """
+        Return the ``os.stat_result`` backing the ``size``, ``mtime``,
+        ``atime`` and ``ctime`` attributes. It is cached on the instance
+        (see :attr:`stat_cache_ttl`) and in the :attr:`stat_cache` if it is
+        installed. If this path was yielded by a directory walk, the
+        ``os.DirEntry.stat()`` result is reused.
+
+        :type self: Path
+
+        :rtype: os.stat_result
+        """
+        ttl = self.stat_cache_ttl
+        try:
+            if (ttl is None) or (time.monotonic() - self._stat_time < ttl):
+                return self._stat
+            self.invalidate_stat()
+        except AttributeError:
+            pass
+
+        cache = self.stat_cache
+        st = None
+        if cache is not None:
+            abspath = self.abspath
+            st = cache.get(abspath)
+        if st is None:
+            entry = self._get_entry()
+            if entry is None:
+                st = self.stat()
+            else:
+                st = entry.stat()
+            if cache is not None:
+                cache.set(abspath, st)
+        self._stat = st
+        self._stat_time = time.monotonic()
+        return st
+
+    def _set_entry(self, entry):
+        """
+        Remember the ``os.DirEntry`` this path was yielded by, see
+        :meth:`_get_entry`.
+
+        :type self: Path
+        :type entry: os.DirEntry
+        """
+        self._entry = entry
+        self._entry_time = time.monotonic()
+
+    def _get_entry(self):
+        """
+        Return the ``os.DirEntry`` this path was yielded by, or None. The
+        entry caches the file type and stat result forever, so it expires
+        like the cached stat result, after :attr:`stat_cache_ttl` seconds,
+        or the ttl of the :attr:`stat_cache` if it is installed.
+
+        :type self: Path
+
+        :rtype: Optional[os.DirEntry]
+        """
+        entry = self._entry
+        if entry is None:
+            return None
+        ttl = self.stat_cache_ttl
+        cache = self.stat_cache
+        if (cache is not None) and (cache.ttl is not None):
+            ttl = cache.ttl if ttl is None else min(ttl, cache.ttl)
+        if (ttl is not None) and (time.monotonic() - self._entry_time >= ttl):
+            self.invalidate_stat()
+            return None
+        return entry
+
+    def invalidate_stat(self):
+        """
+        Drop the cached stat result and file type of this path, the next
+        attribute access hits the file system again. Methods that change the
+        file, like ``moveto``, ``copyto``, ``remove``, ``touch`` and the
+        ``write_xxx`` / ``atomic_write_xxx`` methods, call it automatically.
+
+        :type self: Path
+        """
+        try:
+            del self._stat
+        except AttributeError:
+            pass
+        self._entry = None
+        cache = self.stat_cache
+        if cache is not None:
+            cache.invalidate(self.abspath)
+
+    def refresh(self):
+        """
+        Drop the cached stat result and fetch a fresh one.
+
+        :type self: Path
+
+        :rtype: Path
+        """
+        self.invalidate_stat()
+        self._get_stat()
+        return self
+
     # --- property methods that returns a value ---
     @property
     def abspath(self):
@@ -32,6 +145,8 @@ class AttrAccessor(object):
         :rtype: str
 
         Example: ``C:\User\admin\readme.txt`` for ``C:\User\admin\readme.txt``
+
+        The value is cached on the instance, see :meth:`Path.absolute`.
         """
         return self.absolute().__str__()
 
@@ -56,8 +171,20 @@ class AttrAccessor(object):
         :rtype: str
 
         Example: ``C:\User\admin`` for ``C:\User\admin\readme.txt``
+
+        The value is cached on the instance, for relative path it is
+        computed again after the current working directory changes.
         """
-        return self.parent.abspath
+        cwd = None if self.is_absolute() else os.getcwd()
+        try:
+            cached_cwd, dirpath = self._dirpath
+            if cached_cwd == cwd:
+                return dirpath
+        except AttributeError:
+            pass
+        dirpath = self.parent.abspath
+        self._dirpath = (cwd, dirpath)
+        return dirpath
 
     @property
     def dirpath_hexstr(self):
@@ -164,11 +291,7 @@ class AttrAccessor(object):
 
         :rtype: int
         """
-        try:
-            return self._stat.st_size
-        except:  # pragma: no cover
-            self._stat = self.stat()
-            return self.size
+        return self._get_stat().st_size
 
     @property
     def size_in_text(self):
@@ -190,11 +313,7 @@ class AttrAccessor(object):
 
         :rtype: float
         """
-        try:
-            return self._stat.st_mtime
-        except:  # pragma: no cover
-            self._stat = self.stat()
-            return self.mtime
+        return self._get_stat().st_mtime
 
     @property
     def atime(self):
@@ -205,11 +324,7 @@ class AttrAccessor(object):
 
         :rtype: float
         """
-        try:
-            return self._stat.st_atime
-        except:  # pragma: no cover
-            self._stat = self.stat()
-            return self.atime
+        return self._get_stat().st_atime
 
     @property
     def ctime(self):
@@ -220,11 +335,7 @@ class AttrAccessor(object):
 
         :rtype: float
         """
-        try:
-            return self._stat.st_ctime
-        except:  # pragma: no cover
-            self._stat = self.stat()
-            return self.ctime
+        return self._get_stat().st_ctime
 
     @property
     def modify_datetime(self):
@@ -235,6 +346,8 @@ class AttrAccessor(object):
 
         :rtype: datetime
         """
+        from datetime import datetime
+
         return datetime.fromtimestamp(self.mtime)
 
     @property
@@ -246,6 +359,8 @@ class AttrAccessor(object):
 
         :rtype: datetime
         """
+        from datetime import datetime
+
         return datetime.fromtimestamp(self.atime)
 
     @property
@@ -257,10 +372,12 @@ class AttrAccessor(object):
 
         :rtype: datetime
         """
+        from datetime import datetime
+
         return datetime.fromtimestamp(self.ctime)
 
     def __contains__(self, item):
-        if isinstance(item, six.string_types):
+        if isinstance(item, str):
             return self.abspath in item
         else:
             return self.abspath in item.abspath
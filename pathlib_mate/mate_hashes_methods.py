@@ -4,12 +4,14 @@
 Provide file hash functions.
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
-from .hashes import md5file, sha256file, sha512file
+# hashlib and the hash functions are imported on first use, so that
+# ``import pathlib_mate`` stays fast
 
 if TYPE_CHECKING:  # pragma: no cover
     from .pathlib2 import Path
+    from .hash_cache import HashCache
 
 
 class HashesMethods(object):
@@ -17,18 +19,134 @@ class HashesMethods(object):
     Provide hash functions.
     """
 
-    # --- file check sum ---
+    hash_cache = None  # type: Optional[HashCache]
+    """
+    Optional persistent :class:`~pathlib_mate.hash_cache.HashCache`, files
+    that haven't changed since they were hashed are not read again.
+    """
+
+    def _get_file_fingerprints(
+        self,
+        hash_meths,
+        nbytes=0,
+        chunk_size=None,
+        use_mmap=False,
+    ):
+        """
+        Hash this file with several hash methods in one read pass, through
+        the :attr:`hash_cache` if it is installed.
+
+        :type self: Path
+
+        :rtype: List[str]
+        """
+        from .hashes import get_file_fingerprints
+
+        cache = self.hash_cache
+        if cache is None:
+            get = get_file_fingerprints
+        else:
+            get = cache.get_file_fingerprints
+        return get(
+            self.abspath,
+            hash_meths,
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )
+
+    def _get_file_fingerprint(
+        self,
+        hash_meth,
+        nbytes=0,
+        chunk_size=None,
+        use_mmap=False,
+    ):
+        """
+        Hash this file, through the :attr:`hash_cache` if it is installed.
+
+        :type self: Path
 
-    def get_partial_md5(self, nbytes):
+        :rtype: str
+        """
+        return self._get_file_fingerprints(
+            [hash_meth],
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )[0]
+
+    def get_hashes(
+        self,
+        algorithms=("md5", "sha256"),
+        nbytes=0,
+        chunk_size=None,
+        use_mmap=False,
+    ):
+        """
+        Return several check sums of this file, the file is read only once
+        and every chunk is fed to all hash objects. Example::
+
+            >>> Path("file.txt").get_hashes(algorithms=("md5", "sha256"))
+            {"md5": "...", "sha256": "..."}
+
+        :type self: Path
+
+        :type algorithms: Iterable[str]
+        :param algorithms: any algorithm name accepted by ``hashlib.new``.
+
+        :type nbytes: int
+        :param nbytes: if 0, hash the whole file.
+
+        :type chunk_size: Optional[int]
+        :param chunk_size: read buffer size, by default it is picked from
+            the file size and the file system block size.
+
+        :type use_mmap: bool
+        :param use_mmap: hash a read only memory map of the file instead of
+            reading it, only the first ``nbytes`` bytes are mapped.
+
+        :rtype: Dict[str, str]
+        :return: algorithm name to hexdigest.
+        """
+        from .hashes import get_hash_meths
+
+        algorithms = list(algorithms)
+        hexdigest_list = self._get_file_fingerprints(
+            get_hash_meths(algorithms),
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )
+        return dict(zip(algorithms, hexdigest_list))
+
+    def get_partial_md5(self, nbytes, chunk_size=None, use_mmap=False):
         """
         Return md5 check sum of first n bytes of this file.
 
         :type self: Path
+
         :type nbytes: int
+        :param nbytes: if 0, hash the whole file.
+
+        :type chunk_size: Optional[int]
+        :param chunk_size: read buffer size, by default it is picked from
+            the file size and the file system block size.
+
+        :type use_mmap: bool
+        :param use_mmap: hash a read only memory map of the file instead of
+            reading it, only the first ``nbytes`` bytes are mapped.
 
         :rtype: str
         """
-        return md5file(abspath=self.abspath, nbytes=nbytes)
+        import hashlib
+
+        return self._get_file_fingerprint(
+            hashlib.md5,
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )
 
     @property
     def md5(self):
@@ -39,18 +157,37 @@ class HashesMethods(object):
 
         :rtype: str
         """
-        return md5file(self.abspath)
+        import hashlib
 
-    def get_partial_sha256(self, nbytes):
+        return self._get_file_fingerprint(hashlib.md5)
+
+    def get_partial_sha256(self, nbytes, chunk_size=None, use_mmap=False):
         """
         Return sha256 check sum of first n bytes of this file.
 
         :type self: Path
+
         :type nbytes: int
+        :param nbytes: if 0, hash the whole file.
+
+        :type chunk_size: Optional[int]
+        :param chunk_size: read buffer size, by default it is picked from
+            the file size and the file system block size.
+
+        :type use_mmap: bool
+        :param use_mmap: hash a read only memory map of the file instead of
+            reading it, only the first ``nbytes`` bytes are mapped.
 
         :rtype: str
         """
-        return sha256file(abspath=self.abspath, nbytes=nbytes)
+        import hashlib
+
+        return self._get_file_fingerprint(
+            hashlib.sha256,
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )
 
     @property
     def sha256(self):
@@ -61,18 +198,37 @@ class HashesMethods(object):
 
         :rtype: str
         """
-        return sha256file(self.abspath)
+        import hashlib
 
-    def get_partial_sha512(self, nbytes):
+        return self._get_file_fingerprint(hashlib.sha256)
+
+    def get_partial_sha512(self, nbytes, chunk_size=None, use_mmap=False):
         """
         Return sha512 check sum of first n bytes of this file.
 
         :type self: Path
+
         :type nbytes: int
+        :param nbytes: if 0, hash the whole file.
+
+        :type chunk_size: Optional[int]
+        :param chunk_size: read buffer size, by default it is picked from
+            the file size and the file system block size.
+
+        :type use_mmap: bool
+        :param use_mmap: hash a read only memory map of the file instead of
+            reading it, only the first ``nbytes`` bytes are mapped.
 
         :rtype: str
         """
-        return sha512file(abspath=self.abspath, nbytes=nbytes)
+        import hashlib
+
+        return self._get_file_fingerprint(
+            hashlib.sha512,
+            nbytes=nbytes,
+            chunk_size=chunk_size,
+            use_mmap=use_mmap,
+        )
 
     @property
     def sha512(self):
@@ -83,4 +239,6 @@ class HashesMethods(object):
 
         :rtype: str
         """
-        return sha512file(self.abspath)
+        import hashlib
+
+        return self._get_file_fingerprint(hashlib.sha512)
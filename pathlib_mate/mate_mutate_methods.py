@@ -6,7 +6,6 @@ Provide methods to mutate the Path instance.
 
 from typing import TYPE_CHECKING, Union
 import os
-import shutil
 
 if TYPE_CHECKING:  # pragma: no cover
     from .pathlib2 import Path
@@ -147,6 +146,23 @@ class MutateMethods(object):
         else:
             return False
 
+    def _is_same_file(self, other):
+        """
+        Test if two paths point to the same file. Comparing ``abspath`` is
+        not enough: a symlink, a hard link, or a different case on a case
+        insensitive file system are different paths of the same file.
+
+        :type self: Path
+        :type other: Path
+        :rtype: bool
+        """
+        if self.abspath == other.abspath:
+            return True
+        try:
+            return os.path.samefile(self.abspath, other.abspath)
+        except OSError:  # one of them doesn't exist
+            return False
+
     def moveto(
         self,
         new_abspath=None,
@@ -188,9 +204,17 @@ class MutateMethods(object):
             new_ext=new_ext,
         )
 
-        if p.is_not_exist_or_allow_overwrite(overwrite=overwrite):
+        # on a case insensitive file system, a rename that only changes the
+        # case has a target that "exists" and is the same file, let it through.
+        # on a case sensitive one they are two files, the usual checks apply
+        is_case_rename = (
+            self.abspath != p.abspath
+            and self.abspath.lower() == p.abspath.lower()
+            and self._is_same_file(p)
+        )
+        if is_case_rename or p.is_not_exist_or_allow_overwrite(overwrite=overwrite):
             # 如果两个路径不同, 才进行move
-            if self.abspath != p.abspath:
+            if is_case_rename or not self._is_same_file(p):
                 if makedirs:
                     parent = p.parent
                     if not parent.exists():
@@ -208,11 +232,18 @@ class MutateMethods(object):
         new_ext=None,
         overwrite=False,
         makedirs=False,
+        method="auto",
+        stats=None,
     ):
         """
         Similar to :meth:`~pathlib_mate.mate_mutate_methods.MutateMethods.change`
         method. However, it copy the original path to new location.
 
+        The content is copied by the kernel when it can, with a reflink,
+        ``os.copy_file_range`` or ``os.sendfile``, see
+        :func:`~pathlib_mate.copier.copy_file`. The permission bits are
+        copied like ``shutil.copy``.
+
         :type self: Path
         :type new_abspath: Union[str, Path]
         :type new_dirpath: str
@@ -222,6 +253,15 @@ class MutateMethods(object):
         :type new_ext: str
         :type overwrite: bool
         :type makedirs: bool
+
+        :type method: str
+        :param method: ``"auto"``, or one of
+            :data:`~pathlib_mate.copier.METHODS` to force a copy method.
+
+        :type stats: Optional[CopyStats]
+        :param stats: a :class:`~pathlib_mate.copier.CopyStats` to record the
+            method used.
+
         :rtype: Path
 
         **中文文档**
@@ -241,17 +281,181 @@ class MutateMethods(object):
 
         if p.is_not_exist_or_allow_overwrite(overwrite=overwrite):
             # 如果两个路径不同, 才进行copy
-            if self.abspath != p.abspath:
+            if not self._is_same_file(p):
+                import shutil
+                from .copier import copy_file
+
+                def copy():
+                    dst = p.abspath
+                    if os.path.isdir(dst):  # same as shutil.copy
+                        dst = os.path.join(dst, self.basename)
+                    copy_file(
+                        self.abspath,
+                        dst,
+                        copy_stat=False,
+                        method=method,
+                        stats=stats,
+                    )
+                    shutil.copymode(self.abspath, dst)
+
                 try:
-                    shutil.copy(self.abspath, p.abspath)
+                    copy()
                 except IOError as e:
                     if makedirs:
                         os.makedirs(p.parent.abspath)
-                        shutil.copy(self.abspath, p.abspath)
+                        copy()
                     else:
                         raise e
+                p.invalidate_stat()
         return p
 
+    def copy_tree_to(
+        self,
+        dst,
+        workers=None,
+        filters=None,
+        prune=None,
+        overwrite=False,
+        symlinks=False,
+        progress=None,
+        method="auto",
+        stats=None,
+    ):
+        """
+        Copy this directory and everything in it to ``dst``, with
+        :func:`~pathlib_mate.copier.copy_tree`.
+
+        File content is copied by the kernel (``os.copy_file_range`` or
+        ``os.sendfile``) when the platform supports it, the files are copied
+        by ``workers`` threads, and the directories are created by the
+        calling thread as the tree is walked.
+
+        :type self: Path
+
+        :type dst: Union[str, Path]
+        :param dst: the destination directory, it is created if needed.
+
+        :type workers: Optional[int]
+        :param workers: number of copy threads, None means copy in the calling
+            thread.
+
+        :type filters: Optional[Callable]
+        :param filters: a callable that takes a file Path and returns True if
+            it should be copied.
+
+        :type prune: Union[None, Callable, str, List[str]]
+        :param prune: directories to skip, see
+            :meth:`~pathlib_mate.mate_path_filters.PathFilters.select`.
+
+        :type overwrite: bool
+        :param overwrite: if False, files that already exist in ``dst`` are
+            not overwritten, and reported in a ``shutil.Error`` raised once
+            everything else is copied.
+
+        :type symlinks: bool
+        :param symlinks: if True, copy symlinks as symlinks, otherwise copy
+            what they point to.
+
+        :type progress: Optional[Callable]
+        :param progress: called as ``progress(n_done, n_total, size_done,
+            size_total)`` after each file is copied.
+
+        :type method: str
+        :param method: the copy method, see
+            :func:`~pathlib_mate.copier.copy_file`.
+
+        :type stats: Optional[CopyStats]
+        :param stats: a :class:`~pathlib_mate.copier.CopyStats` to record the
+            method used for each file.
+
+        :rtype: int
+        :return: number of copied files.
+
+        **中文文档**
+
+        将整个目录拷贝到 ``dst``. 文件内容由内核直接拷贝, 多个线程并行拷贝文件.
+        """
+        from . import copier
+        from .mate_path_filters import all_true, to_prune_func
+
+        self.assert_is_dir_and_exists()
+        if filters is all_true:
+            filters = None
+        return copier.copy_tree(
+            self.abspath,
+            str(dst),
+            workers=workers,
+            filters=filters,
+            prune=to_prune_func(prune),
+            overwrite=overwrite,
+            symlinks=symlinks,
+            progress=progress,
+            method=method,
+            stats=stats,
+        )
+
+    @classmethod
+    def bulk_move(cls, plan, overwrite=False, makedirs=False, workers=None):
+        """
+        Move or rename many files and directories at once, with
+        :func:`~pathlib_mate.mover.bulk_move`.
+
+        Unlike calling :meth:`moveto` in a loop, the whole plan is checked
+        before anything is moved: duplicate targets, missing sources and
+        existing targets are reported together, each parent directory is
+        listed once, and each missing target directory is created once.
+        Swaps and chains like ``a -> b, b -> c`` are ordered so no file is
+        overwritten by the plan itself.
+
+        Example::
+
+            >>> Path.bulk_move({
+            ...     "a.txt": "b.txt",
+            ...     "b.txt": "a.txt",
+            ...     "c.txt": "archive/c.txt",
+            ... }, makedirs=True)
+            3
+
+        :type plan: Union[Mapping, Iterable[Tuple]]
+        :param plan: a ``{src: dst}`` mapping or ``(src, dst)`` pairs, of
+            str or Path.
+
+        :type overwrite: bool
+        :param overwrite: if False, raise ``FileExistsError`` if a target
+            already exists, before anything is moved.
+
+        :type makedirs: bool
+        :param makedirs: if True, create the missing target directories.
+
+        :type workers: Optional[int]
+        :param workers: number of threads, None means rename in the calling
+            thread.
+
+        :rtype: int
+        :return: number of moved paths.
+
+        **中文文档**
+
+        批量移动 / 重命名. 在移动之前, 先在内存中检查整个计划 (重复的目标,
+        互换等), 每个需要的目录只创建一次.
+        """
+        from .mover import bulk_move
+
+        if hasattr(plan, "items"):
+            plan = plan.items()
+        plan = list(plan)
+        try:
+            return bulk_move(
+                plan, overwrite=overwrite, makedirs=makedirs, workers=workers
+            )
+        finally:
+            for pair in plan:
+                for path in pair:
+                    if isinstance(path, cls):
+                        path.invalidate_stat()
+                    elif cls.stat_cache is not None:
+                        cls.stat_cache.invalidate(os.path.abspath(str(path)))
+
     def remove(self):
         """
         Remove this file. Won't work if it is a directory.
@@ -268,7 +472,10 @@ class MutateMethods(object):
         """
         if self.exists():
             if self.is_dir():
+                import shutil
+
                 shutil.rmtree(self.abspath)
+                self.invalidate_stat()
             else:
                 self.remove()
 
@@ -4,21 +4,155 @@
 Provide friendly path filter API.
 """
 
-from typing import TYPE_CHECKING, Iterable
-from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+import os
+import re
 
 from .helper import ensure_list
 
 if TYPE_CHECKING:  # pragma: no cover
     from .pathlib2 import Path
+    from .walker import ScanEntry
 
-ts_2100 = (datetime(2100, 1, 1) - datetime(1970, 1, 1)).total_seconds()
+ts_2100 = 4102444800.0  # 2100-01-01 00:00:00 UTC
 
 
 def all_true(anything):
     return True
 
 
+def to_prune_func(prune):
+    """
+    Normalize the ``prune`` argument of the select methods to a callable.
+
+    :type prune: Union[None, Callable, str, List[str]]
+    :param prune: ``None``, a callable that takes a directory
+        :class:`~pathlib_mate.pathlib2.Path` and returns True if it should be
+        skipped, or one or a list of directory name glob patterns such as
+        ``[".git", "node_modules", "*.egg-info"]``.
+
+    :rtype: Optional[Callable]
+    """
+    if prune is None or callable(prune):
+        return prune
+    import fnmatch
+
+    pattern = re.compile(
+        "|".join([fnmatch.translate(name) for name in ensure_list(prune)])
+    )
+
+    def prune_func(p):
+        return pattern.match(p.name) is not None
+
+    return prune_func
+
+
+def _translate_glob_part(part):
+    """
+    Translate one path component of a glob pattern to a regular expression.
+    Unlike ``fnmatch.translate``, wildcards never match ``/``.
+
+    :type part: str
+
+    :rtype: str
+    """
+    i, n = 0, len(part)
+    res = list()
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == "*":
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                res.append("\\[")
+            else:
+                stuff = part[i:j].replace("\\", "\\\\")
+                stuff = re.sub(r"([&~|[])", r"\\\1", stuff)
+                i = j + 1
+                if stuff[0] == "!":
+                    stuff = "^/" + stuff[1:]
+                elif stuff[0] == "^":
+                    stuff = "\\" + stuff
+                res.append("[%s]" % stuff)
+        else:
+            res.append(re.escape(c))
+    return "".join(res)
+
+
+def _escape_glob(name):
+    """
+    Escape the glob special characters in a literal string.
+
+    :type name: str
+
+    :rtype: str
+    """
+    return re.sub(r"([*?[])", r"[\1]", name)
+
+
+def compile_glob_patterns(patterns, case_sensitive=True):
+    """
+    Compile several glob patterns into one regular expression, that matches
+    a ``/`` separated relative path in one go. The named group
+    ``"p{index}"`` of the first matching pattern is set, use
+    ``patterns[int(match.lastgroup[1:])]`` to find out which one matched.
+
+    ``*``, ``?`` and ``[seq]`` match within one path component, and ``**``
+    as an entire component matches zero or more directories, same as
+    :meth:`~pathlib_mate.pathlib2.Path.glob`.
+
+    :type patterns: List[str]
+    :param patterns: relative glob patterns, like
+        ``["*.py", "**/*.txt", "docs/*.rst"]``.
+
+    :type case_sensitive: bool
+
+    :rtype: Tuple[re.Pattern, Optional[int]]
+    :return: the compiled regex, and the max depth of a matching path. The
+        depth is None if any pattern contains ``**``.
+    """
+    alternatives = list()
+    max_depth = 0
+    for index, pattern in enumerate(patterns):
+        parts = [part for part in pattern.split("/") if part and part != "."]
+        if not parts:
+            raise ValueError("Unacceptable pattern: {0!r}".format(pattern))
+        if parts[-1] == "**":
+            raise ValueError(
+                "Invalid pattern: {0!r}, use '**/*' to match everything".format(
+                    pattern
+                )
+            )
+        pieces = list()
+        for part in parts[:-1]:
+            if part == "**":
+                pieces.append("(?:[^/]+/)*")
+                max_depth = None
+            elif "**" in part:
+                raise ValueError(
+                    "Invalid pattern: '**' can only be an entire path component"
+                )
+            else:
+                pieces.append(_translate_glob_part(part) + "/")
+        pieces.append(_translate_glob_part(parts[-1]))
+        alternatives.append("(?P<p%s>%s)" % (index, "".join(pieces)))
+        if max_depth is not None:
+            max_depth = max(max_depth, len(parts))
+    flags = 0 if case_sensitive else re.IGNORECASE
+    regex = re.compile("(?:%s)\\Z" % "|".join(alternatives), flags)
+    return regex, max_depth
+
+
 def _sort_by(key):
     """
     High order function for sort methods.
@@ -76,7 +210,95 @@ class PathFilters(object):
             raise EnvironmentError(msg)
 
     # --- select ---
-    def select(self, filters=all_true, recursive=True):
+    def glob_many(self, patterns, prune=None, case_sensitive=None):
+        """
+        Yield the paths matching any of the glob patterns, together with the
+        first pattern that matched. All patterns are compiled into one
+        regular expression and the tree is walked only once, no matter how
+        many patterns there are::
+
+            >>> for p, pattern in Path("repo").glob_many(["*.py", "**/*.pyi"]):
+            ...     print(p, pattern)
+
+        :type self: Path
+
+        :type patterns: Union[str, List[str]]
+        :param patterns: relative glob patterns, see
+            :func:`compile_glob_patterns`.
+
+        :type prune: Union[Callable, str, List[str]]
+        :param prune: directories to skip entirely, see :meth:`select`.
+
+        :type case_sensitive: Optional[bool]
+        :param case_sensitive: by default it is case sensitive except on
+            Windows, same as :meth:`~pathlib_mate.pathlib2.Path.glob`.
+
+        :rtype: Iterable[Tuple[Path, str]]
+        """
+        return self._glob_many(
+            ensure_list(patterns),
+            prune=to_prune_func(prune),
+            case_sensitive=case_sensitive,
+        )
+
+    def _glob_many(
+        self,
+        patterns,
+        prune=None,
+        case_sensitive=None,
+        max_depth=None,
+        workers=None,
+        ordered=False,
+    ):
+        """
+        Engine of :meth:`glob_many` and of the ``patterns`` argument of
+        :meth:`select`.
+
+        :type self: Path
+
+        :rtype: Iterable[Tuple[Path, str]]
+        """
+        if case_sensitive is None:
+            case_sensitive = os.name != "nt"
+        regex, depth = compile_glob_patterns(patterns, case_sensitive)
+        if (max_depth is None) or (depth is not None and depth < max_depth):
+            max_depth = depth
+
+        if workers:
+            from .walker import walk_parallel
+
+            n_parts = len(self.parts)
+
+            def paths():
+                for p in walk_parallel(
+                    self, workers=workers, prune=prune, ordered=ordered
+                ):
+                    parts = p.parts[n_parts:]
+                    if (max_depth is None) or len(parts) <= max_depth:
+                        yield "/".join(parts), p
+
+        else:
+            from .walker import walk
+
+            def paths():
+                return walk(self, prune=prune, max_depth=max_depth)
+
+        match = regex.match
+        for relpath, p in paths():
+            m = match(relpath)
+            if m is not None:
+                yield p, patterns[int(m.lastgroup[1:])]
+
+    def select(
+        self,
+        filters=all_true,
+        recursive=True,
+        prune=None,
+        workers=None,
+        ordered=False,
+        patterns=None,
+        case_sensitive=None,
+    ):
         """Select path by criterion.
 
         :type self: Path
@@ -89,6 +311,34 @@ class PathFilters(object):
         :type recursive: bool
         :param recursive: include files in sub-folder or not.
 
+        :type prune: Union[Callable, str, List[str]]
+        :param prune: directories to skip entirely. Either a callable that
+            takes a directory :class:`~pathlib_mate.pathlib2.Path` and returns
+            True to skip it, or one or a list of directory name glob patterns.
+            A pruned directory is not yielded and is never listed, which is
+            much cheaper than filtering out everything under it.
+
+        :type workers: Optional[int]
+        :param workers: if given, list directories concurrently with this
+            many threads. It helps a lot on network file systems like
+            NFS, where each directory listing is latency bound.
+            See :func:`~pathlib_mate.walker.walk_parallel`.
+
+        :type ordered: bool
+        :param ordered: only used with ``workers``. If True, yield paths in
+            the same order as the sequential walk, otherwise yield them
+            as soon as their directory has been listed.
+
+        :type patterns: Optional[Union[str, List[str]]]
+        :param patterns: only select paths matching one of these relative
+            glob patterns, like ``["*.py", "docs/**/*.rst"]``. The tree is
+            walked once for all patterns, see :meth:`glob_many`. If
+            ``recursive`` is False, only the direct children can match.
+
+        :type case_sensitive: Optional[bool]
+        :param case_sensitive: only used with ``patterns``, see
+            :meth:`glob_many`.
+
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -97,21 +347,55 @@ class PathFilters(object):
         """
         self.assert_is_dir_and_exists()
 
-        if recursive:
-            for p in self.glob("**/*"):
+        prune = to_prune_func(prune)
+        if patterns is not None:
+            for p, _ in self._glob_many(
+                ensure_list(patterns),
+                prune=prune,
+                case_sensitive=case_sensitive,
+                max_depth=None if recursive else 1,
+                workers=workers,
+                ordered=ordered,
+            ):
                 if filters(p):
                     yield p
+            return
+        # all walks are scandir based, the yielded path remembers its
+        # ``os.DirEntry``, so type checks and stat based filters are cheap
+        if recursive and workers:
+            from .walker import walk_parallel
+
+            paths = walk_parallel(
+                self, workers=workers, prune=prune, ordered=ordered
+            )
+        elif recursive:
+            paths = self.glob("**/*", prune=prune)
         else:
-            for p in self.iterdir():
-                if filters(p):
-                    yield p
+            paths = self.glob("*", prune=prune)
+        for p in paths:
+            if filters(p):
+                yield p
 
-    def select_file(self, filters=all_true, recursive=True):
+    def select_file(
+        self,
+        filters=all_true,
+        recursive=True,
+        prune=None,
+        workers=None,
+        ordered=False,
+        patterns=None,
+        case_sensitive=None,
+    ):
         """Select file path by criterion.
 
         :type self: Path
         :type filters: Callable
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
+        :type workers: Optional[int]
+        :type ordered: bool
+        :type patterns: Optional[Union[str, List[str]]]
+        :type case_sensitive: Optional[bool]
 
         :rtype: Iterable[Path]
 
@@ -119,16 +403,37 @@ class PathFilters(object):
 
         根据 ``filters`` 中定义的条件选择文件.
         """
-        for p in self.select(filters, recursive):
-            if p.is_file():
+        for p in self.select(
+            recursive=recursive,
+            prune=prune,
+            workers=workers,
+            ordered=ordered,
+            patterns=patterns,
+            case_sensitive=case_sensitive,
+        ):
+            if p.is_file() and filters(p):
                 yield p
 
-    def select_dir(self, filters=all_true, recursive=True):
+    def select_dir(
+        self,
+        filters=all_true,
+        recursive=True,
+        prune=None,
+        workers=None,
+        ordered=False,
+        patterns=None,
+        case_sensitive=None,
+    ):
         """Select dir path by criterion.
 
         :type self: Path
         :type filters: Callable
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
+        :type workers: Optional[int]
+        :type ordered: bool
+        :type patterns: Optional[Union[str, List[str]]]
+        :type case_sensitive: Optional[bool]
 
         :rtype: Iterable[Path]
 
@@ -136,10 +441,43 @@ class PathFilters(object):
 
         根据 ``filters`` 中定义的条件选择文件夹.
         """
-        for p in self.select(filters, recursive):
-            if p.is_dir():
+        for p in self.select(
+            recursive=recursive,
+            prune=prune,
+            workers=workers,
+            ordered=ordered,
+            patterns=patterns,
+            case_sensitive=case_sensitive,
+        ):
+            if p.is_dir() and filters(p):
                 yield p
 
+    def scan(self, recursive=True, prune=None):
+        """
+        Fast scan of the files and directories, that yields lightweight
+        :class:`~pathlib_mate.walker.ScanEntry` records instead of ``Path``
+        objects. A record has ``abspath``, ``name``, ``is_dir``, ``is_file``,
+        ``size`` and ``mtime``, and :meth:`~pathlib_mate.walker.ScanEntry.to_path`
+        converts it to a ``Path`` on demand::
+
+            >>> total = sum(e.size for e in Path("data").scan() if e.is_file)
+
+        :type self: Path
+
+        :type recursive: bool
+        :param recursive: include files in sub-folder or not.
+
+        :type prune: Union[Callable, str, List[str]]
+        :param prune: directories to skip entirely, see :meth:`select`. A
+            callable receives the directory's ``ScanEntry``.
+
+        :rtype: Iterable[ScanEntry]
+        """
+        from .walker import scan
+
+        self.assert_is_dir_and_exists()
+        return scan(self, recursive=recursive, prune=to_prune_func(prune))
+
     @property
     def n_file(self):
         """
@@ -203,13 +541,14 @@ class PathFilters(object):
         return n
 
     # --- Select by built-in criterion ---
-    def select_by_ext(self, ext, recursive=True):
+    def select_by_ext(self, ext, recursive=True, prune=None):
         """
         Select file path by extension.
 
         :type self: Path
         :type ext: str
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -218,16 +557,30 @@ class PathFilters(object):
         """
         ext = [ext.strip().lower() for ext in ensure_list(ext)]
 
-        def filters(p):
-            return p.suffix.lower() in ext
-
-        return self.select_file(filters, recursive)
+        # ``Path.suffix`` is never empty and has exactly one dot, other
+        # values can't match
+        ext = [
+            e
+            for e in ext
+            if e.startswith(".") and len(e) > 1 and not ("." in e[1:] or "/" in e)
+        ]
+        if not ext:
+            return iter([])
+        # "?*" makes sure the name has a stem, like ``Path.suffix``
+        patterns = ["**/?*" + _escape_glob(e) for e in ext]
+        return self.select_file(
+            recursive=recursive,
+            prune=prune,
+            patterns=patterns,
+            case_sensitive=False,
+        )
 
     def select_by_pattern_in_fname(
         self,
         pattern,
         recursive=True,
         case_sensitive=False,
+        prune=None,
     ):
         """
         Select file path by text pattern in file name.
@@ -235,6 +588,7 @@ class PathFilters(object):
         :type self: Path
         :type pattern: str
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -252,13 +606,14 @@ class PathFilters(object):
             def filters(p):
                 return pattern in p.fname.lower()
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
     def select_by_pattern_in_abspath(
         self,
         pattern,
         recursive=True,
         case_sensitive=False,
+        prune=None,
     ):
         """
         Select file path by text pattern in absolute path.
@@ -266,6 +621,7 @@ class PathFilters(object):
         :type self: Path
         :type pattern: str
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -283,13 +639,14 @@ class PathFilters(object):
             def filters(p):
                 return pattern in p.abspath.lower()
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
     def select_by_size(
         self,
         min_size=0,
         max_size=1 << 40,
         recursive=True,
+        prune=None,
     ):
         """
         Select file path by size.
@@ -298,6 +655,7 @@ class PathFilters(object):
         :type min_size: int
         :type max_size: int
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -308,13 +666,14 @@ class PathFilters(object):
         def filters(p):
             return min_size <= p.size <= max_size
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
     def select_by_mtime(
         self,
         min_time=0,
         max_time=ts_2100,
         recursive=True,
+        prune=None,
     ):
         """
         Select file path by modify time.
@@ -328,6 +687,7 @@ class PathFilters(object):
         :param max_time: upper bound timestamp
 
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
 
         :rtype: Iterable[Path]
 
@@ -339,9 +699,15 @@ class PathFilters(object):
         def filters(p):
             return min_time <= p.mtime <= max_time
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
-    def select_by_atime(self, min_time=0, max_time=ts_2100, recursive=True):
+    def select_by_atime(
+        self,
+        min_time=0,
+        max_time=ts_2100,
+        recursive=True,
+        prune=None,
+    ):
         """
         Select file path by access time.
 
@@ -354,6 +720,7 @@ class PathFilters(object):
         :param max_time: upper bound timestamp
 
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -364,13 +731,14 @@ class PathFilters(object):
         def filters(p):
             return min_time <= p.atime <= max_time
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
     def select_by_ctime(
         self,
         min_time=0,
         max_time=ts_2100,
         recursive=True,
+        prune=None,
     ):
         """
         Select file path by create time.
@@ -384,6 +752,7 @@ class PathFilters(object):
         :param max_time: upper bound timestamp
 
         :type recursive: bool
+        :type prune: Union[Callable, str, List[str]]
         :rtype: Iterable[Path]
 
         **中文文档**
@@ -394,7 +763,7 @@ class PathFilters(object):
         def filters(p):
             return min_time <= p.ctime <= max_time
 
-        return self.select_file(filters, recursive)
+        return self.select_file(filters, recursive, prune)
 
     # --- Select Special File Type ---
     _image_ext = [
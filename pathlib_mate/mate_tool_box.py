@@ -4,17 +4,14 @@
 File system utility tool box. mimic linux ``md5``, ``zip``, etc...
 """
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 import os
 import warnings
-import hashlib
+import functools
 import contextlib
 
-from .vendor import six
-from .vendor.fileutils import atomic_save
-
 from .mate_path_filters import all_true
-from .helper import repr_data_size
+from .helper import repr_data_size, bounded_map
 from .mate_tool_box_zip import ToolBoxZip
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -22,34 +19,158 @@ if TYPE_CHECKING:  # pragma: no cover
 
 
 class ToolBox(ToolBoxZip):
-    def get_dir_fingerprint(self, hash_meth):
+    def _get_dir_fingerprints(self, hash_meths, workers=None, use_process=False):
         """
-        Return md5 fingerprint of a directory. Calculation is based on
+        Compute the directory fingerprint of several hash methods, every
+        file is read only once. See :meth:`ToolBox.get_dir_fingerprint`.
+
+        :type self: Path
+        :type hash_meths: List[Callable]
+
+        :rtype: List[str]
+        """
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+        from .hashes import get_file_fingerprints
+
+        path_list = self.sort_by_abspath(self.select_file(recursive=True))
+        abspath_list = [p.abspath for p in path_list]
+
+        # with a hash cache, only the files that changed are hashed
+        cache = self.hash_cache
+        if cache is not None:
+            keys_list = [
+                cache.get_keys(abspath, hash_meths) for abspath in abspath_list
+            ]
+            cached = cache.get_many(
+                [key for key_list in keys_list for key in key_list]
+            )
+            to_hash = [
+                abspath
+                for abspath, key_list in zip(abspath_list, keys_list)
+                if not all(key in cached for key in key_list)
+            ]
+        else:
+            to_hash = abspath_list
+
+        func = functools.partial(get_file_fingerprints, hash_meths=hash_meths)
+        if workers:
+            if use_process:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers)
+            with executor:
+                hexdigests_list = list(
+                    bounded_map(executor, func, to_hash, workers * 4)
+                )
+        else:
+            hexdigests_list = [func(abspath) for abspath in to_hash]
+
+        if cache is not None:
+            hashed = dict(zip(to_hash, hexdigests_list))
+            new_items = list()
+            hexdigests_list = list()
+            for abspath, key_list in zip(abspath_list, keys_list):
+                try:
+                    hexdigest_list = hashed[abspath]
+                    new_items.extend(zip(key_list, hexdigest_list))
+                except KeyError:
+                    hexdigest_list = [cached[key] for key in key_list]
+                hexdigests_list.append(hexdigest_list)
+            cache.set_many(new_items)
+
+        hash_list = [hash_meth() for hash_meth in hash_meths]
+        for p, hexdigest_list in zip(path_list, hexdigests_list):
+            path_bytes = str(p).encode("utf-8")
+            for m, hexdigest in zip(hash_list, hexdigest_list):
+                m.update(path_bytes)
+                m.update(hexdigest.encode("utf-8"))
+        return [m.hexdigest() for m in hash_list]
+
+    def get_dir_fingerprint(self, hash_meth, workers=None, use_process=False):
+        """
+        Return fingerprint of a directory. Calculation is based on
         iterate recursively through all files, ordered by absolute path,
-        and stream in md5 for each file.
+        and stream in the path and the ``hash_meth`` hash of each file.
+
+        Files can be hashed in parallel. ``hashlib`` releases the GIL while
+        hashing, so threads can keep a fast disk busy. The per file hashes
+        are always combined in the same order, so the result doesn't depend
+        on ``workers``.
+
+        If :attr:`~pathlib_mate.mate_hashes_methods.HashesMethods.hash_cache`
+        is installed, files that haven't changed since they were hashed
+        are not read again.
 
         :type self: Path
         :type hash_meth: Callable
 
+        :type workers: Optional[int]
+        :param workers: hash this many files at the same time.
+
+        :type use_process: bool
+        :param use_process: use a process pool instead of a thread pool.
+
         :rtype: str
         """
-        m = hash_meth()
-        for p in self.sort_by_abspath(self.select_file(recursive=True)):
-            m.update(str(p).encode("utf-8"))
-            m.update(p.md5.encode("utf-8"))
-        return m.hexdigest()
+        return self._get_dir_fingerprints(
+            [hash_meth],
+            workers=workers,
+            use_process=use_process,
+        )[0]
+
+    def get_dir_hashes(
+        self,
+        algorithms=("md5", "sha256"),
+        workers=None,
+        use_process=False,
+    ):
+        """
+        Return several fingerprints of a directory, every file is read only
+        once. Each fingerprint equals the :meth:`ToolBox.get_dir_fingerprint`
+        of the same algorithm. Example::
+
+            >>> Path("dir").get_dir_hashes(algorithms=("md5", "sha256"))
+            {"md5": "...", "sha256": "..."}
+
+        :type self: Path
+
+        :type algorithms: Iterable[str]
+        :param algorithms: any algorithm name accepted by ``hashlib.new``.
+
+        :type workers: Optional[int]
+        :param workers: hash this many files at the same time.
+
+        :type use_process: bool
+        :param use_process: use a process pool instead of a thread pool.
+
+        :rtype: Dict[str, str]
+        :return: algorithm name to hexdigest.
+        """
+        from .hashes import get_hash_meths
+
+        algorithms = list(algorithms)
+        hexdigest_list = self._get_dir_fingerprints(
+            get_hash_meths(algorithms),
+            workers=workers,
+            use_process=use_process,
+        )
+        return dict(zip(algorithms, hexdigest_list))
 
     @property
     def dir_md5(self):
         """
         Return md5 fingerprint of a directory.
 
-        See :meth:`ToolBox.get_dir_fingerprint` for details
+        See :meth:`ToolBox.get_dir_fingerprint` for details, use
+        ``get_dir_fingerprint(hashlib.md5, workers=8)`` to hash files in
+        parallel.
 
         :type self: Path
 
         :rtype: str
         """
+        import hashlib
+
         return self.get_dir_fingerprint(hashlib.md5)
 
     @property
@@ -57,12 +178,16 @@ class ToolBox(ToolBoxZip):
         """
         Return sha256 fingerprint of a directory.
 
-        See :meth:`ToolBox.get_dir_fingerprint` for details
+        See :meth:`ToolBox.get_dir_fingerprint` for details, use
+        ``get_dir_fingerprint(hashlib.sha256, workers=8)`` to hash files in
+        parallel.
 
         :type self: Path
 
         :rtype: str
         """
+        import hashlib
+
         return self.get_dir_fingerprint(hashlib.sha256)
 
     @property
@@ -70,12 +195,16 @@ class ToolBox(ToolBoxZip):
         """
         Return sha512 fingerprint of a directory.
 
-        See :meth:`ToolBox.get_dir_fingerprint` for details
+        See :meth:`ToolBox.get_dir_fingerprint` for details, use
+        ``get_dir_fingerprint(hashlib.sha512, workers=8)`` to hash files in
+        parallel.
 
         :type self: Path
 
         :rtype: str
         """
+        import hashlib
+
         return self.get_dir_fingerprint(hashlib.sha512)
 
     def is_empty(self, strict=True):
@@ -207,14 +336,28 @@ class ToolBox(ToolBoxZip):
             for p2, size2 in size_table2[:top_n]:
                 print("    {:<9}    {:<9}".format(repr_data_size(size2), p2.abspath))
 
-    def file_stat_for_all(self, filters=all_true):  # pragma: no cover
+    def file_stat_for_all(self, filters=all_true, stream=False, compact=False):
         """
         Find out how many files, directories and total size (Include file in
         it's sub-folder) it has for each folder and sub-folder.
 
+        The tree is walked once and the totals are added bottom up, see
+        :func:`~pathlib_mate.walker.dir_stats`.
+
         :type self: Path
         :type filters: Callable
 
+        :type stream: bool
+        :param stream: if True, return an iterator of ``(directory path,
+            stat)`` tuples, each directory is yielded as soon as its sub tree
+            is done, sub directories come before their parent. The memory
+            doesn't grow with the size of the tree.
+
+        :type compact: bool
+        :param compact: if True, return a
+            :class:`~pathlib_mate.walker.DirStatTable`, which stores the
+            stats in arrays and works like the dict.
+
         :rtype: dict
         :returns: stat, a dict like ``{"directory path": {
           "file": number of files, "dir": number of directories,
@@ -226,38 +369,20 @@ class ToolBox(ToolBoxZip):
         """
         self.assert_is_dir_and_exists()
 
-        from collections import OrderedDict
-
-        stat = OrderedDict()
-        stat[self.abspath] = {"file": 0, "dir": 0, "size": 0}
-
-        for p in self.select(filters=filters, recursive=True):
-            if p.is_file():
-                size = p.size
-                while 1:
-                    parent = p.parent
-
-                    stat[parent.abspath]["file"] += 1
-                    stat[parent.abspath]["size"] += size
-
-                    if parent.abspath == self.abspath:
-                        break
-
-                    p = parent
-
-            elif p.is_dir():
-                stat[p.abspath] = {"file": 0, "dir": 0, "size": 0}
-
-                while 1:
-                    parent = p.parent
-                    stat[parent.abspath]["dir"] += 1
-
-                    if parent.abspath == self.abspath:
-                        break
+        from .walker import dir_stats, DirStatTable
 
-                    p = parent
-
-        return stat
+        if filters is all_true:
+            filters = None
+        rows = dir_stats(self, filters=filters)
+        if stream:
+            return (
+                (abspath, {"file": n_file, "dir": n_dir, "size": size})
+                for _, abspath, n_file, n_dir, size in rows
+            )
+        table = DirStatTable.from_rows(rows)
+        if compact:
+            return table
+        return table.to_dict()
 
     def file_stat(self, filters=all_true):
         """Find out how many files, directorys and total size (Include file in
@@ -343,10 +468,7 @@ class ToolBox(ToolBoxZip):
         self.assert_is_dir_and_exists()
 
         if py_exe is None:
-            if six.PY2:
-                py_exe = "python2"
-            elif six.PY3:
-                py_exe = "python3"
+            py_exe = "python3"
 
         for p in self.select_by_ext(".py"):
             subprocess.Popen('%s "%s"' % (py_exe, p.abspath))
@@ -442,8 +564,11 @@ class ToolBox(ToolBoxZip):
         if overwrite is False:  # pragma: no cover
             if self.exists():
                 raise FileExistsError("file already exists!")
+        from .vendor.fileutils import atomic_save
+
         with atomic_save(self.abspath, text_mode=False) as f:
             f.write(data)
+        self.invalidate_stat()
 
     def atomic_write_text(self, data, encoding="utf-8", overwrite=False):
         """
@@ -463,8 +588,11 @@ class ToolBox(ToolBoxZip):
         if overwrite is False:  # pragma: no cover
             if self.exists():
                 raise FileExistsError("file already exists!")
+        from .vendor.fileutils import atomic_save
+
         with atomic_save(self.abspath, text_mode=False) as f:
             f.write(data.encode(encoding))
+        self.invalidate_stat()
 
     def atomic_open(
         self,
@@ -497,6 +625,8 @@ class ToolBox(ToolBoxZip):
 
         - https://boltons.readthedocs.io/en/latest/fileutils.html#boltons.fileutils.atomic_save
         """
+        from .vendor.fileutils import atomic_save
+
         if mode in ["r", "rb", "a"]:
             return self.open(
                 mode=mode,
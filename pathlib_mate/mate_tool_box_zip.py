@@ -4,14 +4,11 @@
 Provide zip related functions.
 """
 
-from typing import TYPE_CHECKING, Optional, List, Union
+from typing import TYPE_CHECKING, Iterable, Optional, List, Tuple, Union
 import os
-import random
 import string
-from datetime import datetime
-from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED
 
-from .mate_path_filters import all_true
+from .mate_path_filters import all_true, to_prune_func
 from .helper import repr_data_size
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -26,6 +23,8 @@ def rand_str(length):
 
     :rtype: str
     """
+    import random
+
     return "".join([random.choice(alpha_digits) for _ in range(length)])
 
 
@@ -42,6 +41,8 @@ class ToolBoxZip(object):
 
         :rtype: Path
         """
+        from datetime import datetime
+
         new_basename = "{}-{}-{}.zip".format(
             self.basename,
             datetime.now().strftime("%Y-%m-%d-%Hh-%Mm-%Ss"),
@@ -49,6 +50,36 @@ class ToolBoxZip(object):
         )
         return self.change(new_basename=new_basename)
 
+    @staticmethod
+    def _write_zip_members(zf, members, policy, workers, callback=None):
+        """
+        :type zf: zipfile.ZipFile
+        :type members: Iterable[Tuple[str, str]]
+        :type policy: pathlib_mate.zip_writer.CompressionPolicy
+        :type workers: Optional[int]
+        :type callback: Optional[Callable]
+        """
+        if workers is None:
+            for abspath, arcname in members:
+                zf.write(
+                    abspath,
+                    arcname,
+                    compress_type=policy.get_compress_type(abspath),
+                    compresslevel=policy.level,
+                )
+                if callback is not None:
+                    callback(zf.filelist[-1])
+        else:
+            from .zip_writer import write_members
+
+            write_members(
+                zf,
+                members,
+                workers=workers,
+                callback=callback,
+                policy=policy,
+            )
+
     def make_zip_archive(
         self,
         dst=None,
@@ -58,10 +89,20 @@ class ToolBoxZip(object):
         makedirs=False,
         include_dir=True,
         verbose=False,
+        prune=None,
+        workers=None,
+        progress=None,
+        compression=None,
+        compress_level=None,
+        store_ext=True,
+        entropy_probe=False,
     ):
         """
         Make a zip archive of a directory or a file.
 
+        Entries are written as the directory walk finds them, the memory
+        doesn't grow with the number of files.
+
         :type self: Path
 
         :type dst: Optional[Union[Path, str]]
@@ -71,7 +112,7 @@ class ToolBoxZip(object):
         :param filters: custom path filter. By default it allows any file.
 
         :type compress: bool
-        :param compress: compress or not.
+        :param compress: compress or not, see ``compression`` as well.
 
         :type verbose: bool
         :param overwrite: overwrite exists or not.
@@ -86,7 +127,46 @@ class ToolBoxZip(object):
 
         :type verbose: bool
         :param verbose: display log or not.
+
+        :type prune: Union[Callable, str, List[str]]
+        :param prune: directories to skip entirely, see
+            :meth:`~pathlib_mate.mate_path_filters.PathFilters.select`.
+
+        :type workers: Optional[int]
+        :param workers: if given, files are cut into blocks and the blocks are
+            compressed by this many threads, the members are still written in
+            order. Stored files are streamed into the archive. See
+            :func:`~pathlib_mate.zip_writer.write_members`.
+
+        :type progress: Optional[Callable]
+        :param progress: called as ``progress(n_done, n_total, size_done,
+            size_total)`` after each file is written. The totals take one
+            more walk of the directory, it is only done if ``progress`` is
+            given or ``verbose`` is True.
+
+        :type compression: Optional[int]
+        :param compression: ``zipfile.ZIP_DEFLATED``, ``ZIP_BZIP2``,
+            ``ZIP_LZMA`` or ``ZIP_STORED``, it overrides ``compress``.
+
+        :type compress_level: Optional[int]
+        :param compress_level: compression level, None is the default of the
+            algorithm.
+
+        :type store_ext: Union[bool, List[str]]
+        :param store_ext: files with these extensions are stored without
+            compression. The default True means the formats that are
+            compressed already, like ``.jpg``, ``.mp4`` and ``.zip``, see
+            :func:`~pathlib_mate.zip_writer.get_compressed_ext`. False
+            compresses every file.
+
+        :type entropy_probe: bool
+        :param entropy_probe: if True, files whose first few KB look random,
+            like compressed data with an unknown extension, are stored. See
+            :class:`~pathlib_mate.zip_writer.CompressionPolicy`.
         """
+        from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED
+        from .zip_writer import CompressionPolicy
+
         self.assert_exists()
 
         if dst is None:
@@ -101,10 +181,17 @@ class ToolBoxZip(object):
             if not overwrite:
                 raise IOError("'%s' already exists!" % dst)
 
-        if compress:
-            compression = ZIP_DEFLATED
-        else:
-            compression = ZIP_STORED
+        if compression is None:
+            if compress:
+                compression = ZIP_DEFLATED
+            else:
+                compression = ZIP_STORED
+        policy = CompressionPolicy(
+            compression,
+            level=compress_level,
+            store_ext=store_ext,
+            entropy_probe=entropy_probe,
+        )
 
         if not dst.parent.exists():
             if makedirs:  # pragma: no cover
@@ -115,37 +202,105 @@ class ToolBoxZip(object):
             print(msg)
 
         if self.is_dir():
-            total_size = 0
-            selected = list()
-            for p in self.glob("**/*"):
-                if filters(p):
-                    selected.append(p)
-                    total_size += p.size
+            from .walker import walk
+
+            prune = to_prune_func(prune)
+            if include_dir:
+                prefix = self.basename + "/"
+            else:
+                prefix = ""
 
+            def iter_members():
+                # the archive may be inside the directory, it is created
+                # before the walk, so skip it
+                for relpath, p in walk(self, prune=prune):
+                    if filters(p) and p.abspath != dst.abspath:
+                        yield p, prefix + relpath
+
+        elif self.is_file():
+
+            def iter_members():
+                yield self, self.basename
+
+        else:  # pragma: no cover
+            return
+
+        # the totals take one more walk, it is only done when they are used
+        callback = None
+        if verbose or (progress is not None):
+            n_total = 0
+            size_total = 0
+            for p, _ in iter_members():
+                if p.is_file():
+                    n_total += 1
+                    size_total += p.size
             if verbose:
                 msg = "Got {} files, total size is {}, compressing ...".format(
-                    len(selected),
-                    repr_data_size(total_size),
+                    n_total,
+                    repr_data_size(size_total),
                 )
                 print(msg)
+            if progress is not None:
+                done = [0, 0]
 
-            with ZipFile(dst.abspath, "w", compression) as f:
-                if include_dir:
-                    relpath_root = self.parent
-                else:
-                    relpath_root = self
-                for p in selected:
-                    relpath = p.relative_to(relpath_root).__str__()
-                    f.write(p.abspath, relpath)
+                def callback(zinfo):
+                    if not zinfo.is_dir():
+                        done[0] += 1
+                        done[1] += zinfo.file_size
+                        progress(done[0], n_total, done[1], size_total)
 
-        elif self.is_file():
-            with ZipFile(dst.abspath, "w", compression) as f:
-                f.write(self.abspath, self.basename)
+        with ZipFile(dst.abspath, "w", compression) as f:
+            members = ((p.abspath, arcname) for p, arcname in iter_members())
+            self._write_zip_members(f, members, policy, workers, callback)
 
         if verbose:
             msg = "Complete! Archive size is {}.".format(dst.size_in_text)
             print(msg)
 
+    def extract_zip_archive(
+        self,
+        dst,
+        workers=None,
+        filters=None,
+        overwrite=False,
+    ):
+        """
+        Extract this zip archive into a directory.
+
+        :type self: Path
+        :param self: the zip archive.
+
+        :type dst: Union[Path, str]
+        :param dst: the directory to extract to, it is created if needed.
+
+        :type workers: Optional[int]
+        :param workers: if given, members are inflated by this many threads.
+
+        :type filters: Optional[Callable]
+        :param filters: a callable that takes a :class:`zipfile.ZipInfo` and
+            returns True if the member should be extracted, for example
+            ``lambda zinfo: zinfo.filename.startswith("project/data/")``.
+            Members that are filtered out are never read.
+
+        :type overwrite: bool
+        :param overwrite: overwrite existing files or not.
+
+        :rtype: int
+        :return: number of extracted files and directories.
+
+        See :func:`~pathlib_mate.zip_reader.extract_members`.
+        """
+        from .zip_reader import extract_members
+
+        self.assert_is_file_and_exists()
+        return extract_members(
+            self.abspath,
+            str(dst),
+            filters=filters,
+            workers=workers,
+            overwrite=overwrite,
+        )
+
     def backup(
         self,
         dst=None,
@@ -157,10 +312,18 @@ class ToolBoxZip(object):
         case_sensitive=False,
         include_dir=True,
         verbose=True,
+        incremental=False,
+        base=None,
+        hash_algorithm=None,
     ):  # pragma: no cover
         """
         Create a compressed zip archive backup for a directory.
 
+        With ``incremental=True``, the archive gets a manifest of all the
+        backed up files, and with ``base``, only the files that are new or
+        changed since the ``base`` archive are added. Restore a chain with
+        :meth:`restore_backup`, see :mod:`pathlib_mate.zip_backup`.
+
         :type self: Path
 
         :type dst: Optional[Union[Path, str]]
@@ -168,6 +331,8 @@ class ToolBoxZip(object):
 
         :type ignore: Optional[List[str]]
         :param ignore: file or directory defined in this list will be ignored.
+            Items are relative path prefixes, such as ``"build"`` or
+            ``"data/log"``. Ignored directories are not walked at all.
 
         :type ignore_ext: Optional[List[str]]
         :param ignore_ext: file with extensions defined in this list will be ignored.
@@ -194,6 +359,23 @@ class ToolBoxZip(object):
         :type verbose: bool
         :param verbose: display log or not.
 
+        :type incremental: bool
+        :param incremental: if True, add a manifest with the size, the
+            ``mtime_ns`` and optionally the hash of every file, so the
+            archive can be the ``base`` of the next backup. Empty
+            directories are not backed up in this mode.
+
+        :type base: Optional[Union[Path, str]]
+        :param base: the previous archive of the chain, it has to be in the
+            same directory as ``dst``. Files with the same size and
+            ``mtime_ns`` as in its manifest are not added again, deleted
+            files are recorded. It implies ``incremental=True``.
+
+        :type hash_algorithm: Optional[str]
+        :param hash_algorithm: for example ``"sha256"``, record the hash of
+            each file. A file whose size or ``mtime_ns`` changed but whose
+            content is the same is then not added again.
+
         **中文文档**
 
         为一个目录创建一个备份压缩包。可以通过过滤器选择你要备份的文件。
@@ -214,6 +396,7 @@ class ToolBoxZip(object):
         for i in ignore:
             if i.startswith("/") or i.startswith("\\"):
                 raise ValueError
+        ignore = [i.replace("\\", "/") for i in ignore]
 
         ignore_ext = preprocess_arg(ignore_ext)
         for ext in ignore_ext:
@@ -229,10 +412,26 @@ class ToolBoxZip(object):
             ignore_ext = [i.lower() for i in ignore_ext]
             ignore_pattern = [i.lower() for i in ignore_pattern]
 
-        def filters(p):
-            relpath = p.relative_to(self).abspath
+        def get_relpath(p):
+            relpath = p.relative_to(self).as_posix()
             if not case_sensitive:
                 relpath = relpath.lower()
+            return relpath
+
+        def prune(p):
+            # everything under an ignored directory is ignored as well,
+            # skip the whole sub tree instead of filtering each file
+            relpath = get_relpath(p)
+            for i in ignore:
+                if relpath.startswith(i):
+                    return True
+            for pattern in ignore_pattern:
+                if pattern in relpath:
+                    return True
+            return False
+
+        def filters(p):
+            relpath = get_relpath(p)
 
             # ignore
             for i in ignore:
@@ -265,6 +464,18 @@ class ToolBoxZip(object):
 
             return True
 
+        if incremental or (base is not None):
+            self._make_incremental_backup(
+                dst=dst,
+                filters=filters,
+                prune=prune,
+                base=base,
+                include_dir=include_dir,
+                hash_algorithm=hash_algorithm,
+                verbose=verbose,
+            )
+            return
+
         self.make_zip_archive(
             dst=dst,
             filters=filters,
@@ -272,4 +483,130 @@ class ToolBoxZip(object):
             overwrite=False,
             include_dir=include_dir,
             verbose=verbose,
+            prune=prune,
         )
+
+    def _make_incremental_backup(
+        self,
+        dst,
+        filters,
+        prune,
+        base,
+        include_dir,
+        hash_algorithm,
+        verbose,
+    ):
+        """
+        The incremental mode of :meth:`backup`. The tree is walked once, the
+        manifest is built while the changed files are streamed into the
+        archive.
+
+        :type self: Path
+        """
+        from zipfile import ZipFile, ZIP_DEFLATED
+        from .walker import walk
+        from .zip_writer import CompressionPolicy
+        from .zip_backup import (
+            read_manifest,
+            make_manifest,
+            get_racy_ns,
+            MANIFEST_NAME,
+        )
+
+        self.assert_is_dir_and_exists()
+        if dst is None:
+            dst = self._default_zip_dst()
+        else:
+            dst = self.change(new_abspath=dst)
+        if not dst.basename.lower().endswith(".zip"):
+            raise ValueError("zip archive name has to be endswith '.zip'!")
+        if dst.exists():
+            raise IOError("'%s' already exists!" % dst)
+
+        if base is None:
+            parent = None
+            old_files = dict()
+            racy_ns = None
+        else:
+            base = self.change(new_abspath=base)
+            if base.parent != dst.parent:
+                raise ValueError(
+                    "'%s' and '%s' have to be in the same directory!" % (base, dst)
+                )
+            parent = base.basename
+            old_manifest = read_manifest(base.abspath)
+            old_files = old_manifest["files"]
+            racy_ns = get_racy_ns(base.abspath, old_manifest)
+
+        if include_dir:
+            prefix = self.basename + "/"
+        else:
+            prefix = ""
+        archive_name = dst.basename
+        files = dict()
+
+        def iter_members():
+            for relpath, p in walk(self, prune=prune):
+                if (not p.is_file()) or (not filters(p)) or p.abspath == dst.abspath:
+                    continue
+                st = p._get_stat()
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+                old = old_files.get(relpath)
+                # a file modified right before the base was made may have
+                # changed again without a new mtime, it is checked again
+                if (
+                    old is not None
+                    and old[0] == size
+                    and old[1] == mtime_ns
+                    and mtime_ns < racy_ns
+                ):
+                    files[relpath] = old
+                    continue
+                hexdigest = None
+                if hash_algorithm is not None:
+                    hexdigest = p.get_hashes(algorithms=[hash_algorithm])[
+                        hash_algorithm
+                    ]
+                    if old is not None and old[0] == size and old[2] == hexdigest:
+                        # touched but not modified
+                        files[relpath] = [size, mtime_ns, hexdigest, old[3]]
+                        continue
+                files[relpath] = [size, mtime_ns, hexdigest, archive_name]
+                yield p.abspath, prefix + relpath
+
+        if verbose:
+            print("Making incremental backup '%s' of '%s' ..." % (dst, self))
+        with ZipFile(dst.abspath, "w", ZIP_DEFLATED) as zf:
+            policy = CompressionPolicy(ZIP_DEFLATED)
+            self._write_zip_members(zf, iter_members(), policy, workers=None)
+            deleted = sorted(set(old_files).difference(files))
+            manifest = make_manifest(archive_name, parent, prefix, files, deleted)
+            zf.writestr(MANIFEST_NAME, manifest, compress_type=ZIP_DEFLATED)
+            n_added = len(zf.filelist) - 1
+
+        if verbose:
+            msg = "Complete! {} of {} files added, {} deleted, archive size is {}."
+            print(
+                msg.format(n_added, len(files), len(deleted), dst.size_in_text)
+            )
+
+    def restore_backup(self, dst, overwrite=False):
+        """
+        Restore a directory from an incremental backup archive made by
+        :meth:`backup`, and the previous archives of its chain.
+
+        :type self: Path
+        :param self: the last archive of the chain.
+
+        :type dst: Union[Path, str]
+        :param dst: the directory to restore to.
+
+        :type overwrite: bool
+        :param overwrite: overwrite existing files or not.
+
+        :rtype: int
+        :return: number of restored files.
+        """
+        from .zip_backup import restore_backup
+
+        return restore_backup(self.abspath, str(dst), overwrite=overwrite)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+"""
+Move or rename many paths at once.
+
+The whole plan is checked in memory before anything is renamed: the
+sources must exist, the targets must be unique and must not clobber a
+file, unless ``overwrite=True``. The existence checks list each parent
+directory once instead of calling ``stat`` for each path.
+
+Moves that depend on each other are ordered: for ``a -> b, b -> c``,
+``b`` is moved first. Cycles, like ``a -> b, b -> a``, go through a
+temporary name in the directory of their first path. Each chain of
+dependent moves is independent from the others, so chains can run in a
+thread pool, which helps on network file systems where each rename is a
+round trip.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+import os
+import uuid
+import errno
+
+_Step = Tuple[str, str]
+
+
+class MovePlan(object):
+    """
+    A checked move plan, made by :func:`make_move_plan`.
+
+    :param chains: lists of renames, the renames of a list have to be done
+        in order, the lists are independent.
+    :param mkdirs: the target directories to create first.
+    :param n_move: the number of moved paths.
+    """
+
+    __slots__ = ("chains", "mkdirs", "n_move")
+
+    def __init__(self, chains, mkdirs, n_move):
+        self.chains = chains  # type: List[List[_Step]]
+        self.mkdirs = mkdirs  # type: List[str]
+        self.n_move = n_move  # type: int
+
+
+def _list_dirs(dir_paths):
+    """
+    :type dir_paths: Iterable[str]
+
+    :rtype: Dict[str, Optional[Set[str]]]
+    :return: directory -> names in it, None if the directory doesn't exist.
+    """
+    listing = dict()  # type: Dict[str, Optional[Set[str]]]
+    for dir_path in dir_paths:
+        try:
+            listing[dir_path] = set(os.listdir(dir_path))
+        except (FileNotFoundError, NotADirectoryError):
+            listing[dir_path] = None
+    return listing
+
+
+def _abspath(path):
+    """
+    :type path: Union[str, Path]
+    :rtype: str
+    """
+    try:
+        return path.abspath  # Path caches it
+    except AttributeError:
+        return os.path.abspath(path)
+
+
+def _format(paths, limit=5):
+    """
+    :type paths: List[str]
+    :rtype: str
+    """
+    text = ", ".join("'%s'" % path for path in paths[:limit])
+    if len(paths) > limit:
+        text += " and %s more" % (len(paths) - limit)
+    return text
+
+
+def make_move_plan(plan, overwrite=False, makedirs=False):
+    """
+    Check a move plan and order its renames.
+
+    :type plan: Union[Mapping, Iterable[Tuple]]
+    :param plan: a ``{src: dst}`` mapping or ``(src, dst)`` pairs, of str or
+        :class:`~pathlib_mate.pathlib2.Path`. Relative paths are relative to
+        the current directory. Moves where ``src`` is ``dst`` are skipped.
+
+    :type overwrite: bool
+    :param overwrite: if False, raise ``FileExistsError`` if a target exists
+        and is not moved away by the plan itself.
+
+    :type makedirs: bool
+    :param makedirs: if True, plan to create the missing target
+        directories, otherwise raise ``FileNotFoundError``.
+
+    :rtype: MovePlan
+    """
+    if hasattr(plan, "items"):
+        plan = plan.items()
+    by_src = dict()  # type: Dict[str, str]
+    by_dst = dict()  # type: Dict[str, str]
+    dup_src, dup_dst = list(), list()
+    for src, dst in plan:
+        src = _abspath(src)
+        dst = _abspath(dst)
+        if src == dst:
+            continue
+        if src in by_src:
+            dup_src.append(src)
+        if dst in by_dst:
+            dup_dst.append(dst)
+        by_src[src] = dst
+        by_dst[dst] = src
+    if dup_src:
+        raise ValueError("paths moved more than once: %s!" % _format(dup_src))
+    if dup_dst:
+        raise ValueError("paths used as target more than once: %s!" % _format(dup_dst))
+
+    # each path is split once, the checks below only use these
+    split = {path: os.path.split(path) for path in list(by_src) + list(by_dst)}
+
+    # a path inside a moved directory, or inside a target, would be renamed
+    # from / to a path that doesn't exist anymore / yet
+    moved = set(by_src)
+    moved.update(by_dst)
+    clean = set()  # type: Set[str] # directories with no moved ancestor
+
+    def is_nested(dir_path):
+        chain = list()
+        while dir_path not in clean:
+            if dir_path in moved:
+                return True
+            chain.append(dir_path)
+            parent = os.path.dirname(dir_path)
+            if parent == dir_path:
+                break
+            dir_path = parent
+        clean.update(chain)
+        return False
+
+    nested = [path for path, (dir_path, _) in split.items() if is_nested(dir_path)]
+    if nested:
+        raise ValueError(
+            "paths inside a directory that is moved, or is a target: %s!"
+            % _format(nested)
+        )
+
+    listing = _list_dirs({split[src][0] for src in by_src})
+    missing = [
+        src
+        for src in by_src
+        if not listing[split[src][0]] or split[src][1] not in listing[split[src][0]]
+    ]
+    if missing:
+        raise FileNotFoundError("paths to move don't exist: %s!" % _format(missing))
+
+    dst_dirs = {split[dst][0] for dst in by_dst}
+    listing.update(_list_dirs(dst_dirs.difference(listing)))
+    mkdirs = sorted(dir_path for dir_path in dst_dirs if listing[dir_path] is None)
+    if mkdirs and not makedirs:
+        raise FileNotFoundError(
+            "target directories don't exist: %s!" % _format(mkdirs)
+        )
+    if not overwrite:
+        existing = [
+            dst
+            for dst in by_dst
+            if dst not in by_src
+            and listing[split[dst][0]]
+            and split[dst][1] in listing[split[dst][0]]
+        ]
+        if existing:
+            raise FileExistsError("targets already exist: %s!" % _format(existing))
+
+    # the moves form chains and cycles, a chain starts with a path that is
+    # not a target, and has to be moved from its end
+    chains = list()  # type: List[List[_Step]]
+    visited = set()  # type: Set[str]
+    for src in by_src:
+        if src in by_dst:
+            continue
+        chain = [src]
+        while by_src[chain[-1]] in by_src:
+            chain.append(by_src[chain[-1]])
+        visited.update(chain)
+        chains.append([(path, by_src[path]) for path in reversed(chain)])
+    for src in by_src:
+        if src in visited:
+            continue
+        cycle = [src]
+        while by_src[cycle[-1]] != src:
+            cycle.append(by_src[cycle[-1]])
+        visited.update(cycle)
+        tmp = os.path.join(
+            os.path.dirname(src), ".bulk_move-%s" % uuid.uuid4().hex
+        )
+        steps = [(src, tmp)]
+        steps.extend((path, by_src[path]) for path in reversed(cycle[1:]))
+        steps.append((tmp, by_src[src]))
+        chains.append(steps)
+    return MovePlan(chains=chains, mkdirs=mkdirs, n_move=len(by_src))
+
+
+def bulk_move(plan, overwrite=False, makedirs=False, workers=None):
+    """
+    Move or rename many paths, see :func:`make_move_plan` for the checks done
+    before anything is moved.
+
+    If a rename fails, the other renames of its chain are not done, the
+    other chains are, and the errors are raised together at the end as a
+    ``shutil.Error`` of ``(src, dst, message)``. If a cycle fails after its
+    first path was renamed to a temporary ``.bulk_move-*`` name, the path
+    left at the temporary name is reported in the ``shutil.Error`` too.
+
+    With ``overwrite=False``, a target that was created after the plan was
+    checked is not overwritten: ``os.rename`` replaces files silently on
+    POSIX, so each target is checked right before its rename, and the chain
+    stops with a ``FileExistsError`` message.
+
+    :type plan: Union[Mapping, Iterable[Tuple]]
+    :param plan: a ``{src: dst}`` mapping or ``(src, dst)`` pairs.
+
+    :type overwrite: bool
+    :type makedirs: bool
+
+    :type workers: Optional[int]
+    :param workers: number of threads, None means rename in the calling
+        thread.
+
+    :rtype: int
+    :return: number of moved paths.
+    """
+    import shutil
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers has to be greater than 0!")
+    move_plan = make_move_plan(plan, overwrite=overwrite, makedirs=makedirs)
+    for dir_path in move_plan.mkdirs:
+        os.makedirs(dir_path, exist_ok=True)
+
+    rename = os.replace if overwrite else os.rename
+
+    def run(steps):
+        # a cycle starts by renaming a path to a temporary name, and ends by
+        # renaming the temporary name to its target
+        is_cycle = len(steps) > 1 and steps[0][1] == steps[-1][0]
+        for i, (src, dst) in enumerate(steps):
+            try:
+                if not overwrite and os.path.lexists(dst):
+                    raise FileExistsError(
+                        errno.EEXIST, os.strerror(errno.EEXIST), dst
+                    )
+                rename(src, dst)
+            except OSError as e:
+                # the next renames of the chain would overwrite ``dst``
+                errors = [(src, dst, str(e))]
+                if is_cycle and 0 < i < len(steps) - 1:
+                    tmp, final_dst = steps[-1]
+                    errors.append(
+                        (tmp, final_dst, "left at the temporary name '%s'" % tmp)
+                    )
+                return errors
+        return []
+
+    if workers is None:
+        results = [run(steps) for steps in move_plan.chains]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, move_plan.chains))
+    errors = [error for result in results for error in result]
+    if errors:
+        raise shutil.Error(errors)
+    return move_plan.n_move
@@ -2,8 +2,6 @@
 # Copyright (c) 2012-2014 Antoine Pitrou and contributors
 # Distributed under the terms of the MIT License.
 
-import ctypes
-import fnmatch
 import functools
 import io
 import ntpath
@@ -13,8 +11,6 @@ import re
 from typing import (
     TypeVar, Type, Union, Text, Tuple, List, Any, Callable, Iterable, Optional
 )
-
-from .vendor import six
 import sys
 
 from errno import EINVAL, ENOENT, ENOTDIR, EBADF
@@ -23,17 +19,16 @@ from operator import attrgetter
 from stat import (
     S_ISDIR, S_ISLNK, S_ISREG, S_ISSOCK, S_ISBLK, S_ISCHR, S_ISFIFO)
 
-if six.PY2:
-    from collections import Sequence
-else:
-    from collections.abc import Sequence
+from collections.abc import Sequence
+
+
+def urlquote_from_bytes(bs):
+    # type: (bytes) -> str
+    # urllib.parse is only needed by as_uri(), import it on first use
+    from urllib.parse import quote_from_bytes
+
+    return quote_from_bytes(bs)
 
-if six.PY2:
-    import urllib
-    urlquote_from_bytes = urllib.quote  # type: Callable[[bytes], str]
-else:
-    import urllib.parse
-    urlquote_from_bytes = urllib.parse.quote_from_bytes
 
 try:
     intern = intern  # type: ignore
@@ -83,15 +78,8 @@ def _ignore_error(exception):
 
 def _py2_fsencode(part):
     # type: (Text) -> str
-    if six.PY2 and isinstance(part, six.text_type):
-        # py2 => minimal unicode support
-        # note: in rare circumstances, on Python < 3.2,
-        # getfilesystemencoding can return None, in that
-        # case fall back to ascii
-        return part.encode(sys.getfilesystemencoding() or 'ascii')
-    else:
-        assert isinstance(part, str)
-        return part
+    assert isinstance(part, str)
+    return part
 
 
 def _try_except_fileexistserror(
@@ -189,6 +177,7 @@ def _win32_get_unique_path_id(path):
     # get file information, needed for samefile on older Python versions
     # see http://timgolden.me.uk/python/win32_how_do_i/
     # see_if_two_files_are_the_same_file.html
+    import ctypes
     from ctypes import POINTER, Structure, WinError
     from ctypes.wintypes import DWORD, HANDLE, BOOL
 
@@ -745,21 +734,25 @@ class _Selector:
             self.successor = _TerminatingSelector()
             self.dironly = False
 
-    def select_from(self, parent_path):
+    def select_from(self, parent_path, prune=None):
         """Iterate over all child paths of `parent_path` matched by this
-        selector.  This can contain parent_path itself."""
+        selector.  This can contain parent_path itself.
+
+        If ``prune`` is given, it is called with every sub directory found
+        during the walk. Directories it returns True for are neither yielded
+        nor descended into."""
         path_cls = type(parent_path)
         is_dir = path_cls.is_dir
         exists = path_cls.exists
         scandir = parent_path._accessor.scandir
         if not is_dir(parent_path):
             return iter([])
-        return self._select_from(parent_path, is_dir, exists, scandir)
+        return self._select_from(parent_path, is_dir, exists, scandir, prune)
 
 
 class _TerminatingSelector:
 
-    def _select_from(self, parent_path, is_dir, exists, scandir):
+    def _select_from(self, parent_path, is_dir, exists, scandir, prune):
         yield parent_path
 
 
@@ -769,12 +762,14 @@ class _PreciseSelector(_Selector):
         self.name = name
         _Selector.__init__(self, child_parts)
 
-    def _select_from(self, parent_path, is_dir, exists, scandir):
+    def _select_from(self, parent_path, is_dir, exists, scandir, prune):
         def try_iter():
             path = parent_path._make_child_relpath(self.name)
             if (is_dir if self.dironly else exists)(path):
+                if prune is not None and is_dir(path) and prune(path):
+                    return
                 for p in self.successor._select_from(
-                        path, is_dir, exists, scandir):
+                        path, is_dir, exists, scandir, prune):
                     yield p
 
         def except_iter(exc):
@@ -787,10 +782,12 @@ class _PreciseSelector(_Selector):
 class _WildcardSelector(_Selector):
 
     def __init__(self, pat, child_parts):
+        import fnmatch
+
         self.pat = re.compile(fnmatch.translate(pat))
         _Selector.__init__(self, child_parts)
 
-    def _select_from(self, parent_path, is_dir, exists, scandir):
+    def _select_from(self, parent_path, is_dir, exists, scandir, prune):
         def try_iter():
             cf = parent_path._flavour.casefold
             entries = list(scandir(parent_path))
@@ -799,9 +796,11 @@ class _WildcardSelector(_Selector):
                     name = entry.name
                     casefolded = cf(name)
                     if self.pat.match(casefolded):
-                        path = parent_path._make_child_relpath(name)
+                        path = parent_path._make_child_entry(entry)
+                        if prune is not None and is_dir(path) and prune(path):
+                            continue
                         for p in self.successor._select_from(
-                                path, is_dir, exists, scandir):
+                                path, is_dir, exists, scandir, prune):
                             yield p
 
         def except_iter(exc):
@@ -815,12 +814,27 @@ class _RecursiveWildcardSelector(_Selector):
 
     def __init__(self, pat, child_parts):
         _Selector.__init__(self, child_parts)
+        # every path is reached from exactly one starting directory, unless
+        # the rest of the pattern can climb up or recurse again. Only then
+        # the yielded paths have to be remembered to remove duplicates, so
+        # ``**/*`` and ``**/name`` walks run in constant memory.
+        self.dedupe = any(part in ('**', '..') for part in child_parts)
+
+    def _iterate_directories(self, parent_path, is_dir, scandir, prune):
+        # explicit stack instead of recursive generators, so a yielded path
+        # goes through a constant number of frames and the depth of the
+        # tree is not limited by the recursion limit. Same pre-order as
+        # the recursive version.
+        stack = [parent_path]
+        while stack:
+            dir_path = stack.pop()
+            yield dir_path
 
-    def _iterate_directories(self, parent_path, is_dir, scandir):
-        yield parent_path
-
-        def try_iter():
-            entries = list(scandir(parent_path))
+            try:
+                entries = list(scandir(dir_path))
+            except PermissionError:
+                continue
+            sub_dirs = []
             for entry in entries:
                 entry_is_dir = False
                 try:
@@ -829,25 +843,76 @@ class _RecursiveWildcardSelector(_Selector):
                     if not _ignore_error(e):
                         raise
                 if entry_is_dir and not entry.is_symlink():
-                    path = parent_path._make_child_relpath(entry.name)
-                    for p in self._iterate_directories(path, is_dir, scandir):
+                    path = dir_path._make_child_entry(entry)
+                    # check before descending, so a pruned sub tree is
+                    # never listed at all
+                    if prune is not None and prune(path):
+                        continue
+                    sub_dirs.append(path)
+            sub_dirs.reverse()
+            stack.extend(sub_dirs)
+
+    def _walk_wildcard(self, parent_path, scandir, prune):
+        # fast path for ``**/<wildcard>``, like ``**/*`` and ``rglob("*.py")``.
+        # Every directory is listed once: its matching children are yielded
+        # and its sub directories are queued, in the same order as
+        # iterating the directories then selecting from each of them.
+        match = self.successor.pat.match
+        cf = parent_path._flavour.casefold
+        stack = [parent_path]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                entries = list(scandir(dir_path))
+            except PermissionError:
+                continue
+            sub_dirs = []
+            for entry in entries:
+                matched = match(cf(entry.name)) is not None
+                entry_is_dir = False
+                try:
+                    entry_is_dir = entry.is_dir()
+                except OSError as e:
+                    if not _ignore_error(e):
+                        raise
+                if not (matched or entry_is_dir):
+                    continue
+                path = dir_path._make_child_entry(entry)
+                if entry_is_dir:
+                    if prune is not None and prune(path):
+                        continue
+                    if not entry.is_symlink():
+                        sub_dirs.append(path)
+                if matched:
+                    yield path
+            sub_dirs.reverse()
+            stack.extend(sub_dirs)
+
+    def _select_from(self, parent_path, is_dir, exists, scandir, prune):
+        if isinstance(self.successor, _WildcardSelector) \
+                and not self.successor.dironly:
+            return self._walk_wildcard(parent_path, scandir, prune)
+        return self._select_from_directories(
+            parent_path, is_dir, exists, scandir, prune)
+
+    def _select_from_directories(
+            self, parent_path, is_dir, exists, scandir, prune):
+        def try_iter():
+            successor_select = self.successor._select_from
+            starting_points = self._iterate_directories(
+                parent_path, is_dir, scandir, prune)
+            if not self.dedupe:
+                for starting_point in starting_points:
+                    for p in successor_select(
+                            starting_point, is_dir, exists, scandir, prune):
                         yield p
+                return
 
-        def except_iter(exc):
-            return iter([])
-
-        for x in _try_except_permissionerror_iter(try_iter, except_iter):
-            yield x
-
-    def _select_from(self, parent_path, is_dir, exists, scandir):
-        def try_iter():
             yielded = set()
             try:
-                successor_select = self.successor._select_from
-                for starting_point in self._iterate_directories(
-                        parent_path, is_dir, scandir):
+                for starting_point in starting_points:
                     for p in successor_select(
-                            starting_point, is_dir, exists, scandir):
+                            starting_point, is_dir, exists, scandir, prune):
                         if p not in yielded:
                             yield p
                             yielded.add(p)
@@ -909,7 +974,7 @@ class PurePath(object):
     directly, regardless of your system.
     """
     __slots__ = (
-        '_drv', '_root', '_parts',
+        '_drv', '_root', '_cached_parts', '_parent_path', '_name',
         '_str', '_hash', '_pparts', '_cached_cparts',
     )
 
@@ -960,10 +1025,6 @@ class PurePath(object):
                 if isinstance(a, str):
                     # Force-cast str subclasses to str (issue #21127)
                     parts.append(str(a))
-                # also handle unicode for PY2 (six.text_type = unicode)
-                elif six.PY2 and isinstance(a, six.text_type):
-                    # cast to str using filesystem encoding
-                    parts.append(_py2_fsencode(a))
                 else:
                     raise TypeError(
                         "argument should be a str object or an os.PathLike "
@@ -996,6 +1057,35 @@ class PurePath(object):
             self._init()
         return self
 
+    @property
+    def _parts(self):
+        # type: () -> List[str]
+        # Children made by _make_child_relpath() only hold their parent and
+        # their name, the parts list is built on first use. The chain is
+        # walked iteratively, so it works for any depth.
+        try:
+            return self._cached_parts
+        except AttributeError:
+            pass
+        names = []
+        path = self
+        while True:
+            try:
+                parts = path._cached_parts
+                break
+            except AttributeError:
+                names.append(path._name)
+                path = path._parent_path
+        names.reverse()
+        parts = parts + names
+        self._cached_parts = parts
+        return parts
+
+    @_parts.setter
+    def _parts(self, parts):
+        # type: (List[str]) -> None
+        self._cached_parts = parts
+
     @classmethod
     def _format_parsed_parts(cls, drv, root, parts):
         # type: (str, str, List[str]) -> str
@@ -1021,10 +1111,23 @@ class PurePath(object):
         passing to system calls."""
         try:
             return self._str
+        except AttributeError:
+            pass
+        try:
+            # child made by _make_child_relpath(), while walking the parent
+            # string is always known already
+            parent_str = self._parent_path._str
         except AttributeError:
             self._str = self._format_parsed_parts(self._drv, self._root,
                                                   self._parts) or '.'
             return self._str
+        if parent_str == '.':
+            self._str = self._name
+        elif parent_str[-1] == self._flavour.sep or parent_str == self._drv:
+            self._str = parent_str + self._name
+        else:
+            self._str = parent_str + self._flavour.sep + self._name
+        return self._str
 
     def __fspath__(self):
         return str(self)
@@ -1117,6 +1220,10 @@ class PurePath(object):
     @property
     def name(self):
         """The final path component, if any."""
+        try:
+            return self._name
+        except AttributeError:
+            pass
         parts = self._parts
         if len(parts) == (1 if (self._drv or self._root) else 0):
             return ''
@@ -1262,10 +1369,6 @@ class PurePath(object):
         """
         return self._from_parts([key] + self._parts)
 
-    if six.PY2:
-        __div__ = __truediv__
-        __rdiv__ = __rtruediv__
-
     @property
     def parent(self):
         """
@@ -1315,6 +1418,8 @@ class PurePath(object):
 
         :rtype: bool
         """
+        import fnmatch
+
         cf = self._flavour.casefold
         path_pattern = cf(path_pattern)
         drv, root, pat_parts = self._flavour.parse_parts((path_pattern,))
@@ -1386,6 +1491,9 @@ class Path(
     __slots__ = (
         '_accessor',
         '_closed',
+        '_entry',
+        '_absolute',
+        '_dirpath',
     )
 
     def __new__(cls, *args, **kwargs):
@@ -1404,6 +1512,7 @@ class Path(
               template=None,
               ):
         self._closed = False
+        self._entry = None
         if template is not None:
             self._accessor = template._accessor
         else:
@@ -1411,9 +1520,33 @@ class Path(
 
     def _make_child_relpath(self, part):
         # This is an optimization used for dir walking.  `part` must be
-        # a single part relative to this path.
-        parts = self._parts + [part]
-        return self._from_parsed_parts(self._drv, self._root, parts)
+        # a single part relative to this path. The child shares the parent's
+        # parts instead of copying them, so it is made in O(1) no matter
+        # how deep the tree is, see PurePath._parts.
+        child = object.__new__(self.__class__)
+        child._drv = self._drv
+        child._root = self._root
+        child._parent_path = self
+        child._name = part
+        child._init()
+        return child
+
+    def _make_child_entry(self, entry):
+        # Same as _make_child_relpath(), but remember the ``os.DirEntry``
+        # returned by scandir. is_dir() / is_file() and the stat based
+        # attributes can then reuse what scandir already fetched instead
+        # of issuing another stat() system call.
+        path = self._make_child_relpath(entry.name)
+        path._set_entry(entry)
+        return path
+
+    def _invalidate_target_stat(self, target):
+        # the target of a rename / copy may be a str, in that case only the
+        # process wide stat cache can hold stale data for it
+        if isinstance(target, Path):
+            target.invalidate_stat()
+        elif self.stat_cache is not None:
+            self.__class__(target).invalidate_stat()
 
     def __enter__(self):
         if self._closed:
@@ -1476,8 +1609,8 @@ class Path(
                 other_st = os.stat(other_path)
             return os.path.samestat(st, other_st)
         else:
-            filename1 = six.text_type(self)
-            filename2 = six.text_type(other_path)
+            filename1 = str(self)
+            filename2 = str(other_path)
             st1 = _win32_get_unique_path_id(filename1)
             st2 = _win32_get_unique_path_id(filename2)
             return st1 == st2
@@ -1499,11 +1632,16 @@ class Path(
             if self._closed:
                 self._raise_closed()
 
-    def glob(self, pattern):
+    def glob(self, pattern, prune=None):
         """
         Iterate over this subtree and yield all existing files (of any
         kind, including directories) matching the given relative pattern.
 
+        :type prune: Callable
+        :param prune: optional predicate called with every sub directory
+            found during the walk. Directories it returns True for are
+            skipped entirely: they are not yielded and never listed.
+
         :rtype: Iterable[Path]
         """
         if not pattern:
@@ -1513,15 +1651,18 @@ class Path(
         if drv or root:
             raise NotImplementedError("Non-relative patterns are unsupported")
         selector = _make_selector(tuple(pattern_parts))
-        for p in selector.select_from(self):
+        for p in selector.select_from(self, prune=prune):
             yield p
 
-    def rglob(self, pattern):
+    def rglob(self, pattern, prune=None):
         """
         Recursively yield all existing files (of any kind, including
         directories) matching the given relative pattern, anywhere in
         this subtree.
 
+        :type prune: Callable
+        :param prune: same as in :meth:`glob`.
+
         :rtype: Iterable[Path]
         """
         pattern = self._flavour.casefold(pattern)
@@ -1529,7 +1670,7 @@ class Path(
         if drv or root:
             raise NotImplementedError("Non-relative patterns are unsupported")
         selector = _make_selector(("**",) + tuple(pattern_parts))
-        for p in selector.select_from(self):
+        for p in selector.select_from(self, prune=prune):
             yield p
 
     def absolute(self):
@@ -1539,6 +1680,9 @@ class Path(
         No normalization is done, i.e. all '.' and '..' will be kept along.
         Use resolve() to get the canonical path to a file.
 
+        The result for a relative path is cached on the instance until the
+        current working directory changes.
+
         :rtype: Path
         """
         # XXX untested yet!
@@ -1546,10 +1690,20 @@ class Path(
             self._raise_closed()
         if self.is_absolute():
             return self
+        # the result is cached together with the cwd it was made from, it is
+        # rebuilt only after os.chdir()
+        cwd = os.getcwd()
+        try:
+            cached_cwd, obj = self._absolute
+            if cached_cwd == cwd:
+                return obj
+        except AttributeError:
+            pass
         # FIXME this must defer to the specific flavour (and, under Windows,
         # use nt._getfullpathname())
-        obj = self._from_parts([os.getcwd()] + self._parts, init=False)
+        obj = self._from_parts([cwd] + self._parts, init=False)
         obj._init(template=self)
+        self._absolute = (cwd, obj)
         return obj
 
     def resolve(self, strict=False):
@@ -1646,12 +1800,15 @@ class Path(
 
         :type data: bytes
         """
-        if not isinstance(data, six.binary_type):
+        if not isinstance(data, bytes):
             raise TypeError(
                 'data must be %s, not %s' %
-                (six.binary_type.__name__, data.__class__.__name__))
-        with self.open(mode='wb') as f:
-            return f.write(data)
+                (bytes.__name__, data.__class__.__name__))
+        try:
+            with self.open(mode='wb') as f:
+                return f.write(data)
+        finally:
+            self.invalidate_stat()
 
     def write_text(self, data, encoding=None, errors=None, newline=None):
         """
@@ -1659,12 +1816,15 @@ class Path(
 
         :type data: str
         """
-        if not isinstance(data, six.text_type):
+        if not isinstance(data, str):
             raise TypeError(
                 'data must be %s, not %s' %
-                (six.text_type.__name__, data.__class__.__name__))
-        with self.open(mode='w', encoding=encoding, errors=errors, newline=newline) as f:
-            return f.write(data)
+                (str.__name__, data.__class__.__name__))
+        try:
+            with self.open(mode='w', encoding=encoding, errors=errors, newline=newline) as f:
+                return f.write(data)
+        finally:
+            self.invalidate_stat()
 
     def touch(self, mode=0o666, exist_ok=True):
         """
@@ -1682,12 +1842,14 @@ class Path(
                 # Avoid exception chaining
                 pass
             else:
+                self.invalidate_stat()
                 return
         flags = os.O_CREAT | os.O_WRONLY
         if not exist_ok:
             flags |= os.O_EXCL
         fd = self._raw_open(flags, mode)
         os.close(fd)
+        self.invalidate_stat()
 
     def mkdir(self, mode=0o777, parents=False, exist_ok=False):
         """
@@ -1720,6 +1882,7 @@ class Path(
         if self._closed:
             self._raise_closed()
         self._accessor.chmod(self, mode)
+        self.invalidate_stat()
 
     def lchmod(self, mode):
         """
@@ -1738,6 +1901,7 @@ class Path(
         if self._closed:
             self._raise_closed()
         self._accessor.unlink(self)
+        self.invalidate_stat()
 
     def rmdir(self):
         """
@@ -1746,6 +1910,7 @@ class Path(
         if self._closed:
             self._raise_closed()
         self._accessor.rmdir(self)
+        self.invalidate_stat()
 
     def lstat(self):
         """
@@ -1763,6 +1928,8 @@ class Path(
         if self._closed:
             self._raise_closed()
         self._accessor.rename(self, target)
+        self.invalidate_stat()
+        self._invalidate_target_stat(target)
 
     def replace(self, target):
         """
@@ -1775,6 +1942,8 @@ class Path(
         if self._closed:
             self._raise_closed()
         self._accessor.replace(self, target)
+        self.invalidate_stat()
+        self._invalidate_target_stat(target)
 
     def symlink_to(self, target, target_is_directory=False):
         """
@@ -1809,9 +1978,16 @@ class Path(
         """
         Whether this path is a directory.
 
+        If this path was yielded by a directory walk (``glob``, ``rglob``,
+        ``select``), the file type already reported by scandir is used, until
+        it expires like the cached stat result (see ``stat_cache_ttl``).
+
         :rtype: bool
         """
+        entry = self._get_entry()
         try:
+            if entry is not None:
+                return entry.is_dir()
             return S_ISDIR(self.stat().st_mode)
         except OSError as e:
             if not _ignore_error(e):
@@ -1828,9 +2004,16 @@ class Path(
         Whether this path is a regular file (also True for symlinks pointing
         to regular files).
 
+        If this path was yielded by a directory walk (``glob``, ``rglob``,
+        ``select``), the file type already reported by scandir is used, until
+        it expires like the cached stat result (see ``stat_cache_ttl``).
+
         :rtype: bool
         """
+        entry = self._get_entry()
         try:
+            if entry is not None:
+                return entry.is_file()
             return S_ISREG(self.stat().st_mode)
         except OSError as e:
             if not _ignore_error(e):
@@ -1998,7 +2181,7 @@ PathCls: Union[Type[WindowsPath], Type[PosixPath]] = WindowsPath if os.name == "
 
 # T_PATH_ARG is a path liked object that can be passed into a function,
 # you can safely use ``Path(a_path_arg)`` to convert it to a pathlib_mate.Path object
-# or safely use ``PathlibPath(a_path_arg)`` to convert it to a pathlib.Path object.
-from pathlib import Path as PathlibPath
-
-T_PATH_ARG = Union[str, PathlibPath, Path]
+# or safely use ``pathlib.Path(a_path_arg)`` to convert it to a pathlib.Path object.
+# ``os.PathLike`` covers ``pathlib.Path``, so the stdlib pathlib module is not
+# imported just for this type hint.
+T_PATH_ARG = Union[str, os.PathLike, Path]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+A process wide ``os.stat_result`` cache shared by all Path objects.
+"""
+
+from typing import Optional
+import time
+import threading
+from collections import OrderedDict
+
+
+class StatCache(object):
+    """
+    A thread safe LRU cache of ``os.stat_result`` keyed by absolute path,
+    with an optional time to live.
+
+    By default each :class:`~pathlib_mate.pathlib2.Path` only caches its own
+    stat result. Install a ``StatCache`` to share the results between
+    different ``Path`` objects pointing to the same file::
+
+        >>> from pathlib_mate import Path
+        >>> from pathlib_mate.stat_cache import StatCache
+        >>> Path.stat_cache = StatCache(max_size=100000, ttl=5)
+
+    :type max_size: int
+    :param max_size: max number of stat results to keep, the least recently
+        used one is evicted first.
+
+    :type ttl: Optional[float]
+    :param ttl: seconds before a cached stat result expires. None means
+        it never expires.
+    """
+
+    def __init__(self, max_size=10000, ttl=None):
+        if max_size < 1:
+            raise ValueError("max_size has to be greater than 0!")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, abspath):
+        """
+        :type abspath: str
+
+        :rtype: Optional[os.stat_result]
+        :return: the cached stat result, or None if it is not cached or
+            expired.
+        """
+        with self._lock:
+            try:
+                st, created_at = self._data[abspath]
+            except KeyError:
+                return None
+            if (self.ttl is not None) and (
+                time.monotonic() - created_at >= self.ttl
+            ):
+                del self._data[abspath]
+                return None
+            self._data.move_to_end(abspath)
+            return st
+
+    def set(self, abspath, st):
+        """
+        :type abspath: str
+        :type st: os.stat_result
+        """
+        with self._lock:
+            self._data[abspath] = (st, time.monotonic())
+            self._data.move_to_end(abspath)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, abspath):
+        """
+        Remove the cached stat result of a path, if any.
+
+        :type abspath: str
+        """
+        with self._lock:
+            self._data.pop(abspath, None)
+
+    def clear(self):
+        """
+        Remove all cached stat results.
+        """
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+Directory walk engines that are used behind the select API.
+"""
+
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, List, Tuple
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .pathlib2 import _ignore_error
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .pathlib2 import Path
+
+
+def _list_dir(dir_path):
+    """
+    List a directory, run in a worker thread.
+
+    The ``os.DirEntry`` type checks are done here as well, because on network
+    file systems they may need a ``stat`` call, which is exactly the latency
+    we want to overlap.
+
+    :type dir_path: Path
+
+    :rtype: List[Tuple[Path, bool, bool]]
+    :return: list of ``(child path, is dir, descend into it or not)``
+    """
+    children = list()
+    try:
+        for entry in dir_path._accessor.scandir(dir_path):
+            try:
+                is_dir = entry.is_dir()
+                descend = is_dir and not entry.is_symlink()
+            except OSError as e:
+                if not _ignore_error(e):
+                    raise
+                is_dir = descend = False
+            children.append((dir_path._make_child_entry(entry), is_dir, descend))
+    except PermissionError:
+        pass
+    except OSError as e:
+        # the directory has been removed since it was found
+        if not _ignore_error(e):
+            raise
+    return children
+
+
+class ScanEntry(object):
+    """
+    A lightweight record of a file or directory, yielded by
+    :func:`scan`. It only holds the path string and the ``os.DirEntry``,
+    ``size`` and ``mtime`` are read from the ``DirEntry.stat()`` result on
+    first access. Use :meth:`to_path` to get a full
+    :class:`~pathlib_mate.pathlib2.Path`.
+
+    :type abspath: str
+    :type name: str
+    :type is_dir: bool
+    :type is_file: bool
+    """
+
+    __slots__ = ("abspath", "name", "is_dir", "is_file", "_entry")
+
+    def __init__(self, entry, is_dir, is_file):
+        self.abspath = entry.path
+        self.name = entry.name
+        self.is_dir = is_dir
+        self.is_file = is_file
+        self._entry = entry
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.abspath)
+
+    @property
+    def size(self):
+        """
+        File size in bytes.
+
+        :rtype: int
+        """
+        return self._entry.stat().st_size
+
+    @property
+    def mtime(self):
+        """
+        Last modify timestamp.
+
+        :rtype: float
+        """
+        return self._entry.stat().st_mtime
+
+    def to_path(self):
+        """
+        Convert to a :class:`~pathlib_mate.pathlib2.Path`, which reuses the
+        ``os.DirEntry`` like the paths yielded by ``select``.
+
+        :rtype: Path
+        """
+        from .pathlib2 import Path
+
+        p = Path(self.abspath)
+        p._set_entry(self._entry)
+        return p
+
+
+def scan(dir_path, recursive=True, prune=None):
+    """
+    Yield a :class:`ScanEntry` for every file and directory under
+    ``dir_path``, in the same order as ``dir_path.glob("**/*")``.
+
+    It works on plain strings and ``os.scandir`` results, no
+    :class:`~pathlib_mate.pathlib2.Path` is created, so it runs at about the
+    speed of a raw ``os.scandir`` loop.
+
+    :type dir_path: Path
+
+    :type recursive: bool
+    :param recursive: descend into sub directories or not.
+
+    :type prune: Optional[Callable]
+    :param prune: a callable that takes a directory :class:`ScanEntry` and
+        returns True if it should be skipped.
+
+    :rtype: Iterable[ScanEntry]
+    """
+    stack = [dir_path.abspath]
+    while stack:
+        sub_dirs = list()
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except PermissionError:
+            continue
+        except OSError as e:
+            # the directory has been removed since it was found
+            if not _ignore_error(e):
+                raise
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                is_file = (not is_dir) and entry.is_file()
+            except OSError as e:
+                if not _ignore_error(e):
+                    raise
+                is_dir = is_file = False
+            record = ScanEntry(entry, is_dir, is_file)
+            if is_dir:
+                if prune is not None and prune(record):
+                    continue
+                if recursive and not entry.is_symlink():
+                    sub_dirs.append(record.abspath)
+            yield record
+        sub_dirs.reverse()
+        stack.extend(sub_dirs)
+
+
+class DirStatTable(object):
+    """
+    Compact result of :meth:`~pathlib_mate.mate_tool_box.ToolBox.file_stat_for_all`
+    with ``compact=True``. It stores one list of directory paths and three
+    ``array("q")`` columns, instead of one dict per directory, so it takes
+    a fraction of the memory on huge trees.
+
+    It can be used like the ``{"directory path": {"file": ..., "dir": ...,
+    "size": ...}}`` mapping::
+
+        >>> table = p.file_stat_for_all(compact=True)
+        >>> table[p.abspath]
+        {"file": 3, "dir": 1, "size": 1024}
+
+    :type abspaths: List[str]
+    :type n_file: array.array
+    :type n_dir: array.array
+    :type size: array.array
+    """
+
+    __slots__ = ("abspaths", "n_file", "n_dir", "size", "_index")
+
+    def __init__(self, abspaths, n_file, n_dir, size):
+        self.abspaths = abspaths
+        self.n_file = n_file
+        self.n_dir = n_dir
+        self.size = size
+        self._index = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        :type rows: Iterable[Tuple[int, str, int, int, int]]
+        :param rows: the rows yielded by :func:`dir_stats`.
+
+        :rtype: DirStatTable
+        """
+        from array import array
+
+        rows = list(rows)
+        n = len(rows)
+        abspaths = [None] * n
+        n_file = array("q", bytes(8 * n))
+        n_dir = array("q", bytes(8 * n))
+        size = array("q", bytes(8 * n))
+        for ind, abspath, n_file_, n_dir_, size_ in rows:
+            abspaths[ind] = abspath
+            n_file[ind] = n_file_
+            n_dir[ind] = n_dir_
+            size[ind] = size_
+        return cls(abspaths, n_file, n_dir, size)
+
+    def __len__(self):
+        return len(self.abspaths)
+
+    def __iter__(self):
+        return iter(self.abspaths)
+
+    def _get_index(self, abspath):
+        if self._index is None:
+            self._index = {
+                abspath: ind for ind, abspath in enumerate(self.abspaths)
+            }
+        return self._index[abspath]
+
+    def __contains__(self, abspath):
+        try:
+            self._get_index(abspath)
+            return True
+        except KeyError:
+            return False
+
+    def __getitem__(self, abspath):
+        """
+        :type abspath: str
+
+        :rtype: dict
+        """
+        ind = self._get_index(abspath)
+        return {
+            "file": self.n_file[ind],
+            "dir": self.n_dir[ind],
+            "size": self.size[ind],
+        }
+
+    def items(self):
+        """
+        :rtype: Iterable[Tuple[str, dict]]
+        """
+        for ind, abspath in enumerate(self.abspaths):
+            yield abspath, {
+                "file": self.n_file[ind],
+                "dir": self.n_dir[ind],
+                "size": self.size[ind],
+            }
+
+    def to_dict(self):
+        """
+        :rtype: OrderedDict
+        """
+        from collections import OrderedDict
+
+        return OrderedDict(self.items())
+
+
+def dir_stats(dir_path, filters=None):
+    """
+    Count the files, sub directories and total file size under ``dir_path``
+    and each of its sub directories, in one ``os.scandir`` pass.
+
+    The walk keeps the directories that are not finished yet, a directory is
+    yielded as soon as its whole sub tree is done, and its totals are added
+    to its parent. So it runs in O(number of entries), and the memory only
+    depends on the depth and width of the tree, not its size.
+
+    :type dir_path: Path
+
+    :type filters: Optional[Callable]
+    :param filters: a callable that takes a
+        :class:`~pathlib_mate.pathlib2.Path` and returns False if it should
+        not be counted. A directory that is filtered out is not yielded,
+        but the files in it still count for its parents.
+
+    :rtype: Iterable[Tuple[int, str, int, int, int]]
+    :return: ``(index, abspath, n_file, n_dir, size)`` in post order,
+        ``index`` is the position of the directory in the walk order of
+        ``dir_path.glob("**/*")``, the root is 0.
+    """
+    # node: [index, parent node, counted or not, unfinished sub dirs,
+    #        n_file, n_dir, size, abspath]
+    root = [0, None, True, 0, 0, 0, 0, dir_path.abspath]
+    n_counted = 1
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        sub_nodes = list()
+        try:
+            with os.scandir(node[7]) as it:
+                entries = list(it)
+        except PermissionError:
+            entries = list()
+        except OSError as e:
+            # the directory has been removed since it was found
+            if not _ignore_error(e):
+                raise
+            entries = list()
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                is_file = (not is_dir) and entry.is_file()
+            except OSError as e:
+                if not _ignore_error(e):
+                    raise
+                continue
+            if (filters is None) or filters(
+                ScanEntry(entry, is_dir, is_file).to_path()
+            ):
+                counted = True
+            else:
+                counted = False
+            if is_dir:
+                if counted:
+                    ind = n_counted
+                    n_counted += 1
+                else:
+                    ind = None
+                sub_node = [ind, node, counted, 0, 0, 0, 0, entry.path]
+                if entry.is_symlink():
+                    # not followed, it is done already
+                    node[5] += counted
+                    if counted:
+                        yield ind, entry.path, 0, 0, 0
+                else:
+                    node[3] += 1
+                    sub_nodes.append(sub_node)
+            elif is_file and counted:
+                try:
+                    size = entry.stat().st_size
+                except OSError as e:
+                    if not _ignore_error(e):
+                        raise
+                    continue
+                node[4] += 1
+                node[6] += size
+
+        if sub_nodes:
+            sub_nodes.reverse()
+            stack.extend(sub_nodes)
+            continue
+        # post order, finish this directory and the parents that are
+        # waiting for it only
+        while node is not None and node[3] == 0:
+            ind, parent, counted, _, n_file, n_dir, size, abspath = node
+            if counted:
+                yield ind, abspath, n_file, n_dir, size
+            if parent is not None:
+                parent[3] -= 1
+                parent[4] += n_file
+                parent[5] += n_dir + counted
+                parent[6] += size
+            node = parent
+
+
+def walk(dir_path, prune=None, max_depth=None):
+    """
+    Recursively yield all files and directories under ``dir_path``, together
+    with their ``/`` separated path relative to ``dir_path``. The relative
+    path is built from the parent's one while walking, so it costs one
+    string concatenation per path. Paths are yielded in the same order as
+    ``dir_path.glob("**/*")``.
+
+    :type dir_path: Path
+
+    :type prune: Optional[Callable]
+    :param prune: a callable that takes a directory and returns True if it
+        should be skipped.
+
+    :type max_depth: Optional[int]
+    :param max_depth: only yield paths at most this many levels below
+        ``dir_path``, 1 means only the direct children. None means no limit.
+
+    :rtype: Iterable[Tuple[str, Path]]
+    """
+    if not dir_path.is_dir():
+        return
+    stack = [(dir_path, "", 1)]
+    while stack:
+        parent, parent_relpath, depth = stack.pop()
+        sub_dirs = list()
+        for path, is_dir, descend in _list_dir(parent):
+            if is_dir and prune is not None and prune(path):
+                continue
+            relpath = parent_relpath + path.name
+            if descend and (max_depth is None or depth < max_depth):
+                sub_dirs.append((path, relpath + "/", depth + 1))
+            yield relpath, path
+        sub_dirs.reverse()
+        stack.extend(sub_dirs)
+
+
+def walk_parallel(
+    dir_path,
+    workers=8,
+    prune=None,
+    ordered=False,
+    max_pending=None,
+):
+    """
+    Recursively yield all files and directories under ``dir_path``, listing
+    directories concurrently in a thread pool.
+
+    ``scandir`` releases the GIL, so on file systems where listing a
+    directory is latency bound (NFS, SMB, FUSE) many directories can be
+    listed at the same time.
+
+    :type dir_path: Path
+
+    :type workers: int
+    :param workers: number of worker threads.
+
+    :type prune: Optional[Callable]
+    :param prune: a callable that takes a directory and returns True if it
+        should be skipped, it is always called in the calling thread.
+
+    :type ordered: bool
+    :param ordered: if True, paths are yielded in exactly the same order as
+        the sequential ``dir_path.glob("**/*")``. If False, directory
+        listings are yielded as soon as they are done, which is faster but
+        the order depends on thread scheduling.
+
+    :type max_pending: Optional[int]
+    :param max_pending: max number of directory listings that are submitted
+        but not yet consumed, default is ``workers * 4``. It bounds the
+        memory used by results waiting for a slow consumer.
+
+    :rtype: Iterable[Path]
+    """
+    if workers < 1:
+        raise ValueError("workers has to be greater than 0!")
+    if max_pending is None:
+        max_pending = workers * 4
+    if max_pending < 1:
+        raise ValueError("max_pending has to be greater than 0!")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            walk = _walk_ordered
+        else:
+            walk = _walk_unordered
+        for p in walk(executor, dir_path, prune, max_pending):
+            yield p
+
+
+def _walk_unordered(executor, dir_path, prune, max_pending):
+    to_list = [dir_path]  # discovered directories, not submitted yet
+    running = set()
+    while to_list or running:
+        while to_list and len(running) < max_pending:
+            running.add(executor.submit(_list_dir, to_list.pop()))
+        done, running = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            for path, is_dir, descend in future.result():
+                if is_dir and prune is not None and prune(path):
+                    continue
+                if descend:
+                    to_list.append(path)
+                yield path
+
+
+def _walk_ordered(executor, dir_path, prune, max_pending):
+    # depth first, same order as _RecursiveWildcardSelector. Each stack
+    # item is ``[directory, future]``, the top of the stack is visited next,
+    # so the listings near the top are submitted ahead of time.
+    stack = [[dir_path, None]]
+    n_running = 0
+    while stack:
+        for item in reversed(stack[-max_pending:]):
+            if n_running >= max_pending:
+                break
+            if item[1] is None:
+                item[1] = executor.submit(_list_dir, item[0])
+                n_running += 1
+
+        _, future = stack.pop()
+        children = future.result()
+        n_running -= 1
+
+        sub_dirs = deque()
+        for path, is_dir, descend in children:
+            if is_dir and prune is not None and prune(path):
+                continue
+            if descend:
+                sub_dirs.appendleft([path, None])
+            yield path
+        stack.extend(sub_dirs)
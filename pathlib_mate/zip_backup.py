@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+Manifest and restore for the incremental zip backups made by
+:meth:`~pathlib_mate.mate_tool_box_zip.ToolBoxZip.backup`.
+
+Each archive of a chain holds the files that are new or changed since the
+previous archive, and a manifest member, :data:`MANIFEST_NAME`, with the
+state of the whole tree at backup time::
+
+    {
+        "version": 1,
+        "archive": "project-backup-2.zip",
+        "parent": "project-backup-1.zip",
+        "prefix": "project/",
+        "files": {
+            "relpath/to/file": [size, mtime_ns, hexdigest, archive name],
+            ...
+        },
+        "deleted": ["relpath/of/files/removed/since/the/parent", ...],
+        "created_ns": time the files were read, in ns
+    }
+
+``archive name`` is the archive of the chain that holds the content of the
+file, ``hexdigest`` is None unless a hash algorithm is used. All the
+archives of a chain have to be in the same directory.
+
+A file whose size and ``mtime_ns`` didn't change since the previous archive
+is not read again, unless its ``mtime_ns`` is within :data:`RACY_SECONDS` of
+``created_ns``: it can have been written again, after it was read, within the
+timestamp resolution of the file system, the same "racy clean" problem
+``git`` deals with.
+"""
+
+from typing import Dict, List, Optional
+import os
+import json
+import time
+
+MANIFEST_NAME = ".pathlib_mate_backup.json"
+
+MANIFEST_VERSION = 1
+
+RACY_SECONDS = 2.0
+
+
+def read_manifest(archive):
+    """
+    Read the manifest of an incremental backup archive.
+
+    :type archive: str
+    :param archive: path of the archive.
+
+    :rtype: dict
+    """
+    from zipfile import ZipFile
+
+    with ZipFile(str(archive)) as zf:
+        return _read_manifest(zf)
+
+
+def _read_manifest(zf):
+    """
+    :type zf: zipfile.ZipFile
+
+    :rtype: dict
+    """
+    try:
+        data = zf.read(MANIFEST_NAME)
+    except KeyError:
+        raise ValueError("'%s' is not an incremental backup!" % zf.filename)
+    manifest = json.loads(data.decode("utf-8"))
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            "unsupported backup manifest version %r!" % manifest.get("version")
+        )
+    return manifest
+
+
+def get_racy_ns(archive, manifest):
+    """
+    Return the ``mtime_ns`` from which the entries of ``manifest`` can't be
+    trusted, see :data:`RACY_SECONDS`.
+
+    :type archive: str
+    :param archive: path of the archive.
+
+    :type manifest: dict
+    :param manifest: the manifest of ``archive``.
+
+    :rtype: int
+    """
+    created_ns = manifest.get("created_ns")
+    if created_ns is None:
+        created_ns = os.stat(str(archive)).st_mtime_ns
+    return created_ns - int(RACY_SECONDS * 1e9)
+
+
+def make_manifest(archive, parent, prefix, files, deleted):
+    """
+    :type archive: str
+    :param archive: basename of the archive.
+
+    :type parent: Optional[str]
+    :param parent: basename of the previous archive of the chain.
+
+    :type prefix: str
+    :param prefix: prefix of the member names in the archive.
+
+    :type files: Dict[str, list]
+    :type deleted: List[str]
+
+    :rtype: str
+    """
+    return json.dumps(
+        {
+            "version": MANIFEST_VERSION,
+            "archive": archive,
+            "parent": parent,
+            "prefix": prefix,
+            "files": files,
+            "deleted": deleted,
+            "created_ns": time.time_ns(),
+        },
+        sort_keys=True,
+    )
+
+
+def _get_target(dst_dir, relpath):
+    """
+    :type dst_dir: str
+    :type relpath: str
+
+    :rtype: str
+    """
+    parts = relpath.split("/")
+    if relpath.startswith("/") or ".." in parts or ":" in parts[0]:
+        raise ValueError("unsafe path %r in the backup manifest!" % relpath)
+    return os.path.join(dst_dir, *parts)
+
+
+def restore_backup(archive, dst_dir, overwrite=False):
+    """
+    Restore the tree as it was when ``archive`` was made.
+
+    Replaying the chain, from the full backup to ``archive``, adding the
+    new and changed files and removing the deleted ones, ends with the
+    state recorded in the manifest of ``archive``. So the manifest is
+    used directly: each archive of the chain is opened once, and only the
+    latest version of each file is extracted. The file modification times
+    are restored as well.
+
+    :type archive: str
+    :param archive: the last archive of the chain to restore.
+
+    :type dst_dir: str
+    :param dst_dir: the directory to restore to, it is created if needed.
+
+    :type overwrite: bool
+    :param overwrite: if False, raise an error if a file to restore
+        already exists.
+
+    :rtype: int
+    :return: number of restored files.
+    """
+    import shutil
+    from zipfile import ZipFile
+
+    archive = os.path.abspath(str(archive))
+    dst_dir = os.path.abspath(str(dst_dir))
+    files = read_manifest(archive)["files"]
+
+    by_archive = dict()  # type: Dict[str, List[str]]
+    for relpath, (_, _, _, archive_name) in files.items():
+        by_archive.setdefault(archive_name, list()).append(relpath)
+
+    archive_dir = os.path.dirname(archive)
+    for archive_name, relpath_list in sorted(by_archive.items()):
+        with ZipFile(os.path.join(archive_dir, archive_name)) as zf:
+            prefix = _read_manifest(zf)["prefix"]
+            for relpath in relpath_list:
+                target = _get_target(dst_dir, relpath)
+                if os.path.exists(target) and not overwrite:
+                    raise FileExistsError("'%s' already exists!" % target)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(prefix + relpath) as f_src:
+                    with open(target, "wb") as f_dst:
+                        shutil.copyfileobj(f_src, f_dst, 1 << 20)
+                mtime_ns = files[relpath][1]
+                os.utime(target, ns=(mtime_ns, mtime_ns))
+    return len(files)
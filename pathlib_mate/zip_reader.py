@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+Extract zip archive members with the decompression done in a thread pool.
+
+``zlib``, ``bz2`` and ``lzma`` release the GIL while they decompress, so
+each worker thread opens its own handle on the archive and inflates one
+member at a time, streaming it into a part file that is renamed when the
+member is complete. The memory used only depends on the number of workers.
+"""
+
+from typing import Callable, List, Optional
+import os
+import shutil
+import threading
+from zipfile import ZipFile, ZipInfo
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MB
+
+
+def get_target(dst_dir, zinfo):
+    """
+    The path a member is extracted to, sanitized the same way as
+    ``ZipFile.extract()`` does: drive letters, leading slashes, ``.`` and
+    ``..`` are removed, so a member can't be written outside ``dst_dir``.
+
+    :type dst_dir: str
+    :type zinfo: ZipInfo
+
+    :rtype: str
+    """
+    arcname = zinfo.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_path_parts = ("", os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(
+        x for x in arcname.split(os.path.sep) if x not in invalid_path_parts
+    )
+    if os.path.sep == "\\":  # pragma: no cover
+        arcname = ZipFile._sanitize_windows_name(arcname, os.path.sep)
+    return os.path.join(dst_dir, arcname)
+
+
+def _preallocate(f, size):
+    """
+    Reserve the disk space of a file before it is written, so it is less
+    fragmented and a full disk is detected before any data is inflated.
+
+    :type size: int
+    """
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:  # pragma: no cover
+            # not supported by the file system
+            pass
+
+
+class _Extractor(object):
+    """
+    Extract members, each thread uses its own :class:`zipfile.ZipFile`.
+
+    :type archive: str
+    :type overwrite: bool
+    :type chunk_size: int
+    """
+
+    def __init__(self, archive, overwrite, chunk_size):
+        self.archive = archive
+        self.overwrite = overwrite
+        self.chunk_size = chunk_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._zf_list = list()  # type: List[ZipFile]
+
+    def _get_zf(self):
+        try:
+            return self._local.zf
+        except AttributeError:
+            zf = ZipFile(self.archive)
+            self._local.zf = zf
+            with self._lock:
+                self._zf_list.append(zf)
+            return zf
+
+    def extract(self, zinfo, target):
+        """
+        :type zinfo: ZipInfo
+        :type target: str
+        """
+        from .vendor.fileutils import atomic_save
+
+        with atomic_save(
+            target,
+            text_mode=False,
+            overwrite=self.overwrite,
+            overwrite_part=True,
+        ) as f_dst:
+            _preallocate(f_dst, zinfo.file_size)
+            with self._get_zf().open(zinfo) as f_src:
+                shutil.copyfileobj(f_src, f_dst, self.chunk_size)
+
+    def close(self):
+        for zf in self._zf_list:
+            zf.close()
+
+
+def extract_members(
+    archive,
+    dst_dir,
+    filters=None,
+    workers=None,
+    overwrite=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_pending=None,
+):
+    """
+    Extract the members of a zip archive, in parallel.
+
+    Each file is written to a ``.part`` file next to its target first, and
+    renamed when it is complete, so an interrupted extraction never leaves
+    a truncated file behind. Parent directories are created once, by the
+    calling thread. When several members are extracted to the same path,
+    like duplicate names, only the last one is extracted, which is the one
+    ``zipfile`` reads for that name.
+
+    :type archive: str
+    :param archive: path of the zip archive.
+
+    :type dst_dir: str
+    :param dst_dir: the directory to extract to, it is created if needed.
+
+    :type filters: Optional[Callable]
+    :param filters: a callable that takes a :class:`zipfile.ZipInfo` and
+        returns True if the member should be extracted. Members that are
+        filtered out are never read.
+
+    :type workers: Optional[int]
+    :param workers: number of threads, None means extract in the calling
+        thread.
+
+    :type overwrite: bool
+    :param overwrite: if False, raise an error if a file already exists.
+
+    :type chunk_size: int
+    :param chunk_size: bytes inflated and written at a time, per thread.
+
+    :type max_pending: Optional[int]
+    :param max_pending: max number of members submitted but not done,
+        default is ``workers * 4``.
+
+    :rtype: int
+    :return: number of extracted files and directories.
+    """
+    from .helper import bounded_map
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers has to be greater than 0!")
+    if max_pending is None:
+        max_pending = (workers or 1) * 4
+    if max_pending < 1:
+        raise ValueError("max_pending has to be greater than 0!")
+
+    archive = os.path.abspath(str(archive))
+    dst_dir = os.path.abspath(str(dst_dir))
+    with ZipFile(archive) as zf:
+        infolist = zf.infolist()
+    if filters is not None:
+        infolist = [zinfo for zinfo in infolist if filters(zinfo)]
+    # two threads must never write the same ``.part`` file
+    targets = dict()
+    for zinfo in infolist:
+        targets[get_target(dst_dir, zinfo)] = zinfo
+
+    extractor = _Extractor(archive, overwrite, chunk_size)
+    created_dirs = set()
+
+    def makedirs(dir_path):
+        if dir_path not in created_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            created_dirs.add(dir_path)
+
+    def iter_files():
+        for target, zinfo in targets.items():
+            if zinfo.is_dir():
+                makedirs(target)
+            else:
+                makedirs(os.path.dirname(target))
+                yield zinfo, target
+
+    def extract(job):
+        extractor.extract(*job)
+
+    try:
+        if workers is None:
+            for job in iter_files():
+                extract(job)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in bounded_map(executor, extract, iter_files(), max_pending):
+                    pass
+    finally:
+        extractor.close()
+    return len(targets)
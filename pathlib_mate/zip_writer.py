@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+
+"""
+Write zip archive members with the compression done in a thread pool.
+
+``zlib`` releases the GIL while it compresses, so files are cut into blocks
+and the blocks are deflated in parallel, like ``pigz`` does. Every block but
+the last one of a file ends with a ``Z_SYNC_FLUSH``, so the compressed
+blocks can be concatenated into one valid deflate stream. The members are
+written in order, the archive is the same as a single threaded one except
+for a slightly lower compression ratio. ``bzip2`` and ``lzma`` streams
+can't be cut that way, those members are compressed one file per thread.
+
+``zipfile`` has no public API to add a member that is compressed already,
+so the blocks are written with the same book keeping as
+``ZipFile.open(zinfo, "w")`` does, using a few attributes of
+:class:`zipfile.ZipFile`. They are checked by :func:`can_write_blocks`,
+and when they are missing, or the archive is not seekable, every member is
+written with ``ZipFile.write()`` in the calling thread instead.
+
+:class:`CompressionPolicy` picks the compression method of each member, so
+files that are compressed already, like ``.jpg`` or ``.zip``, are stored.
+"""
+
+from typing import Callable, Iterable, Optional, Set, Tuple, Union
+import os
+import zlib
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import (
+    ZipFile,
+    ZipInfo,
+    ZIP_STORED,
+    ZIP_DEFLATED,
+    ZIP_BZIP2,
+    ZIP_LZMA,
+    ZIP64_LIMIT,
+)
+
+DEFAULT_BLOCK_SIZE = 1 << 20  # 1 MB
+
+# zipfile's compressor for the lzma members, it writes the header the zip
+# format needs before the raw lzma stream
+_LZMACompressor = getattr(zipfile, "LZMACompressor", None)
+
+# the ZipFile attributes :class:`_MemberWriter` uses, all of them exist from
+# Python 3.6 to 3.13
+_ZIPFILE_ATTRS = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+
+_HAS_MEMBER_WRITER = hasattr(ZipFile, "_writecheck") and hasattr(
+    ZipInfo, "FileHeader"
+)
+
+
+def can_write_blocks(zf):
+    """
+    Test if compressed blocks can be written into this archive: the
+    ``ZipFile`` internals used by :class:`_MemberWriter` exist in this
+    Python version, and the archive file is seekable.
+
+    :type zf: ZipFile
+
+    :rtype: bool
+    """
+    return (
+        _HAS_MEMBER_WRITER
+        and all(hasattr(zf, name) for name in _ZIPFILE_ATTRS)
+        and getattr(zf, "_seekable", False) is True
+        and not getattr(zf, "_writing", False)
+    )
+
+
+# uncompressed formats among the known media extensions
+_raw_ext = {
+    ".bmp",
+    ".tiff",
+    ".ppm",
+    ".pgm",
+    ".pbm",
+    ".pnm",
+    ".svg",
+    ".wav",
+    ".iso",
+}
+
+
+def get_compressed_ext():
+    """
+    Extensions of the formats that are compressed already, taken from the
+    image, audio, video and archive extensions known by
+    :class:`~pathlib_mate.mate_path_filters.PathFilters`. Uncompressed
+    formats in these lists, like ``.bmp`` and ``.wav``, are left out.
+
+    :rtype: Set[str]
+    """
+    from .mate_path_filters import PathFilters
+
+    ext_set = set()
+    for ext_list in [
+        PathFilters._image_ext,
+        PathFilters._audio_ext,
+        PathFilters._video_ext,
+        PathFilters._archive_ext,
+    ]:
+        for ext in ext_list:
+            # ".tar.gz" files have the ".gz" extension
+            if ext.startswith("."):
+                ext_set.add("." + ext.rsplit(".", 1)[-1])
+    return ext_set.difference(_raw_ext)
+
+
+def get_entropy(data):
+    """
+    Shannon entropy of the bytes, 0.0 - 8.0 bits per byte. Compressed or
+    encrypted data is close to 8.0.
+
+    :type data: bytes
+
+    :rtype: float
+    """
+    import math
+    from collections import Counter
+
+    n = len(data)
+    if not n:
+        return 0.0
+    return -sum(
+        count / n * math.log2(count / n) for count in Counter(data).values()
+    )
+
+
+class CompressionPolicy(object):
+    """
+    Pick the compression method of each member of a zip archive.
+
+    :type compression: int
+    :param compression: ``zipfile.ZIP_DEFLATED``, ``ZIP_BZIP2``, ``ZIP_LZMA``
+        or ``ZIP_STORED``.
+
+    :type level: Optional[int]
+    :param level: compression level, 0 - 9 for deflate, 1 - 9 for bzip2,
+        ignored by lzma. None is the default of the algorithm.
+
+    :type store_ext: Union[bool, Iterable[str]]
+    :param store_ext: files with these extensions are stored without
+        compression, True means :func:`get_compressed_ext`, False means
+        none. The match is case insensitive.
+
+    :type entropy_probe: bool
+    :param entropy_probe: if True, the first ``probe_size`` bytes of each
+        file are read, and the file is stored if their entropy is higher
+        than ``max_entropy`` bits per byte. It catches compressed data with
+        an unknown extension.
+
+    :type probe_size: int
+    :type max_entropy: float
+    """
+
+    def __init__(
+        self,
+        compression=ZIP_DEFLATED,
+        level=None,
+        store_ext=True,
+        entropy_probe=False,
+        probe_size=4096,
+        max_entropy=7.5,
+    ):
+        if compression not in (ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA):
+            raise ValueError("unknown compression method %r!" % (compression,))
+        self.compression = compression
+        self.level = level
+        if store_ext is True:
+            store_ext = get_compressed_ext()
+        elif store_ext is False:
+            store_ext = set()
+        self.store_ext = {ext.lower() for ext in store_ext}
+        self.entropy_probe = entropy_probe
+        self.probe_size = probe_size
+        self.max_entropy = max_entropy
+
+    def get_compress_type(self, abspath):
+        """
+        :type abspath: str
+
+        :rtype: int
+        """
+        if self.compression == ZIP_STORED:
+            return ZIP_STORED
+        if os.path.splitext(abspath)[1].lower() in self.store_ext:
+            return ZIP_STORED
+        if self.entropy_probe:
+            try:
+                data = _read_block(abspath, 0, self.probe_size)
+            except OSError:  # directory
+                return self.compression
+            if get_entropy(data) > self.max_entropy:
+                return ZIP_STORED
+        return self.compression
+
+
+def _read_block(abspath, offset, size):
+    """
+    :type abspath: str
+    :type offset: int
+    :type size: int
+
+    :rtype: bytes
+    """
+    with open(abspath, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def _deflate_block(abspath, offset, size, level, is_last):
+    """
+    Read and compress one block of a file, run in a worker thread.
+
+    :type abspath: str
+    :type offset: int
+    :type size: int
+    :type level: int
+    :type is_last: bool
+
+    :rtype: Tuple[bytes, bytes]
+    :return: ``(raw data, compressed data)``
+    """
+    data = _read_block(abspath, offset, size)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    if is_last:
+        compressed = compressor.compress(data) + compressor.flush()
+    else:
+        compressed = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return data, compressed
+
+
+def _compress_file(abspath, compress_type, level, block_size):
+    """
+    Compress a whole file into a spooled temporary file, run in a worker
+    thread. It is used for ``bzip2`` and ``lzma``, which can't be compressed
+    in independent blocks.
+
+    :type abspath: str
+    :type compress_type: int
+    :type level: Optional[int]
+    :type block_size: int
+
+    :rtype: Tuple[int, int, tempfile.SpooledTemporaryFile]
+    :return: ``(crc32, file size, compressed data)``
+    """
+    import tempfile
+
+    if compress_type == ZIP_BZIP2:
+        import bz2
+
+        compressor = bz2.BZ2Compressor(9 if level is None else level)
+    else:
+        compressor = _LZMACompressor()
+    crc = 0
+    file_size = 0
+    out = tempfile.SpooledTemporaryFile(max_size=block_size * 4)
+    try:
+        with open(abspath, "rb") as f:
+            while True:
+                data = f.read(block_size)
+                if not data:
+                    break
+                crc = zlib.crc32(data, crc)
+                file_size += len(data)
+                out.write(compressor.compress(data))
+        out.write(compressor.flush())
+        out.seek(0)
+    except BaseException:
+        out.close()
+        raise
+    return crc, file_size, out
+
+
+class _MemberWriter(object):
+    """
+    Write one member into a seekable :class:`zipfile.ZipFile` from blocks
+    that are already compressed. It does the same book keeping as
+    ``ZipFile.open(zinfo, "w")``.
+
+    :type zf: ZipFile
+    :type zinfo: ZipInfo
+    """
+
+    def __init__(self, zf, zinfo):
+        self.zf = zf
+        self.zinfo = zinfo
+        # Compressed size can be larger than uncompressed size
+        self.zip64 = zinfo.file_size * 1.05 > ZIP64_LIMIT
+        zinfo.compress_size = 0
+        zinfo.CRC = 0
+        zinfo.flag_bits = 0x00
+        if zinfo.compress_type == ZIP_LZMA:
+            # Compressed data includes an end-of-stream (EOS) marker
+            zinfo.flag_bits |= 0x02
+        zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(self.zip64))
+        self.file_size = 0
+        self.compress_size = 0
+        self.crc = 0
+
+    def write(self, data, compressed):
+        """
+        :type data: bytes
+        :param data: the raw data, for the crc32 and the file size.
+
+        :type compressed: bytes
+        :param compressed: what is actually written into the archive.
+        """
+        self.zf.fp.write(compressed)
+        self.crc = zlib.crc32(data, self.crc)
+        self.file_size += len(data)
+        self.compress_size += len(compressed)
+
+    def write_file(self, crc, file_size, f):
+        """
+        Copy a member that is compressed in one piece.
+
+        :type crc: int
+        :type file_size: int
+        :type f: tempfile.SpooledTemporaryFile
+        """
+        import shutil
+
+        with f:
+            shutil.copyfileobj(f, self.zf.fp, DEFAULT_BLOCK_SIZE)
+            self.compress_size += f.tell()
+        self.crc = crc
+        self.file_size += file_size
+
+    def close(self):
+        zf = self.zf
+        zinfo = self.zinfo
+        zinfo.file_size = self.file_size
+        zinfo.compress_size = self.compress_size
+        zinfo.CRC = self.crc
+        if not self.zip64:
+            if self.file_size > ZIP64_LIMIT or self.compress_size > ZIP64_LIMIT:
+                raise RuntimeError(
+                    "'%s' has grown too large while being compressed"
+                    % zinfo.filename
+                )
+        # Seek backwards and write the file header with the crc and sizes
+        zf.start_dir = zf.fp.tell()
+        zf.fp.seek(zinfo.header_offset)
+        zf.fp.write(zinfo.FileHeader(self.zip64))
+        zf.fp.seek(zf.start_dir)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _iter_jobs(executor, members, policy, block_size, serial):
+    """
+    Turn members into a sequence of jobs, the file blocks are submitted to
+    the executor when the job is pulled from this generator.
+
+    :type policy: CompressionPolicy
+
+    :type serial: bool
+    :param serial: if True, every member is a ``"write"`` job, written with
+        ``ZipFile.write()``.
+    """
+    level = policy.level
+    if level is None:
+        deflate_level = zlib.Z_DEFAULT_COMPRESSION
+    else:
+        deflate_level = level
+    for abspath, arcname in members:
+        zinfo = ZipInfo.from_file(abspath, arcname)
+        if zinfo.is_dir():
+            yield "write", (abspath, arcname)
+            continue
+        compress_type = policy.get_compress_type(abspath)
+        if serial or (compress_type == ZIP_LZMA and _LZMACompressor is None):
+            yield "write", (abspath, arcname, compress_type, level)
+            continue
+        zinfo.compress_type = compress_type
+        yield "begin", zinfo
+        if compress_type in (ZIP_BZIP2, ZIP_LZMA):
+            future = executor.submit(
+                _compress_file, abspath, compress_type, level, block_size
+            )
+            yield "file", future
+            yield "end", None
+            continue
+        size = zinfo.file_size
+        offset = 0
+        while True:
+            is_last = offset + block_size >= size
+            n = size - offset if is_last else block_size
+            if compress_type == ZIP_DEFLATED:
+                future = executor.submit(
+                    _deflate_block, abspath, offset, n, deflate_level, is_last
+                )
+            else:
+                # nothing to compute, streamed by the writer itself
+                data = _read_block(abspath, offset, n)
+                future = (data, data)
+            yield "block", future
+            if is_last:
+                break
+            offset += n
+        yield "end", None
+
+
+def write_members(
+    zf,
+    members,
+    compression=ZIP_DEFLATED,
+    level=None,
+    workers=None,
+    block_size=DEFAULT_BLOCK_SIZE,
+    max_pending=None,
+    callback=None,
+    policy=None,
+):
+    """
+    Write files and directories into a zip archive, deflating in parallel.
+
+    :type zf: ZipFile
+    :param zf: a :class:`zipfile.ZipFile` opened for writing. If
+        :func:`can_write_blocks` is False for it, the members are compressed
+        and written one by one in the calling thread.
+
+    :type members: Iterable[Tuple[str, str]]
+    :param members: ``(abspath, arcname)`` of the files and directories,
+        they are written in this order.
+
+    :type compression: int
+    :param compression: ``zipfile.ZIP_DEFLATED``, ``ZIP_BZIP2``,
+        ``ZIP_LZMA`` or ``ZIP_STORED``. Stored files are streamed into the
+        archive block by block.
+
+    :type level: Optional[int]
+    :param level: compression level, None is the default of the algorithm.
+
+    :type workers: Optional[int]
+    :param workers: number of compression threads, default is the number of
+        CPUs.
+
+    :type block_size: int
+    :param block_size: files are compressed in blocks of this many bytes.
+
+    :type max_pending: Optional[int]
+    :param max_pending: max number of blocks read but not yet written,
+        default is ``workers * 4``. The memory used is about
+        ``max_pending * block_size``.
+
+    :type callback: Optional[Callable]
+    :param callback: called with the :class:`zipfile.ZipInfo` of each member
+        right after it is written.
+
+    :type policy: Optional[CompressionPolicy]
+    :param policy: picks the compression method of each member, it
+        overrides ``compression`` and ``level``. By default every file is
+        compressed with ``compression``.
+    """
+    if policy is None:
+        policy = CompressionPolicy(compression, level, store_ext=False)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers has to be greater than 0!")
+    if max_pending is None:
+        max_pending = workers * 4
+    if max_pending < 1:
+        raise ValueError("max_pending has to be greater than 0!")
+    if block_size < 1:
+        raise ValueError("block_size has to be greater than 0!")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = _iter_jobs(
+            executor, members, policy, block_size, not can_write_blocks(zf)
+        )
+        queue = deque()  # jobs pulled from the generator but not written
+        n_pending = 0  # number of blocks and files in the queue
+        writer = None  # type: Optional[_MemberWriter]
+        exhausted = False
+        while True:
+            # read ahead, so the workers always have blocks to compress
+            while (
+                not exhausted
+                and n_pending < max_pending
+                and len(queue) < 4 * max_pending
+            ):
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                queue.append(job)
+                if job[0] in ("block", "file"):
+                    n_pending += 1
+            if not queue:
+                break
+
+            kind, value = queue.popleft()
+            if kind == "block":
+                n_pending -= 1
+                if not isinstance(value, tuple):
+                    value = value.result()  # type: Tuple[bytes, bytes]
+                writer.write(*value)
+            elif kind == "file":
+                n_pending -= 1
+                writer.write_file(*value.result())
+            elif kind == "begin":
+                writer = _MemberWriter(zf, value)
+            elif kind == "end":
+                writer.close()
+                writer = None
+                if callback is not None:
+                    callback(zf.filelist[-1])
+            else:
+                zf.write(*value)
+                if callback is not None:
+                    callback(zf.filelist[-1])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fixtures shared by the test modules.
+"""
+
+import os
+import pytest
+
+from pathlib_mate import Path
+
+
+def _get_tree_contents():
+    """
+    A small tree: an empty file, text files and a random binary file.
+
+    :rtype: dict
+    """
+    return {
+        "empty.txt": b"",
+        "small.txt": b"hello",
+        "sub/text.txt": b"pathlib_mate " * 1000,
+        "sub/random.bin": os.urandom(5000),
+    }
+
+
+def _make_tree(dir_root, contents=None, mtime=None):
+    """
+    Write ``{relpath: bytes or str}`` under ``dir_root``.
+
+    :type dir_root: Union[Path, str]
+
+    :type contents: Optional[dict]
+    :param contents: None means the tree of :func:`_get_tree_contents`.
+
+    :type mtime: Optional[float]
+
+    :rtype: dict
+    :return: the written contents.
+    """
+    if contents is None:
+        contents = _get_tree_contents()
+    for relpath, data in contents.items():
+        p = Path(dir_root, relpath)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            p.write_bytes(data)
+        else:
+            p.write_text(data)
+        if mtime is not None:
+            os.utime(p.abspath, (mtime, mtime))
+    return contents
+
+
+def _read_tree(dir_path, text=False):
+    """
+    Read all the files under ``dir_path``.
+
+    :type dir_path: Union[Path, str]
+    :type text: bool
+
+    :rtype: dict
+    :return: ``{relpath: bytes or str}``
+    """
+    return {
+        p.relative_to(dir_path).as_posix(): p.read_text() if text else p.read_bytes()
+        for p in Path(dir_path).select_file()
+    }
+
+
+@pytest.fixture
+def tree_contents():
+    return _get_tree_contents()
+
+
+@pytest.fixture
+def make_tree():
+    return _make_tree
+
+
+@pytest.fixture
+def read_tree():
+    return _read_tree
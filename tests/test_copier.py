@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+import os
+import errno
+import shutil
+import pytest
+
+from pathlib_mate import Path
+from pathlib_mate import copier
+from pathlib_mate.copier import CopyStats, copy_file, copy_tree
+
+
+@pytest.fixture
+def src_tree(tmp_path, tree_contents, make_tree):
+    src = Path(tmp_path, "src")
+    tree_contents[".git/HEAD"] = b"ref: refs/heads/master"
+    contents = make_tree(src, tree_contents, mtime=1000000000)
+    Path(src, "empty_dir").mkdir()
+    return src, contents
+
+
+def test_copy_file(tmp_path):
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(os.urandom(100000))
+    os.utime(src.abspath, (1000000000, 1000000000))
+    dst = Path(tmp_path, "dst.bin")
+    assert copy_file(src.abspath, dst.abspath) in copier.get_methods()
+    assert dst.read_bytes() == src.read_bytes()
+    assert os.stat(dst.abspath).st_mtime == 1000000000
+
+    with pytest.raises(FileExistsError):
+        copy_file(src.abspath, dst.abspath, overwrite=False)
+
+
+@pytest.mark.parametrize("name", copier.get_methods())
+@pytest.mark.parametrize("size", [0, 100000, 3 * copier.DEFAULT_CHUNK_SIZE + 1])
+def test_copy_file_methods(tmp_path, name, size):
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(os.urandom(size))
+    dst = Path(tmp_path, "dst.bin")
+    stats = CopyStats()
+    try:
+        assert copy_file(src.abspath, dst.abspath, method=name, stats=stats) == name
+    except OSError:  # not supported by the file system
+        assert name in ("ficlone", "copy_file_range")
+        assert not dst.exists()
+        return
+    assert dst.read_bytes() == src.read_bytes()
+    assert stats.n_file[name] == 1
+    assert stats.size[name] == size
+
+
+@pytest.mark.parametrize("name", ["copy_file_range", "sendfile"])
+def test_copy_file_chunk_size(tmp_path, name, monkeypatch):
+    if name not in copier.get_methods():
+        pytest.skip("%s is not available" % name)
+    counts = list()
+    func = getattr(os, name)
+
+    def wrapper(*args):
+        counts.append(args[-1])
+        return func(*args)
+
+    monkeypatch.setattr(os, name, wrapper)
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(os.urandom(100000))
+    dst = Path(tmp_path, "dst.bin")
+    try:
+        copy_file(src.abspath, dst.abspath, method=name)
+    except OSError:  # not supported by the file system
+        return
+    assert dst.read_bytes() == src.read_bytes()
+    # each call asks for what is left, capped to 1 GB
+    assert counts[0] == 100000
+    assert max(counts) <= 1 << 30
+
+
+def test_copy_file_forced_method_error(tmp_path, monkeypatch):
+    def copy_file_range(*args):
+        raise OSError(errno.EXDEV, "cross device")
+
+    monkeypatch.setattr(
+        copier, "_methods", [("copy_file_range", copier._copy_file_range)]
+    )
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(b"hello")
+    dst = Path(tmp_path, "dst.bin")
+    with pytest.raises(OSError) as e:
+        copy_file(src.abspath, dst.abspath, method="copy_file_range")
+    assert e.value.errno == errno.EXDEV
+    assert not dst.exists()
+
+    # an existing target is left as it was
+    dst.write_bytes(b"existing")
+    with pytest.raises(OSError):
+        copy_file(src.abspath, dst.abspath, method="copy_file_range")
+    assert dst.read_bytes() == b"existing"
+
+
+@pytest.mark.parametrize("name", copier.get_methods())
+def test_copy_file_existing_dst(tmp_path, name):
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(os.urandom(1000))
+    dst = Path(tmp_path, "dst.bin")
+    dst.write_bytes(b"x" * 5000)
+    try:
+        copy_file(src.abspath, dst.abspath, method=name)
+    except OSError:  # not supported by the file system
+        assert name in ("ficlone", "copy_file_range")
+        assert dst.read_bytes() == b"x" * 5000
+        return
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_copy_file_auto(tmp_path):
+    src = Path(tmp_path, "src.bin")
+    src.write_bytes(os.urandom(100000))
+    stats = CopyStats()
+    for i in range(3):
+        dst = Path(tmp_path, "dst%s.bin" % i)
+        name = copy_file(src.abspath, dst.abspath, stats=stats)
+        assert dst.read_bytes() == src.read_bytes()
+    assert stats.n_file[name] == 3
+    assert sum(stats.size.values()) == 300000
+    assert name in repr(stats)
+
+    with pytest.raises(ValueError):
+        copy_file(src.abspath, dst.abspath, method="splice")
+
+
+@pytest.mark.parametrize("workers", [None, 1, 3])
+def test_copy_tree_to(tmp_path, workers, src_tree, read_tree):
+    src, contents = src_tree
+    dst = Path(tmp_path, "dst")
+    assert src.copy_tree_to(dst, workers=workers) == 5
+    assert read_tree(dst) == contents
+    assert Path(dst, "empty_dir").is_dir()
+    assert os.stat(Path(dst, "sub", "text.txt").abspath).st_mtime == 1000000000
+
+
+def test_copy_tree_to_overwrite(tmp_path, src_tree):
+    src, contents = src_tree
+    dst = Path(tmp_path, "dst")
+    src.copy_tree_to(dst)
+    Path(src, "small.txt").write_bytes(b"world")
+
+    # existing files are reported, everything else is still copied
+    Path(dst, "sub", "text.txt").remove()
+    with pytest.raises(shutil.Error) as e:
+        src.copy_tree_to(dst, workers=2)
+    assert len(e.value.args[0]) == 4
+    assert Path(dst, "small.txt").read_bytes() == b"hello"
+    assert Path(dst, "sub", "text.txt").read_bytes() == contents["sub/text.txt"]
+
+    assert src.copy_tree_to(dst, workers=2, overwrite=True) == 5
+    assert Path(dst, "small.txt").read_bytes() == b"world"
+
+
+def test_copy_tree_to_stats(tmp_path, src_tree):
+    src, contents = src_tree
+    stats = CopyStats()
+    src.copy_tree_to(Path(tmp_path, "dst"), workers=3, method="buffer", stats=stats)
+    assert stats.n_file["buffer"] == 5
+    assert stats.size["buffer"] == sum(len(data) for data in contents.values())
+
+
+def test_copy_tree_to_filters(tmp_path, src_tree, read_tree):
+    src, contents = src_tree
+    dst = Path(tmp_path, "dst")
+    n = src.copy_tree_to(dst, filters=lambda p: p.ext == ".txt", prune=".git")
+    assert n == 3
+    assert sorted(read_tree(dst)) == ["empty.txt", "small.txt", "sub/text.txt"]
+    assert not Path(dst, ".git").exists()
+
+
+def test_copy_tree_to_progress(tmp_path, src_tree):
+    src, contents = src_tree
+    calls = list()
+
+    def progress(n_done, n_total, size_done, size_total):
+        calls.append((n_done, n_total, size_done, size_total))
+
+    src.copy_tree_to(Path(tmp_path, "dst"), workers=2, progress=progress)
+    size_total = sum(len(data) for data in contents.values())
+    assert [call[0] for call in calls] == [1, 2, 3, 4, 5]
+    assert calls[-1] == (5, 5, size_total, size_total)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="no symlink")
+def test_copy_tree_to_symlinks(tmp_path, src_tree):
+    src, contents = src_tree
+    os.symlink("small.txt", Path(src, "link.txt").abspath)
+
+    dst = Path(tmp_path, "dst1")
+    assert src.copy_tree_to(dst, symlinks=True) == 5
+    assert os.readlink(Path(dst, "link.txt").abspath) == "small.txt"
+
+    dst = Path(tmp_path, "dst2")
+    assert src.copy_tree_to(dst) == 6
+    assert not os.path.islink(Path(dst, "link.txt").abspath)
+    assert Path(dst, "link.txt").read_bytes() == b"hello"
+
+
+def test_copy_tree_into_itself(tmp_path, src_tree):
+    src, contents = src_tree
+    with pytest.raises(ValueError):
+        copy_tree(src.abspath, Path(src, "sub", "copy").abspath)
+    with pytest.raises(EnvironmentError):
+        Path(src, "small.txt").copy_tree_to(Path(tmp_path, "dst"))
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.copier", preview=False)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import hashlib
+
+import pytest
+from pathlib_mate import Path
+from pathlib_mate.hash_cache import HashCache
+from pathlib_mate.hashes import md5file
+
+
+def make_old(p):
+    t = time.time() - 60
+    os.utime(p.abspath, (t, t))
+
+
+class TestHashCache(object):
+    def test_get_set(self, tmp_path):
+        cache = HashCache(str(tmp_path / "cache.sqlite"), min_age=0)
+        p = Path(tmp_path, "a.txt")
+        p.write_text("hello")
+        key = cache.get_key(p.abspath, hashlib.md5)
+        assert cache.get(key) is None
+        cache.set(key, "abc")
+        assert cache.get(key) == "abc"
+        cache.close()
+
+        # persisted
+        cache = HashCache(str(tmp_path / "cache.sqlite"), min_age=0)
+        assert cache.get(key) == "abc"
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+        with pytest.raises(ValueError):
+            HashCache(":memory:", max_entries=0)
+
+    def test_eviction(self, tmp_path):
+        cache = HashCache(":memory:", max_entries=2, min_age=0)
+        keys = [(0, i, 0, 0, "md5", 0) for i in range(3)]
+        cache.set(keys[0], "0")
+        cache.set(keys[1], "1")
+        assert cache.get(keys[0]) == "0"  # keys[0] is now the most recently used
+        cache.set(keys[2], "2")
+        assert len(cache) == 2
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == "0"
+
+    def test_min_age(self, tmp_path):
+        cache = HashCache(":memory:")
+        p = Path(tmp_path, "a.txt")
+        p.write_text("hello")
+        assert cache.get_file_fingerprint(p.abspath, hashlib.md5) == md5file(p.abspath)
+        assert len(cache) == 0  # just modified, not cached
+        make_old(p)
+        cache.get_file_fingerprint(p.abspath, hashlib.md5)
+        assert len(cache) == 1
+
+    def test_path(self, tmp_path, monkeypatch):
+        cache = HashCache(":memory:")
+        monkeypatch.setattr(Path, "hash_cache", cache)
+        p = Path(tmp_path, "a.txt")
+        p.write_text("hello")
+        make_old(p)
+        assert p.md5 == md5file(p.abspath)
+        assert p.get_partial_md5(2) == hashlib.md5(b"he").hexdigest()
+        assert p.sha256 == hashlib.sha256(b"hello").hexdigest()
+        assert len(cache) == 3
+
+        # served from the cache
+        key = cache.get_key(p.abspath, hashlib.md5)
+        cache.set(key, "fake")
+        assert p.md5 == "fake"
+
+        # modified file is hashed again
+        p.write_text("world")
+        os.utime(p.abspath, (time.time() - 30, time.time() - 30))
+        assert p.md5 == hashlib.md5(b"world").hexdigest()
+
+    def test_dir_fingerprint(self, tmp_path, monkeypatch):
+        for i in range(5):
+            p = Path(tmp_path, "sub", "%s.txt" % i)
+            p.parent.mkdir(exist_ok=True)
+            p.write_text(str(i))
+            make_old(p)
+        dir_path = Path(tmp_path, "sub")
+        expected = dir_path.dir_md5
+
+        cache = HashCache(":memory:")
+        monkeypatch.setattr(Path, "hash_cache", cache)
+        assert dir_path.dir_md5 == expected
+        assert len(cache) == 5
+        assert dir_path.get_dir_fingerprint(hashlib.md5, workers=2) == expected
+
+        # only sha256 is missing, files are hashed again
+        assert dir_path.get_dir_hashes(["md5", "sha256"]) == {
+            "md5": expected,
+            "sha256": dir_path.dir_sha256,
+        }
+        assert len(cache) == 10
+        assert p.get_hashes(["md5", "sha256", "sha512"])["md5"] == p.md5
+        assert len(cache) == 11
+
+        key = cache.get_key(Path(dir_path, "0.txt").abspath, hashlib.md5)
+        cache.set(key, "fake")
+        assert dir_path.dir_md5 != expected
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.hash_cache", preview=False)
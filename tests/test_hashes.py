@@ -26,6 +26,60 @@ def test_get_fingerprint():
     assert md5_1 == md5_2
 
 
+def test_get_chunk_size():
+    assert hashes.get_chunk_size(0) == hashes.MIN_CHUNK_SIZE
+    assert hashes.get_chunk_size(100, 4096) == hashes.MIN_CHUNK_SIZE
+    assert hashes.get_chunk_size(100000, 4096) == 102400
+    assert hashes.get_chunk_size(1 << 30, 4096) == hashes.DEFAULT_CHUNK_SIZE
+    assert hashes.get_chunk_size(100, 1 << 21) == 1 << 21
+
+
+def test_get_fingerprint_read_buffer():
+    with open(__file__, "rb") as f:
+        data = f.read()
+    for chunk_size in [None, 1, 7, 1 << 20]:
+        for nbytes in [0, 1, 100, len(data), len(data) + 100]:
+            expected = hashlib.md5(data[:nbytes] if nbytes else data).hexdigest()
+            assert (
+                hashes.get_file_fingerprint(
+                    __file__, hashlib.md5, nbytes=nbytes, chunk_size=chunk_size
+                )
+                == expected
+            )
+
+
+def test_get_fingerprint_mmap(tmp_path):
+    with open(__file__, "rb") as f:
+        data = f.read()
+    for nbytes in [0, 1, 100, len(data) + 100]:
+        expected = hashlib.sha256(data[:nbytes] if nbytes else data).hexdigest()
+        assert (
+            hashes.get_file_fingerprint(
+                __file__, hashlib.sha256, nbytes=nbytes, use_mmap=True
+            )
+            == expected
+        )
+
+    # empty file can't be memory mapped, fall back to read
+    p = tmp_path / "empty.txt"
+    p.write_bytes(b"")
+    assert hashes.md5file(str(p), use_mmap=True) == hashlib.md5(b"").hexdigest()
+
+
+def test_get_file_fingerprints():
+    with open(__file__, "rb") as f:
+        data = f.read()
+    for kwargs in [dict(), dict(nbytes=100, chunk_size=7), dict(use_mmap=True)]:
+        nbytes = kwargs.get("nbytes", 0)
+        content = data[:nbytes] if nbytes else data
+        assert hashes.get_file_fingerprints(
+            __file__, hashes.get_hash_meths(["md5", "sha256"]), **kwargs
+        ) == [hashlib.md5(content).hexdigest(), hashlib.sha256(content).hexdigest()]
+
+    with raises(ValueError):
+        hashes.get_hash_meths(["not-a-hash"])
+
+
 def test_all_algo():
     md5 = hashes.md5file(__file__)
     sha256 = hashes.sha256file(__file__)
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import pytest
-from pathlib_mate.helper import ensure_list, repr_data_size, parse_data_size
+from pathlib_mate.helper import (
+    ensure_list,
+    bounded_map,
+    repr_data_size,
+    parse_data_size,
+)
 
 
 class Path(object):
@@ -28,6 +33,23 @@ def test_ensure_list():
     ]
 
 
+def test_bounded_map():
+    from concurrent.futures import ThreadPoolExecutor
+
+    consumed = list()
+
+    def iterable():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = bounded_map(executor, lambda x: x * 2, iterable(), 3)
+        assert next(results) == 0
+        assert len(consumed) == 4
+        assert list(results) == [i * 2 for i in range(1, 10)]
+
+
 def test_repr_data_size():
     assert repr_data_size(1) == "1 B"
     assert repr_data_size(1024) == "1.00 KB"
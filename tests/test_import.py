@@ -1,7 +1,21 @@
 # -*- coding: utf-8 -*-
 
-import pytest
-from pytest import raises, approx
+import sys
+import subprocess
+
+# modules that are only needed by the zip / hash / tool box / atomic write
+# features, they should not slow down ``import pathlib_mate``
+LAZY_MODULES = [
+    "ctypes",
+    "urllib.parse",
+    "hashlib",
+    "zipfile",
+    "shutil",
+    "pathlib",
+    "concurrent.futures",
+    "pathlib_mate.vendor.six",
+    "pathlib_mate.vendor.fileutils",
+]
 
 
 def test():
@@ -13,8 +27,32 @@ def test():
     _ = pathlib_mate.PathCls
 
 
+def test_lazy_import():
+    code = (
+        "import sys, pathlib_mate; "
+        "print(' '.join(name for name in %r if name in sys.modules))"
+        % LAZY_MODULES
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    assert res.stdout.split() == []
+
+
+def test_lazy_features():
+    from pathlib_mate import Path
+
+    p = Path(__file__)
+    assert len(p.md5) == 32
+    assert p.match("*.py")
+    assert p.as_uri().startswith("file://")
+    assert p.modify_datetime.year >= 2000
+
+
 if __name__ == "__main__":
-    import os
+    from pathlib_mate.tests import run_cov_test
 
-    basename = os.path.basename(__file__)
-    pytest.main([basename, "-s", "--tb=native"])
+    run_cov_test(__file__, "pathlib_mate", preview=False)
@@ -50,6 +50,77 @@ class TestAttrAccessor(object):
         with raises(ValueError):
             p.get_partial_md5(-1)
 
+    def test_abspath_cache(self, tmp_path, monkeypatch):
+        p = Path("a", "b.txt")
+        monkeypatch.chdir(tmp_path)
+        assert p.abspath == os.path.join(str(tmp_path), "a", "b.txt")
+        assert p.dirpath == os.path.join(str(tmp_path), "a")
+        assert p.absolute() is p.absolute()
+
+        monkeypatch.chdir(os.path.join(str(tmp_path), os.pardir))
+        assert p.abspath == os.path.abspath(os.path.join("a", "b.txt"))
+        assert p.dirpath == os.path.abspath("a")
+
+        p = Path(tmp_path, "b.txt")
+        assert p.absolute() is p
+        assert p.dirpath == str(tmp_path)
+
+    def test_stat_cache(self, tmp_path):
+        p = Path(tmp_path, "file.txt")
+        p.write_bytes(b"a")
+        assert p.size == 1
+
+        # changed behind the Path object's back, cached value is stale
+        with open(p.abspath, "wb") as f:
+            f.write(b"ab")
+        assert p.size == 1
+        assert p.refresh().size == 2
+
+        # mutate methods invalidate the cache automatically
+        p.write_bytes(b"abc")
+        assert p.size == 3
+        p.atomic_write_bytes(b"abcd", overwrite=True)
+        assert p.size == 4
+        p1 = p.copyto(new_basename="file1.txt")
+        assert p1.size == 4
+        p1.write_text("abcde")
+        assert p1.size == 5
+        p.write_bytes(b"a")
+        assert p1.copyto(new_abspath=p, overwrite=True) == p
+        assert p.size == 5
+
+        with open(p.abspath, "wb") as f:
+            f.write(b"")
+        p.invalidate_stat()
+        assert p.size == 0
+
+    def test_stat_cache_ttl(self, tmp_path, monkeypatch):
+        p = Path(tmp_path, "file.txt")
+        p.write_bytes(b"a")
+        monkeypatch.setattr(Path, "stat_cache_ttl", 0)
+        assert p.size == 1
+        with open(p.abspath, "wb") as f:
+            f.write(b"ab")
+        assert p.size == 2
+
+    def test_stat_cache_ttl_dir_entry(self, tmp_path, monkeypatch):
+        from pathlib_mate.stat_cache import StatCache
+
+        Path(tmp_path, "file.txt").write_bytes(b"a")
+        [p] = Path(tmp_path).select_file()
+        assert p._entry is not None
+
+        # the file type reported by scandir is cached forever by default
+        os.remove(p.abspath)
+        os.mkdir(p.abspath)
+        assert p.is_file() is True
+
+        monkeypatch.setattr(Path, "stat_cache_ttl", 0)
+        monkeypatch.setattr(Path, "stat_cache", StatCache(ttl=0))
+        assert p.is_file() is False
+        assert p.is_dir() is True
+        assert p._entry is None
+
     def test_contains(self):
         p = Path(__file__).absolute()
         assert p in p.parent
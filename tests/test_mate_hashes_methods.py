@@ -20,6 +20,23 @@ class TestHashesMethods(object):
             == 3
         )
 
+    def test_use_mmap(self):
+        p = Path(__file__)
+        assert p.get_partial_md5(0, use_mmap=True) == p.md5
+        assert p.get_partial_sha256(0, use_mmap=True) == p.sha256
+        assert p.get_partial_sha512(10, use_mmap=True) == p.get_partial_sha512(10)
+
+    def test_get_hashes(self):
+        p = Path(__file__)
+        assert p.get_hashes(algorithms=["md5", "sha256", "sha512"]) == {
+            "md5": p.md5,
+            "sha256": p.sha256,
+            "sha512": p.sha512,
+        }
+        assert p.get_hashes(algorithms=["sha256"], nbytes=10) == {
+            "sha256": p.get_partial_sha256(10)
+        }
+
 
 if __name__ == "__main__":
     from pathlib_mate.tests import run_cov_test
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import os
 import pytest
 from pytest import raises
 import shutil
@@ -185,6 +186,51 @@ class TestMutateMethods(object):
         p_dir_new = p_dir.moveto(new_basename="wow1")
         assert n_files == p_dir_new.n_file
 
+    @pytest.mark.skipif(platform.system() == "Windows", reason="symlink")
+    def test_copyto_same_file(self, tmp_path):
+        p_file = Path(tmp_path, "file.txt")
+        p_file.write_text("hello")
+        p_link = Path(tmp_path, "link.txt")
+        p_link.symlink_to(p_file)
+
+        p_copy = p_file.copyto(new_basename="copy.txt", method="buffer")
+        assert p_copy.read_text() == "hello"
+
+        # the link points to the file, copying would truncate it
+        p_file.copyto(new_abspath=p_link, overwrite=True)
+        assert p_file.read_text() == "hello"
+        p_file.moveto(new_abspath=p_link, overwrite=True)
+        assert p_file.read_text() == "hello"
+
+    def test_moveto_case_only(self, tmp_path, monkeypatch):
+        p_file = Path(tmp_path, "file.txt")
+        p_file.write_text("hello")
+        # behave like a case insensitive file system
+        monkeypatch.setattr(os.path, "samefile", lambda a, b: True)
+        monkeypatch.setattr(
+            Path, "is_not_exist_or_allow_overwrite", lambda self, overwrite: overwrite
+        )
+        p_new = p_file.moveto(new_basename="FILE.txt")
+        assert os.listdir(str(tmp_path)) == ["FILE.txt"]
+        assert p_new.read_text() == "hello"
+
+    def test_moveto_case_only_two_files(self, tmp_path):
+        p_lower = Path(tmp_path, "a.txt")
+        p_lower.write_text("one")
+        p_upper = Path(tmp_path, "A.txt")
+        p_upper.write_text("two")
+        if p_lower.read_text() == "two":
+            pytest.skip("case insensitive file system")
+
+        # two different files, the target is not overwritten
+        p_lower.moveto(new_basename="A.txt", overwrite=False)
+        assert p_lower.read_text() == "one"
+        assert p_upper.read_text() == "two"
+
+        p_lower.moveto(new_basename="A.txt", overwrite=True)
+        assert not p_lower.exists()
+        assert p_upper.read_text() == "one"
+
 
 class TestRemoveFileOrDir(object):
     dir_here = Path(__file__).parent
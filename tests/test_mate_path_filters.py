@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import os
 from pytest import raises
 from pathlib_mate import Path
+from pathlib_mate.mate_path_filters import compile_glob_patterns
 
 
 def is_increasing(array):
@@ -124,6 +126,192 @@ class TestPathFilters(object):
         p = Path(__file__).parent
         assert p.parent.dirsize >= 32768
 
+    def test_select_reuse_dir_entry(self, tmp_path, monkeypatch):
+        dir_root = Path(tmp_path)
+        Path(dir_root, "a", "b").mkdir(parents=True)
+        Path(dir_root, "a", "1.txt").write_text("hello")
+        Path(dir_root, "a", "b", "2.txt").write_text("hello world")
+
+        calls = []
+
+        def stat(self):
+            calls.append(self)
+            return os.stat(str(self))
+
+        monkeypatch.setattr(Path, "stat", stat)
+
+        assert len(list(dir_root.select_file())) == 2
+        assert len(list(dir_root.select_dir())) == 2
+        assert len(list(dir_root.select_file(recursive=False))) == 0
+        assert sorted(p.size for p in dir_root.select_by_size(max_size=5)) == [5]
+        assert dir_root.dirsize == 16
+        assert dir_root.file_stat() == {"file": 2, "dir": 2, "size": 16}
+        # only the root dir itself is stat'ed by assert_is_dir_and_exists
+        assert set(calls) == {dir_root}
+
+    def test_select_prune(self, tmp_path):
+        dir_root = Path(tmp_path)
+        for relpath in [
+            "src/main.py",
+            "src/.git/HEAD",
+            "node_modules/lib/index.js",
+            "pkg.egg-info/PKG-INFO",
+            "README.rst",
+        ]:
+            p = Path(dir_root, relpath)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("hello")
+
+        def relpaths(paths):
+            return sorted(p.relative_to(dir_root).as_posix() for p in paths)
+
+        pruned = []
+
+        def prune(p):
+            pruned.append(p.name)
+            return p.name == "node_modules"
+
+        assert relpaths(dir_root.select_file(prune=prune)) == [
+            "README.rst",
+            "pkg.egg-info/PKG-INFO",
+            "src/.git/HEAD",
+            "src/main.py",
+        ]
+        assert "lib" not in pruned  # never descended into node_modules
+
+        assert relpaths(
+            dir_root.select(prune=[".git", "node_modules", "*.egg-info"])
+        ) == ["README.rst", "src", "src/main.py"]
+        assert relpaths(dir_root.select_by_ext(".py", prune=".git")) == [
+            "src/main.py"
+        ]
+        assert relpaths(dir_root.rglob("*", prune=lambda p: True)) == [
+            "README.rst"
+        ]
+
+    def test_glob_many(self, tmp_path):
+        dir_root = Path(tmp_path)
+        for relpath in [
+            "setup.py",
+            "src/main.py",
+            "src/main.pyi",
+            "src/sub/ext.PYX",
+            "docs/index.rst",
+            "[x].py",
+        ]:
+            p = Path(dir_root, relpath)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("hello")
+
+        def tagged(items):
+            return sorted(
+                (p.relative_to(dir_root).as_posix(), pattern) for p, pattern in items
+            )
+
+        assert tagged(dir_root.glob_many(["*.py", "**/*.py*"])) == [
+            ("[x].py", "*.py"),
+            ("setup.py", "*.py"),
+            ("src/main.py", "**/*.py*"),
+            ("src/main.pyi", "**/*.py*"),
+        ]
+        assert tagged(
+            dir_root.glob_many(["**/*.pyx", "src/*"], case_sensitive=False)
+        ) == [
+            ("src/main.py", "src/*"),
+            ("src/main.pyi", "src/*"),
+            ("src/sub", "src/*"),
+            ("src/sub/ext.PYX", "**/*.pyx"),
+        ]
+
+        # same result as one glob per pattern
+        for pattern in ["*", "**/*", "src/**/*.py*", "*/*", "[[]x].py"]:
+            assert sorted(p for p, _ in dir_root.glob_many(pattern)) == sorted(
+                dir_root.glob(pattern)
+            )
+
+        def relpaths(paths):
+            return sorted(p.relative_to(dir_root).as_posix() for p in paths)
+
+        assert relpaths(dir_root.select_file(patterns=["*.py", "*.rst"])) == [
+            "[x].py",
+            "setup.py",
+        ]
+        assert relpaths(dir_root.select_file(patterns="**/*.rst", workers=2)) == [
+            "docs/index.rst"
+        ]
+        assert relpaths(dir_root.select(patterns="**/*.py", recursive=False)) == [
+            "[x].py",
+            "setup.py",
+        ]
+        assert relpaths(dir_root.select_dir(patterns="**/s*")) == ["src", "src/sub"]
+        assert relpaths(dir_root.select_by_ext([".pyx", ".PYI"])) == [
+            "src/main.pyi",
+            "src/sub/ext.PYX",
+        ]
+        assert relpaths(dir_root.select_by_ext(".py", recursive=False)) == [
+            "[x].py",
+            "setup.py",
+        ]
+        assert list(dir_root.select_by_ext(["py", ".tar.gz"])) == []
+
+    def test_recursive_glob_dedupe(self, tmp_path):
+        dir_root = Path(tmp_path)
+        for relpath in ["a/b/c.txt", "a/c.txt", "c.txt"]:
+            p = Path(dir_root, relpath)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("hello")
+
+        for pattern, n in [
+            ("**/*", 5),
+            ("**/c.txt", 3),
+            ("**", 3),
+            ("**/**/*", 5),
+            ("**/b/../c.txt", 1),
+        ]:
+            paths = list(dir_root.glob(pattern))
+            assert len(paths) == len(set(paths)) == n
+
+    def test_deep_tree(self, tmp_path):
+        # nested generators need several frames per level, this depth used
+        # to exceed the default recursion limit
+        depth = 500
+        os.makedirs(os.path.join(str(tmp_path), *["d"] * depth))
+        dir_root = Path(tmp_path)
+        assert len(list(dir_root.select_dir())) == depth
+        assert len(list(dir_root.glob("**"))) == depth + 1
+        assert len(list(dir_root.rglob("d"))) == depth
+
+    def test_child_path(self):
+        # children share their parent's parts, make sure they behave like
+        # paths built from a string
+        p = Path("/")
+        for i in range(30):
+            p = p._make_child_relpath("d%s" % i)
+        expected = Path("/", *["d%s" % i for i in range(30)])
+        assert str(p) == str(expected)
+        assert p.parts == expected.parts
+        assert p.name == expected.name == "d29"
+        assert p.parent == expected.parent
+        assert p == expected
+        assert hash(p) == hash(expected)
+        assert p._make_child_relpath("f.txt") == Path(expected, "f.txt")
+        assert Path(".")._make_child_relpath("a").parts == ("a",)
+        assert str(Path(".")._make_child_relpath("a")) == "a"
+
+    def test_compile_glob_patterns(self):
+        regex, max_depth = compile_glob_patterns(["*.py", "a/[!x]?/b*"])
+        assert max_depth == 3
+        assert regex.match("a.py").lastgroup == "p0"
+        assert regex.match("a/zz/bq").lastgroup == "p1"
+        assert regex.match("x/a.py") is None
+        assert regex.match("a/xz/b") is None
+        assert regex.match("a/z/z/b") is None
+        assert compile_glob_patterns(["**/*.py"])[1] is None
+
+        for pattern in ["", "a/**", "a**/b"]:
+            with raises(ValueError):
+                compile_glob_patterns([pattern])
+
 
 if __name__ == "__main__":
     from pathlib_mate.tests import run_cov_test
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 from pytest import raises
 from pathlib_mate import Path
 
@@ -11,6 +12,30 @@ class TestToolBoxStateless(object):
         assert p.dir_sha256 == p.dir_sha256
         assert p.dir_sha512 == p.dir_sha512
 
+    def test_get_dir_fingerprint(self):
+        p = Path(Path(__file__).dirpath, "app")
+        m = hashlib.sha256()
+        for p1 in Path.sort_by_abspath(p.select_file()):
+            m.update(str(p1).encode("utf-8"))
+            m.update(p1.sha256.encode("utf-8"))
+        assert p.dir_sha256 == m.hexdigest()
+
+        assert p.get_dir_fingerprint(hashlib.md5, workers=4) == p.dir_md5
+        assert (
+            p.get_dir_fingerprint(hashlib.sha256, workers=2, use_process=True)
+            == p.dir_sha256
+        )
+
+    def test_get_dir_hashes(self):
+        p = Path(Path(__file__).dirpath, "app")
+        expected = {"md5": p.dir_md5, "sha512": p.dir_sha512}
+        assert p.get_dir_hashes(algorithms=["md5", "sha512"]) == expected
+        assert p.get_dir_hashes(algorithms=["md5", "sha512"], workers=2) == expected
+        assert (
+            p.get_dir_hashes(algorithms=["md5", "sha512"], workers=2, use_process=True)
+            == expected
+        )
+
     def test_is_empty(self):
         assert Path(__file__).is_empty() is False
         assert Path(__file__).parent.is_empty() is False
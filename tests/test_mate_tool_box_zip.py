@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import os
 import pytest
+from zipfile import ZipFile
 from pathlib_mate import Path
 
 dir_tests = Path.dir_here(__file__)
@@ -55,6 +57,155 @@ class TestToolBoxZip(object):
 
         p_this.backup(verbose=False)
 
+    def test_backup_ignore(self, tmp_path):
+        dir_root = Path(tmp_path, "project")
+        for relpath in ["main.py", "data/log.txt", "build/lib/a.py"]:
+            p = Path(dir_root, relpath)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("hello")
+
+        dst = Path(tmp_path, "backup.zip")
+        dir_root.backup(dst=dst, ignore=["build", "data/log"], verbose=False)
+        with ZipFile(dst.abspath) as f:
+            assert sorted(f.namelist()) == ["project/data/", "project/main.py"]
+
+
+    def test_make_zip_archive_progress(self, tmp_path):
+        dir_root = Path(tmp_path, "project")
+        for relpath in ["a.txt", "sub/b.txt", "sub/c.txt"]:
+            p = Path(dir_root, relpath)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("hello")
+
+        calls = list()
+        dst = Path(dir_root, "project.zip")  # inside the source dir
+        dir_root.make_zip_archive(
+            dst=dst,
+            progress=lambda *args: calls.append(args),
+        )
+        assert calls == [(1, 3, 5, 15), (2, 3, 10, 15), (3, 3, 15, 15)]
+        with ZipFile(dst.abspath) as f:
+            assert sorted(f.namelist()) == [
+                "project/a.txt",
+                "project/sub/",
+                "project/sub/b.txt",
+                "project/sub/c.txt",
+            ]
+
+        calls = list()
+        Path(dir_root, "a.txt").make_zip_archive(
+            dst=dst,
+            overwrite=True,
+            workers=2,
+            progress=lambda *args: calls.append(args),
+        )
+        assert calls == [(1, 1, 5, 5)]
+
+    def test_incremental_backup(self, tmp_path, make_tree, read_tree):
+        from pathlib_mate.zip_backup import read_manifest, MANIFEST_NAME
+
+        dir_root = Path(tmp_path, "project")
+        make_tree(
+            dir_root,
+            {"a.txt": "a", "b.txt": "b", "sub/c.txt": "c", "sub/d.txt": "d"},
+            mtime=1000000000,
+        )
+        state1 = read_tree(dir_root)
+
+        dir_backup = Path(tmp_path, "backup")
+        dir_backup.mkdir()
+        b1 = Path(dir_backup, "b1.zip")
+        dir_root.backup(
+            dst=b1, incremental=True, hash_algorithm="md5", verbose=False
+        )
+        with ZipFile(b1.abspath) as f:
+            assert len(f.namelist()) == 5
+            assert MANIFEST_NAME in f.namelist()
+
+        make_tree(
+            dir_root,
+            {
+                "a.txt": "aa",  # modified
+                "b.txt": "b",  # touched only
+                "sub/e.txt": "e",  # new
+            },
+            mtime=1100000000,
+        )
+        Path(dir_root, "sub", "c.txt").remove()  # deleted
+        state2 = read_tree(dir_root)
+
+        b2 = Path(dir_backup, "b2.zip")
+        dir_root.backup(
+            dst=b2, base=b1, hash_algorithm="md5", verbose=False
+        )
+        with ZipFile(b2.abspath) as f:
+            assert sorted(f.namelist()) == [
+                MANIFEST_NAME,
+                "project/a.txt",
+                "project/sub/e.txt",
+            ]
+        manifest = read_manifest(b2.abspath)
+        assert manifest["parent"] == "b1.zip"
+        assert manifest["deleted"] == ["sub/c.txt"]
+        assert manifest["files"]["b.txt"][1:] == [
+            1100000000 * 10**9,
+            Path(dir_root, "b.txt").md5,
+            "b1.zip",
+        ]
+
+        dir_restore = Path(tmp_path, "restore2")
+        assert b2.restore_backup(dir_restore) == 4
+        assert read_tree(dir_restore) == state2
+        assert Path(dir_restore, "a.txt").mtime == 1100000000
+        with pytest.raises(OSError):
+            b2.restore_backup(dir_restore)
+        b2.restore_backup(dir_restore, overwrite=True)
+
+        dir_restore = Path(tmp_path, "restore1")
+        b1.restore_backup(dir_restore)
+        assert read_tree(dir_restore) == state1
+
+        # errors
+        p_plain = Path(dir_backup, "plain.zip")
+        dir_root.make_zip_archive(dst=p_plain)
+        with pytest.raises(ValueError):
+            p_plain.restore_backup(dir_restore)
+        with pytest.raises(ValueError):
+            dir_root.backup(
+                dst=Path(tmp_path, "b3.zip"), base=b2, verbose=False
+            )
+
+    def test_incremental_backup_racy_clean(self, tmp_path):
+        from pathlib_mate.zip_backup import MANIFEST_NAME
+
+        dir_root = Path(tmp_path, "project")
+        dir_root.mkdir()
+        p = Path(dir_root, "a.txt")
+        p.write_text("a")
+        st = os.stat(p.abspath)
+        b1 = Path(tmp_path, "b1.zip")
+        dir_root.backup(dst=b1, incremental=True, verbose=False)
+
+        # written again with the same size and mtime, right after the backup
+        p.write_text("b")
+        os.utime(p.abspath, ns=(st.st_atime_ns, st.st_mtime_ns))
+        b2 = Path(tmp_path, "b2.zip")
+        dir_root.backup(dst=b2, base=b1, verbose=False)
+        with ZipFile(b2.abspath) as f:
+            assert sorted(f.namelist()) == [MANIFEST_NAME, "project/a.txt"]
+        dir_restore = Path(tmp_path, "restore")
+        b2.restore_backup(dir_restore)
+        assert Path(dir_restore, "a.txt").read_text() == "b"
+
+        # files modified long before the base are trusted
+        os.utime(p.abspath, (1000000000, 1000000000))
+        b3 = Path(tmp_path, "b3.zip")
+        dir_root.backup(dst=b3, base=b2, verbose=False)
+        b4 = Path(tmp_path, "b4.zip")
+        dir_root.backup(dst=b4, base=b3, verbose=False)
+        with ZipFile(b4.abspath) as f:
+            assert f.namelist() == [MANIFEST_NAME]
+
 
 if __name__ == "__main__":
     from pathlib_mate.tests import run_cov_test
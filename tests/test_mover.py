@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import pytest
+
+from pathlib_mate import Path
+from pathlib_mate.mover import make_move_plan
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_bulk_move(tmp_path, workers, make_tree, read_tree):
+    names = ["a.txt", "b.txt", "c.txt", "d.txt", "e.txt", "dir/f.txt"]
+    make_tree(tmp_path, {name: name for name in names})
+    plan = {
+        # swap
+        Path(tmp_path, "a.txt"): Path(tmp_path, "b.txt"),
+        Path(tmp_path, "b.txt"): Path(tmp_path, "a.txt"),
+        # chain, d.txt has to be moved first
+        str(Path(tmp_path, "c.txt")): str(Path(tmp_path, "d.txt")),
+        str(Path(tmp_path, "d.txt")): str(Path(tmp_path, "new", "d.txt")),
+        # directory
+        str(Path(tmp_path, "dir")): str(Path(tmp_path, "new", "sub", "dir")),
+        # no-op
+        str(Path(tmp_path, "e.txt")): str(Path(tmp_path, "e.txt")),
+    }
+    assert Path.bulk_move(plan, makedirs=True, workers=workers) == 5
+    assert read_tree(tmp_path, text=True) == {
+        "a.txt": "b.txt",
+        "b.txt": "a.txt",
+        "d.txt": "c.txt",
+        "e.txt": "e.txt",
+        "new/d.txt": "d.txt",
+        "new/sub/dir/f.txt": "dir/f.txt",
+    }
+
+
+def test_bulk_move_cycle(tmp_path, make_tree, read_tree):
+    names = ["%s.txt" % i for i in range(5)]
+    make_tree(tmp_path, {name: name for name in names})
+    plan = [
+        (Path(tmp_path, name), Path(tmp_path, names[(i + 1) % 5]))
+        for i, name in enumerate(names)
+    ]
+    assert len(make_move_plan(plan).chains) == 1
+    Path.bulk_move(plan)
+    assert read_tree(tmp_path, text=True) == {
+        names[(i + 1) % 5]: name for i, name in enumerate(names)
+    }
+
+
+def test_bulk_move_errors(tmp_path, make_tree, read_tree):
+    names = ["a.txt", "b.txt", "c.txt", "dir/d.txt"]
+    make_tree(tmp_path, {name: name for name in names})
+    a, b, c = [Path(tmp_path, name) for name in ("a.txt", "b.txt", "c.txt")]
+    before = read_tree(tmp_path, text=True)
+
+    with pytest.raises(ValueError):  # duplicate target
+        Path.bulk_move([(a, Path(tmp_path, "x.txt")), (b, Path(tmp_path, "x.txt"))])
+    with pytest.raises(ValueError):  # duplicate source
+        Path.bulk_move([(a, Path(tmp_path, "x.txt")), (a, Path(tmp_path, "y.txt"))])
+    with pytest.raises(ValueError):  # inside a moved directory
+        Path.bulk_move(
+            {
+                Path(tmp_path, "dir"): Path(tmp_path, "dir1"),
+                Path(tmp_path, "dir", "d.txt"): Path(tmp_path, "d.txt"),
+            }
+        )
+    with pytest.raises(FileNotFoundError):  # missing source
+        Path.bulk_move({Path(tmp_path, "x.txt"): Path(tmp_path, "y.txt")})
+    with pytest.raises(FileNotFoundError):  # missing target directory
+        Path.bulk_move({a: Path(tmp_path, "new", "a.txt")})
+    with pytest.raises(FileExistsError):  # target exists
+        Path.bulk_move({a: b, c: Path(tmp_path, "x.txt")})
+    assert read_tree(tmp_path, text=True) == before
+
+    Path.bulk_move({a: b}, overwrite=True)
+    assert read_tree(tmp_path, text=True)["b.txt"] == "a.txt"
+
+
+def test_bulk_move_stat(tmp_path, make_tree):
+    make_tree(tmp_path, {name: name for name in ["a.txt", "b.txt"]})
+    a, b = Path(tmp_path, "a.txt"), Path(tmp_path, "b.txt")
+    b.write_text("hello")
+    assert (a.size, b.size) == (5, 5)
+    a.write_text("hi")
+    Path.bulk_move({a: b, b: a})
+    assert (a.size, b.size) == (5, 2)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="permissions")
+def test_bulk_move_failed_chain(tmp_path, monkeypatch, make_tree, read_tree):
+    make_tree(tmp_path, {name: name for name in ["a.txt", "b.txt", "c.txt"]})
+    a, b, c = [Path(tmp_path, name) for name in ("a.txt", "b.txt", "c.txt")]
+    x = Path(tmp_path, "x.txt")
+
+    def rename(src, dst):
+        if src == b.abspath:
+            raise PermissionError("denied")
+        os.replace(src, dst)
+
+    monkeypatch.setattr(os, "rename", rename)
+    with pytest.raises(shutil.Error) as e:
+        Path.bulk_move({a: b, b: x, c: Path(tmp_path, "y.txt")})
+    assert e.value.args[0] == [(b.abspath, x.abspath, "denied")]
+    # b.txt couldn't be moved away, so a.txt is not moved onto it
+    assert read_tree(tmp_path, text=True) == {
+        "a.txt": "a.txt",
+        "b.txt": "b.txt",
+        "y.txt": "c.txt",
+    }
+
+
+def test_bulk_move_target_created_after_plan(
+    tmp_path, monkeypatch, make_tree, read_tree
+):
+    from pathlib_mate import mover
+
+    make_tree(tmp_path, {name: name for name in ["a.txt", "c.txt"]})
+    a, b, c = [Path(tmp_path, name) for name in ("a.txt", "b.txt", "c.txt")]
+    make_move_plan = mover.make_move_plan
+
+    def make_move_plan_then_create(*args, **kwargs):
+        move_plan = make_move_plan(*args, **kwargs)
+        b.write_text("created")
+        return move_plan
+
+    monkeypatch.setattr(mover, "make_move_plan", make_move_plan_then_create)
+    with pytest.raises(shutil.Error) as e:
+        Path.bulk_move({a: b, c: Path(tmp_path, "d.txt")})
+    [(src, dst, msg)] = e.value.args[0]
+    assert (src, dst) == (a.abspath, b.abspath)
+    assert "File exists" in msg
+    assert read_tree(tmp_path, text=True) == {
+        "a.txt": "a.txt",
+        "b.txt": "created",
+        "d.txt": "c.txt",
+    }
+
+
+@pytest.mark.skipif(os.name == "nt", reason="permissions")
+def test_bulk_move_failed_cycle(tmp_path, monkeypatch, make_tree, read_tree):
+    names = ["0.txt", "1.txt", "2.txt"]
+    make_tree(tmp_path, {name: name for name in names})
+    p0, p1, p2 = [Path(tmp_path, name) for name in names]
+    rename = os.rename
+
+    def failing_rename(src, dst):
+        if src == p1.abspath:
+            raise PermissionError("denied")
+        rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", failing_rename)
+    with pytest.raises(shutil.Error) as e:
+        Path.bulk_move({p0: p1, p1: p2, p2: p0})
+    errors = e.value.args[0]
+    assert errors[0] == (p1.abspath, p2.abspath, "denied")
+    tmp, dst, msg = errors[1]
+    assert os.path.basename(tmp).startswith(".bulk_move-")
+    assert dst == p1.abspath
+    assert read_tree(tmp_path, text=True) == {
+        "0.txt": "2.txt",
+        "1.txt": "1.txt",
+        os.path.basename(tmp): "0.txt",
+    }
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.mover", preview=False)
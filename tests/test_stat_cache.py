@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+import pytest
+from pathlib_mate import Path
+from pathlib_mate.stat_cache import StatCache
+
+
+class TestStatCache(object):
+    def test_lru(self):
+        st = os.stat(__file__)
+        cache = StatCache(max_size=2)
+        cache.set("a", st)
+        cache.set("b", st)
+        assert cache.get("a") is st  # "a" is now the most recently used
+        cache.set("c", st)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is st
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+        with pytest.raises(ValueError):
+            StatCache(max_size=0)
+
+    def test_ttl(self):
+        st = os.stat(__file__)
+        cache = StatCache(ttl=0.01)
+        cache.set("a", st)
+        assert cache.get("a") is st
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_shared_by_path(self, tmp_path, monkeypatch):
+        cache = StatCache()
+        monkeypatch.setattr(Path, "stat_cache", cache)
+
+        p = Path(tmp_path, "file.txt")
+        p.write_bytes(b"a")
+        assert p.size == 1
+        assert len(cache) == 1
+
+        # another Path object reuses the cached result
+        with open(p.abspath, "wb") as f:
+            f.write(b"ab")
+        assert Path(tmp_path, "file.txt").size == 1
+
+        # a rename with a str target drops the target from the shared cache
+        p1 = Path(tmp_path, "file1.txt")
+        p1.write_bytes(b"abc")
+        assert p1.size == 3
+        p.rename(p1.abspath)
+        assert Path(tmp_path, "file1.txt").size == 2
+        assert Path(tmp_path, "file.txt").exists() is False
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.stat_cache", preview=False)
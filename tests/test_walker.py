@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from pathlib_mate import Path
+from pathlib_mate.walker import walk, walk_parallel, ScanEntry, DirStatTable
+
+
+# 3 x 3 directories with a file each, a directory to prune, and a top file
+TREE = {"d%s/d%s/f.txt" % (i, j): "hello" for i in range(3) for j in range(3)}
+TREE.update({"skip/f.txt": "hello", "f.txt": "hello"})
+
+
+def test_walk_parallel(tmp_path, make_tree):
+    dir_root = Path(tmp_path)
+    make_tree(dir_root, TREE)
+
+    expected = list(dir_root.glob("**/*"))
+    assert len(expected) == 3 + 9 + 9 + 2 + 1
+
+    for workers in [1, 4]:
+        ordered = walk_parallel(dir_root, workers=workers, ordered=True)
+        assert list(ordered) == expected
+        unordered = walk_parallel(dir_root, workers=workers)
+        assert sorted(unordered) == sorted(expected)
+        ordered = walk_parallel(
+            dir_root, workers=workers, ordered=True, max_pending=1
+        )
+        assert list(ordered) == expected
+
+    def prune(p):
+        return p.name == "skip"
+
+    expected = list(dir_root.glob("**/*", prune=prune))
+    assert len(expected) == 3 + 9 + 9 + 1
+    assert list(walk_parallel(dir_root, prune=prune, ordered=True)) == expected
+    assert sorted(walk_parallel(dir_root, prune=prune)) == sorted(expected)
+
+    # stop early
+    for p in walk_parallel(dir_root, workers=2):
+        break
+
+    with pytest.raises(ValueError):
+        list(walk_parallel(dir_root, workers=0))
+
+
+def test_select_workers(tmp_path, make_tree):
+    dir_root = Path(tmp_path)
+    make_tree(dir_root, TREE)
+
+    assert list(dir_root.select_file(workers=4, ordered=True)) == list(
+        dir_root.select_file()
+    )
+    assert sorted(dir_root.select_dir(workers=4, prune="skip")) == sorted(
+        dir_root.select_dir(prune="skip")
+    )
+
+
+def test_walk(tmp_path, make_tree):
+    dir_root = Path(tmp_path)
+    make_tree(dir_root, TREE)
+
+    expected = list(dir_root.glob("**/*"))
+    items = list(walk(dir_root))
+    assert [p for _, p in items] == expected
+    assert [relpath for relpath, _ in items] == [
+        p.relative_to(dir_root).as_posix() for p in expected
+    ]
+    assert [p for _, p in walk(dir_root, max_depth=1)] == list(dir_root.glob("*"))
+
+
+def test_scan(tmp_path, make_tree):
+    dir_root = Path(tmp_path)
+    make_tree(dir_root, TREE)
+
+    expected = list(dir_root.glob("**/*"))
+    entries = list(dir_root.scan())
+    assert all(isinstance(e, ScanEntry) for e in entries)
+    assert [e.abspath for e in entries] == [p.abspath for p in expected]
+    assert [e.to_path() for e in entries] == expected
+    for e, p in zip(entries, expected):
+        assert e.name == p.name
+        assert e.is_dir == p.is_dir()
+        assert e.is_file == p.is_file()
+        if e.is_file:
+            assert e.size == p.size == 5
+            assert e.mtime == p.mtime
+    assert "ScanEntry" in repr(entries[0])
+
+    assert [e.abspath for e in dir_root.scan(recursive=False)] == [
+        p.abspath for p in dir_root.glob("*")
+    ]
+    assert [e.abspath for e in dir_root.scan(prune="skip")] == [
+        p.abspath for p in dir_root.glob("**/*", prune=lambda p: p.name == "skip")
+    ]
+    with pytest.raises(EnvironmentError):
+        Path(dir_root, "f.txt").scan()
+
+
+def test_file_stat_for_all(tmp_path, make_tree):
+    dir_root = Path(tmp_path)
+    make_tree(dir_root, TREE)
+
+    stat = dir_root.file_stat_for_all()
+    assert list(stat) == [dir_root.abspath] + [
+        p.abspath for p in dir_root.select_dir()
+    ]
+    for dir_path, dir_stat in stat.items():
+        assert dir_stat == Path(dir_path).file_stat()
+    assert stat[dir_root.abspath] == {"file": 11, "dir": 13, "size": 55}
+    assert stat[Path(dir_root, "d0").abspath] == {"file": 3, "dir": 3, "size": 15}
+
+    table = dir_root.file_stat_for_all(compact=True)
+    assert isinstance(table, DirStatTable)
+    assert len(table) == len(stat)
+    assert table.to_dict() == stat
+    assert table[dir_root.abspath] == stat[dir_root.abspath]
+    assert dir_root.abspath in table
+    assert Path(dir_root, "f.txt").abspath not in table
+
+    # sub directories are finished before their parent
+    items = list(dir_root.file_stat_for_all(stream=True))
+    assert dict(items) == stat
+    positions = {dir_path: ind for ind, (dir_path, _) in enumerate(items)}
+    for dir_path in stat:
+        if dir_path != dir_root.abspath:
+            assert positions[dir_path] < positions[Path(dir_path).dirpath]
+
+    # filtered out directories are not counted, their content still is
+    stat = dir_root.file_stat_for_all(filters=lambda p: p.name != "skip")
+    assert Path(dir_root, "skip").abspath not in stat
+    assert stat[dir_root.abspath] == {"file": 11, "dir": 12, "size": 55}
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.walker", preview=False)
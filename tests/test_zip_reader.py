@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pytest
+from zipfile import ZipFile, ZipInfo
+
+from pathlib_mate import Path
+from pathlib_mate.zip_reader import extract_members, get_target
+
+
+@pytest.fixture
+def zip_tree(tmp_path, tree_contents):
+    contents = {"root/" + relpath: data for relpath, data in tree_contents.items()}
+    archive = Path(tmp_path, "archive.zip")
+    with ZipFile(archive.abspath, "w") as zf:
+        zf.writestr("root/empty_dir/", b"")
+        for name, data in contents.items():
+            zf.writestr(name, data)
+    return archive, contents
+
+
+@pytest.mark.parametrize("workers", [None, 1, 3])
+def test_extract_members(tmp_path, workers, zip_tree, read_tree):
+    archive, contents = zip_tree
+    dst = Path(tmp_path, "dst")
+    n = extract_members(archive, dst, workers=workers, max_pending=1, chunk_size=1000)
+    assert n == 5
+    assert read_tree(dst) == contents
+    assert Path(dst, "root", "empty_dir").is_dir()
+    assert not [p for p in dst.select_file() if p.ext == ".part"]
+
+    with pytest.raises(OSError):
+        extract_members(archive, dst, workers=workers)
+    extract_members(archive, dst, workers=workers, overwrite=True)
+    assert read_tree(dst) == contents
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_extract_members_duplicate_names(tmp_path, workers, read_tree):
+    archive = Path(tmp_path, "archive.zip")
+    with pytest.warns(UserWarning):  # zipfile warns about duplicate names
+        with ZipFile(archive.abspath, "w") as zf:
+            for i in range(20):
+                zf.writestr("dup.txt", b"%d" % i * 100000)
+            zf.writestr("/other.txt", b"first")
+            zf.writestr("other.txt", b"last")
+    dst = Path(tmp_path, "dst")
+    assert extract_members(archive, dst, workers=workers) == 2
+    assert read_tree(dst) == {"dup.txt": b"19" * 100000, "other.txt": b"last"}
+
+
+def test_extract_zip_archive(tmp_path, zip_tree, read_tree):
+    archive, contents = zip_tree
+    dst = Path(tmp_path, "dst")
+    n = archive.extract_zip_archive(
+        dst,
+        workers=2,
+        filters=lambda zinfo: zinfo.filename.startswith("root/sub/"),
+    )
+    assert n == 2
+    assert read_tree(dst) == {
+        k: v for k, v in contents.items() if k.startswith("root/sub/")
+    }
+
+    with pytest.raises(ValueError):
+        archive.extract_zip_archive(dst, workers=0)
+
+
+def test_get_target():
+    for name in ["../../a.txt", "/a.txt", "./a.txt"]:
+        assert get_target("/dst", ZipInfo(name)) == os.path.join("/dst", "a.txt")
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.zip_reader", preview=False)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pytest
+from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+
+from pathlib_mate import Path
+from pathlib_mate import zip_writer
+from pathlib_mate.zip_writer import (
+    write_members,
+    can_write_blocks,
+    CompressionPolicy,
+    get_compressed_ext,
+    get_entropy,
+)
+
+
+@pytest.mark.parametrize(
+    "compression", [ZIP_DEFLATED, ZIP_STORED, ZIP_BZIP2, ZIP_LZMA]
+)
+@pytest.mark.parametrize("block_size", [1, 1000, 1 << 20])
+def test_write_members(tmp_path, compression, block_size, make_tree):
+    dir_root = Path(tmp_path, "root")
+    contents = make_tree(dir_root)
+    members = [(p.abspath, p.relative_to(dir_root).as_posix()) for p in dir_root.select()]
+
+    dst = Path(tmp_path, "archive.zip")
+    with ZipFile(dst.abspath, "w", compression) as zf:
+        write_members(
+            zf,
+            members,
+            compression=compression,
+            workers=3,
+            block_size=block_size,
+            max_pending=2,
+        )
+
+    with ZipFile(dst.abspath) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [
+            arcname + "/" if Path(abspath).is_dir() else arcname
+            for abspath, arcname in members
+        ]
+        for relpath, data in contents.items():
+            assert zf.getinfo(relpath).compress_type == compression
+            assert zf.read(relpath) == data
+
+
+class _Unseekable(object):
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        return self.f.write(data)
+
+    def tell(self):
+        return self.f.tell()
+
+    def flush(self):
+        self.f.flush()
+
+
+def test_can_write_blocks(tmp_path):
+    # fails if a Python release changes the zipfile internals it relies on
+    with ZipFile(Path(tmp_path, "a.zip").abspath, "w") as zf:
+        assert can_write_blocks(zf) is True
+        with zf.open("a.txt", "w"):
+            assert can_write_blocks(zf) is False
+    with open(Path(tmp_path, "b.zip").abspath, "wb") as f:
+        with ZipFile(_Unseekable(f), "w") as zf:
+            assert can_write_blocks(zf) is False
+
+
+@pytest.mark.parametrize("compression", [ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA])
+def test_write_members_serial(tmp_path, compression, monkeypatch, make_tree):
+    dir_root = Path(tmp_path, "root")
+    contents = make_tree(dir_root)
+    members = [(p.abspath, p.relative_to(dir_root).as_posix()) for p in dir_root.select()]
+    policy = CompressionPolicy(compression, store_ext=[".bin"])
+
+    def check(dst):
+        with ZipFile(dst.abspath) as zf:
+            assert zf.testzip() is None
+            for relpath, data in contents.items():
+                compress_type = ZIP_STORED if relpath.endswith(".bin") else compression
+                assert zf.getinfo(relpath).compress_type == compress_type
+                assert zf.read(relpath) == data
+
+    # an archive that is not seekable
+    dst = Path(tmp_path, "unseekable.zip")
+    with open(dst.abspath, "wb") as f:
+        with ZipFile(_Unseekable(f), "w") as zf:
+            write_members(zf, members, workers=2, policy=policy)
+    check(dst)
+
+    # the zipfile internals are missing
+    monkeypatch.setattr(zip_writer, "_HAS_MEMBER_WRITER", False)
+    monkeypatch.setattr(zip_writer, "_MemberWriter", None)
+    dst = Path(tmp_path, "archive.zip")
+    with ZipFile(dst.abspath, "w") as zf:
+        write_members(zf, members, workers=2, policy=policy)
+    check(dst)
+
+
+def test_write_members_no_lzma_compressor(tmp_path, monkeypatch, make_tree):
+    monkeypatch.setattr(zip_writer, "_LZMACompressor", None)
+    dir_root = Path(tmp_path, "root")
+    contents = make_tree(dir_root)
+    members = [(p.abspath, p.relative_to(dir_root).as_posix()) for p in dir_root.select()]
+    dst = Path(tmp_path, "archive.zip")
+    with ZipFile(dst.abspath, "w") as zf:
+        write_members(zf, members, compression=ZIP_LZMA, workers=2)
+    with ZipFile(dst.abspath) as zf:
+        assert zf.testzip() is None
+        for relpath, data in contents.items():
+            assert zf.getinfo(relpath).compress_type == ZIP_LZMA
+            assert zf.read(relpath) == data
+
+
+def test_write_members_error(tmp_path):
+    dst = Path(tmp_path, "archive.zip")
+    with ZipFile(dst.abspath, "w") as zf:
+        with pytest.raises(ValueError):
+            write_members(zf, [], compression=99)
+        with pytest.raises(ValueError):
+            write_members(zf, [], workers=0)
+
+
+def test_compression_policy(tmp_path):
+    assert ".jpg" in get_compressed_ext()
+    assert ".gz" in get_compressed_ext()
+    assert ".bmp" not in get_compressed_ext()
+    assert get_entropy(b"") == 0.0
+    assert get_entropy(b"aaaa") == 0.0
+    assert get_entropy(bytes(range(256))) == 8.0
+
+    p_text = Path(tmp_path, "a.txt")
+    p_text.write_bytes(b"hello world " * 1000)
+    p_random = Path(tmp_path, "a.dat")
+    p_random.write_bytes(os.urandom(10000))
+    p_jpg = Path(tmp_path, "a.JPG")
+    p_jpg.write_bytes(b"hello world " * 1000)
+
+    policy = CompressionPolicy()
+    assert policy.get_compress_type(p_text.abspath) == ZIP_DEFLATED
+    assert policy.get_compress_type(p_random.abspath) == ZIP_DEFLATED
+    assert policy.get_compress_type(p_jpg.abspath) == ZIP_STORED
+
+    policy = CompressionPolicy(ZIP_LZMA, store_ext=False, entropy_probe=True)
+    assert policy.get_compress_type(p_text.abspath) == ZIP_LZMA
+    assert policy.get_compress_type(p_random.abspath) == ZIP_STORED
+    assert policy.get_compress_type(p_jpg.abspath) == ZIP_LZMA
+    assert policy.get_compress_type(str(tmp_path)) == ZIP_LZMA
+
+    policy = CompressionPolicy(ZIP_STORED)
+    assert policy.get_compress_type(p_text.abspath) == ZIP_STORED
+
+    with pytest.raises(ValueError):
+        CompressionPolicy(99)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_make_zip_archive_policy(tmp_path, workers, make_tree):
+    dir_root = Path(tmp_path, "root")
+    contents = make_tree(dir_root)
+    Path(dir_root, "photo.jpg").write_bytes(b"jpeg" * 1000)
+    contents["photo.jpg"] = b"jpeg" * 1000
+    dst = Path(tmp_path, "archive.zip")
+
+    dir_root.make_zip_archive(
+        dst=dst,
+        include_dir=False,
+        workers=workers,
+        compression=ZIP_BZIP2,
+        compress_level=1,
+        entropy_probe=True,
+    )
+    with ZipFile(dst.abspath) as zf:
+        assert zf.testzip() is None
+        for relpath, data in contents.items():
+            assert zf.read(relpath) == data
+        assert zf.getinfo("photo.jpg").compress_type == ZIP_STORED
+        assert zf.getinfo("sub/random.bin").compress_type == ZIP_STORED
+        assert zf.getinfo("sub/text.txt").compress_type == ZIP_BZIP2
+
+    dir_root.make_zip_archive(
+        dst=dst, include_dir=False, workers=workers, overwrite=True, store_ext=False
+    )
+    with ZipFile(dst.abspath) as zf:
+        assert zf.getinfo("photo.jpg").compress_type == ZIP_DEFLATED
+
+
+def test_make_zip_archive_workers(tmp_path, make_tree):
+    dir_root = Path(tmp_path, "root")
+    contents = make_tree(dir_root)
+    dst = Path(tmp_path, "archive.zip")
+    dir_root.make_zip_archive(dst=dst, workers=2)
+    with ZipFile(dst.abspath) as zf:
+        assert zf.testzip() is None
+        for relpath, data in contents.items():
+            assert zf.read("root/" + relpath) == data
+
+    p = Path(dir_root, "sub", "text.txt")
+    p.make_zip_archive(dst=dst, workers=2, overwrite=True)
+    with ZipFile(dst.abspath) as zf:
+        assert zf.namelist() == ["text.txt"]
+        assert zf.read("text.txt") == contents["sub/text.txt"]
+
+
+if __name__ == "__main__":
+    from pathlib_mate.tests import run_cov_test
+
+    run_cov_test(__file__, "pathlib_mate.zip_writer", preview=False)